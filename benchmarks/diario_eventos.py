@@ -0,0 +1,96 @@
+"""
+Benchmark del diario de eventos: cuántos eventos por segundo se anotan y se reproducen.
+
+Corre un escenario sintético (GeneradorDatos, siempre el mismo para una misma semilla) y mide:
+    - clasificar_sin_diario / clasificar_con_diario: clasificar_centros_salud sin diario y con el diario por defecto,
+      para ver cuánto agrega anotar cada cambio de estado.
+    - anotar_lote_N: volver a anotar los eventos de esa corrida en un diario nuevo con un fsync cada N eventos.
+    - reproducir: reconstruir el estado desde el diario sobre centros recién creados (un arranque después de un corte).
+
+El fsync depende mucho del disco: con --directorio se elige dónde se escriben los diarios (por defecto, un
+directorio temporal).
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/diario_eventos.py --pacientes 100000 --lotes 1,16,256,4096
+"""
+import argparse
+import contextlib
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from generador.Generador_Datos import GeneradorDatos
+from incucai.INCUCAI import INCUCAI
+from persistencia.Diario_Eventos import DiarioEventos
+
+
+def escenario(pacientes: int, semilla: int) -> list:
+    """
+    Devuelve los centros del escenario, con sus pacientes (el random global queda con la misma semilla).
+    """
+    random.seed(semilla) #los traslados y las cirugias usan el random global
+    centros, _ = GeneradorDatos(semilla).generar_escenario(pacientes, max(4, pacientes // GeneradorDatos.PACIENTES_POR_CENTRO))
+    return centros
+
+
+def mostrar(etapa: str, segundos: float, eventos: int = None, sincronizaciones: int = None):
+    """
+    Imprime una fila de resultados.
+    """
+    por_segundo = f"{eventos / segundos:12,.0f} ev/s" if eventos else ""
+    fsync = f"  {sincronizaciones:>7} fsync" if sincronizaciones is not None else ""
+    print(f"{etapa:<26} {segundos:9.3f} s {por_segundo}{fsync}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide cuántos eventos por segundo anota y reproduce el diario.")
+    parser.add_argument("--pacientes", type=int, default=100_000)
+    parser.add_argument("--semilla", type=int, default=1)
+    parser.add_argument("--lotes", default="1,16,256,4096", help="eventos por fsync a comparar, separados por coma")
+    parser.add_argument("--directorio", help="directorio donde se escriben los diarios (por defecto, uno temporal)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.directorio) as directorio, open(os.devnull, "w") as nulo:
+        centros = escenario(args.pacientes, args.semilla)
+        incucai = INCUCAI(centros)
+        with contextlib.redirect_stdout(nulo):
+            inicio = time.perf_counter()
+            incucai.clasificar_centros_salud()
+        mostrar("clasificar_sin_diario", time.perf_counter() - inicio)
+
+        ruta = os.path.join(directorio, "diario.jsonl")
+        centros = escenario(args.pacientes, args.semilla)
+        with DiarioEventos(ruta) as diario:
+            incucai = INCUCAI(centros, diario=diario)
+            with contextlib.redirect_stdout(nulo):
+                inicio = time.perf_counter()
+                incucai.clasificar_centros_salud()
+                diario.sincronizar()
+            mostrar("clasificar_con_diario", time.perf_counter() - inicio, diario.ultima_secuencia, diario.sincronizaciones)
+            eventos = list(diario.leer())
+
+        for lote in (int(valor) for valor in args.lotes.split(",")):
+            ruta_lote = os.path.join(directorio, f"lote_{lote}.jsonl")
+            with DiarioEventos(ruta_lote, eventos_por_fsync=lote, segundos_por_fsync=float("inf")) as copia:
+                inicio = time.perf_counter()
+                for evento in eventos:
+                    datos = {clave: valor for clave, valor in evento.items() if clave not in ("n", "t")}
+                    copia.registrar(evento["t"], **datos)
+                copia.sincronizar()
+                mostrar(f"anotar_lote_{lote}", time.perf_counter() - inicio, len(eventos), copia.sincronizaciones)
+            os.remove(ruta_lote)
+
+        centros = GeneradorDatos(args.semilla).generar_centros(max(4, args.pacientes // GeneradorDatos.PACIENTES_POR_CENTRO))
+        with DiarioEventos(ruta) as diario:
+            incucai = INCUCAI(centros, diario=diario)
+            inicio = time.perf_counter()
+            reproducidos = incucai.reproducir_diario()
+            mostrar("reproducir", time.perf_counter() - inicio, reproducidos)
+
+
+if __name__ == "__main__":
+    main()
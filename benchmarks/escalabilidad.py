@@ -0,0 +1,157 @@
+"""
+Benchmark de escalabilidad del circuito de asignación de órganos.
+
+Para cada tamaño genera un escenario sintético (GeneradorDatos, siempre el mismo para una misma semilla)
+y mide tiempo y pico de memoria de cada etapa:
+    - generacion: crear centros, flota, cirujanos y pacientes.
+    - matriz_distancias: crear INCUCAI, que calcula las distancias geodésicas entre todos los centros.
+    - clasificar_centros_salud: procesar el 90% de los pacientes con INCUCAI desde cero (con --procesos, la
+      etapa es clasificar_centros_salud_por_provincia con esa cantidad de procesos; con --global, es
+      clasificar_centros_salud_global y el resultado guarda también el puntaje global y el greedy).
+    - procesar_nuevos_pacientes: llega el 10% restante y se procesa de forma incremental.
+    - listado_receptores_por_centro: armar la lista ordenada de receptores de cada centro (lo que muestra el menú).
+    - consulta_dni: buscar a todos los pacientes por DNI en el registro.
+    - despacho_nacional: pedir a cada centro el avión libre más cercano de otro centro (y devolverlo).
+    - guardar_foto / cargar_foto: guardar todo el estado en una foto binaria (FotoEstado) y restaurarlo, que es lo
+      que reemplaza a generacion + matriz_distancias + clasificar_centros_salud al volver a arrancar.
+
+Los resultados se imprimen y, con --salida, se agregan como líneas JSON a un archivo para comparar entre versiones.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/escalabilidad.py --tamaños 1000,10000 --salida resultados.jsonl
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from generador.Generador_Datos import GeneradorDatos
+from incucai.INCUCAI import INCUCAI
+from persistencia.Foto_Estado import FotoEstado
+from vehiculos.Avion import Avion
+
+PROPORCION_NUEVOS = 0.1 #pacientes que llegan despues de la primera clasificacion
+
+
+@contextlib.contextmanager
+def medir_etapa(resultados: list, tamaño: int, etapa: str, memoria: bool):
+    """
+    Mide el tiempo (y, si se pide, el pico de memoria con tracemalloc) del bloque y agrega el resultado a la lista.
+    La salida por consola del sistema (mensajes de cirugías y traslados) se descarta mientras se mide.
+    """
+    if memoria:
+        tracemalloc.start()
+    with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+        inicio = time.perf_counter()
+        yield
+        segundos = time.perf_counter() - inicio
+    resultado = {"tamaño": tamaño, "etapa": etapa, "segundos": round(segundos, 4)}
+    if memoria:
+        actual, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        resultado["pico_bytes"] = pico
+        resultado["retenido_bytes"] = actual
+    resultados.append(resultado)
+    memoria_texto = f"  pico {resultado['pico_bytes'] / 2**20:9.1f} MiB" if memoria else ""
+    print(f"{tamaño:>9} {etapa:<32} {segundos:10.3f} s{memoria_texto}", flush=True)
+
+
+def correr(tamaño: int, semilla: int, memoria: bool, procesos: int = None, modo_global: bool = False) -> list[dict]:
+    """
+    Corre todas las etapas para un tamaño de escenario y devuelve sus resultados.
+    """
+    random.seed(semilla) #los traslados y las cirugias usan el random global
+    resultados = []
+
+    with medir_etapa(resultados, tamaño, "generacion", memoria):
+        generador = GeneradorDatos(semilla)
+        cantidad_nuevos = int(tamaño * PROPORCION_NUEVOS)
+        cantidad_centros = max(4, tamaño // GeneradorDatos.PACIENTES_POR_CENTRO)
+        centros, pacientes = generador.generar_escenario(tamaño - cantidad_nuevos, cantidad_centros)
+        nuevos = generador.generar_pacientes(cantidad_nuevos)
+
+    with medir_etapa(resultados, tamaño, "matriz_distancias", memoria):
+        incucai = INCUCAI(centros)
+
+    if modo_global:
+        with medir_etapa(resultados, tamaño, "clasificar_centros_salud_global", memoria):
+            puntajes = incucai.clasificar_centros_salud_global()
+        resultados[-1].update(puntajes)
+    elif procesos is None:
+        with medir_etapa(resultados, tamaño, "clasificar_centros_salud", memoria):
+            incucai.clasificar_centros_salud()
+    else:
+        with medir_etapa(resultados, tamaño, f"clasificar_por_provincia_{procesos}p", memoria):
+            incucai.clasificar_centros_salud_por_provincia(procesos)
+
+    generador.repartir_pacientes(centros, nuevos)
+    with medir_etapa(resultados, tamaño, "procesar_nuevos_pacientes", memoria):
+        incucai.procesar_nuevos_pacientes()
+
+    with medir_etapa(resultados, tamaño, "listado_receptores_por_centro", memoria):
+        for centro in centros:
+            incucai.tabla_receptores.receptores_por_centro(centro.nombre)
+
+    with medir_etapa(resultados, tamaño, "consulta_dni", memoria):
+        for paciente in pacientes:
+            incucai.registro_dni.buscar(paciente.DNI)
+
+    with medir_etapa(resultados, tamaño, "despacho_nacional", memoria):
+        for centro in centros:
+            prestamo = incucai.despachador.tomar_mas_cercano(centro, Avion)
+            if prestamo is not None:
+                vehiculo, origen, _ = prestamo
+                origen.flota.liberar(vehiculo)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        foto = FotoEstado(os.path.join(directorio, "estado.foto"))
+        with medir_etapa(resultados, tamaño, "guardar_foto", memoria):
+            foto.guardar(incucai)
+        del incucai, centros, pacientes, nuevos #la foto se carga sin el estado original en memoria
+        with medir_etapa(resultados, tamaño, "cargar_foto", memoria):
+            foto.cargar()
+
+    for resultado in resultados:
+        resultado["centros"] = cantidad_centros
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide cada etapa del circuito de asignación a distintas escalas.")
+    parser.add_argument("--tamaños", default="1000,10000,100000,1000000", help="cantidades de pacientes separadas por coma")
+    parser.add_argument("--semilla", type=int, default=1)
+    parser.add_argument("--sin-memoria", action="store_true", help="no medir memoria (tracemalloc hace todo más lento)")
+    parser.add_argument("--procesos", type=int, help="clasificar por provincia en paralelo con esta cantidad de procesos")
+    parser.add_argument("--global", dest="modo_global", action="store_true",
+                        help="clasificar con la asignación global de mayor puntaje (clasificar_centros_salud_global)")
+    parser.add_argument("--salida", help="archivo donde agregar los resultados como líneas JSON")
+    args = parser.parse_args()
+    if args.modo_global and args.procesos is not None:
+        parser.error("--global y --procesos no se pueden combinar")
+
+    comun = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "semilla": args.semilla,
+    }
+    print(f"{'pacientes':>9} {'etapa':<32} {'tiempo':>12}")
+    for tamaño in (int(valor) for valor in args.tamaños.split(",")):
+        resultados = correr(tamaño, args.semilla, not args.sin_memoria, args.procesos, args.modo_global)
+        if args.salida:
+            with open(args.salida, "a", encoding="utf-8") as archivo:
+                for resultado in resultados:
+                    archivo.write(json.dumps(comun | resultado, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
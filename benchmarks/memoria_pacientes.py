@@ -0,0 +1,79 @@
+"""
+Benchmark de memoria: cuántos bytes ocupa cada paciente, órgano y vehículo.
+
+Crea registros sintéticos (siempre los mismos para una misma semilla) y mide con tracemalloc la memoria
+que queda reservada. Cada registro tiene sus propios textos y fechas, como si se cargaran de una base.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/memoria_pacientes.py                       #1.000.000 de registros con el código actual
+    python benchmarks/memoria_pacientes.py --src otra/copia/src  #mismo benchmark contra otra versión del código
+"""
+import argparse
+import datetime
+import gc
+import json
+import os
+import random
+import sys
+import tracemalloc
+
+GRUPOS = ["A+", "A-", "B+", "B-", "AB+", "AB-", "O+", "O-"]
+ORGANOS = ["corazon", "pulmon", "piel", "corneas", "huesos", "higado", "riñon", "intestinos"]
+
+
+def medir(crear, cantidad: int) -> float:
+    """
+    Devuelve los bytes promedio por registro que quedan reservados después de crear `cantidad` registros.
+    """
+    gc.collect()
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    registros = [crear(i) for i in range(cantidad)]
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del registros
+    return (despues - antes) / cantidad
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide los bytes por paciente, órgano y vehículo.")
+    parser.add_argument("--cantidad", type=int, default=1_000_000, help="registros de cada tipo (por defecto 1.000.000)")
+    parser.add_argument("--semilla", type=int, default=1)
+    parser.add_argument("--src", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"),
+                        help="carpeta src a medir (por defecto la de este repositorio)")
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.abspath(args.src))
+    from pacientes.Receptores import Receptores
+    from pacientes.Donantes import Donantes
+    from organos.Organos import Organos
+    from vehiculos.Auto import Auto
+
+    rnd = random.Random(args.semilla)
+    base = datetime.datetime(1940, 1, 1)
+
+    def fecha(desde: int, hasta: int) -> datetime.datetime:
+        return base + datetime.timedelta(days=rnd.randint(desde, hasta))
+
+    def receptor(i: int) -> Receptores:
+        return Receptores(f"Receptor {i}", 10_000_000 + i, rnd.choice("MF"), fecha(0, 29_000), rnd.choice(GRUPOS),
+                          1_100_000_000 + i, rnd.choice(ORGANOS), fecha(29_000, 31_000), f"Patologia {i % 100}")
+
+    def donante(i: int) -> Donantes:
+        return Donantes(f"Donante {i}", 50_000_000 + i, rnd.choice("MF"), fecha(0, 29_000), rnd.choice(GRUPOS),
+                        1_100_000_000 + i, fecha(30_000, 31_000), [])
+
+    def organo(i: int) -> Organos:
+        return Organos(rnd.choice(ORGANOS))
+
+    def auto(i: int) -> Auto:
+        return Auto(rnd.randint(60, 120), f"AA {i:06d}")
+
+    resultados = {"cantidad": args.cantidad, "src": os.path.abspath(args.src)}
+    for nombre, crear in (("receptor", receptor), ("donante", donante), ("organo", organo), ("vehiculo", auto)):
+        resultados[f"bytes_por_{nombre}"] = round(medir(crear, args.cantidad), 1)
+    print(json.dumps(resultados, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,22 @@ from vehiculos.Auto import *
 from pacientes.Receptores import Receptores
 from cirujanos.Cirujanos import Cirujanos
 from pacientes.Donantes import Donantes
+from codigos.Codigos import EstadoVehiculo, TipoOrgano
+from vehiculos.Flota_Vehiculos import FlotaVehiculos
+from cirujanos.Plantel_Cirujanos import PlantelCirujanos
 import random as rnd 
 
 class CentroSalud:
+
+    #distancias esperadas (km) segun el tipo de traslado, son el punto medio de los rangos que usa asignar_y_mandar_vehiculo
+    DISTANCIA_ESTIMADA = {Auto: 10.5, Helicoptero: 160, Avion: 1000}
+    RANGO_DISTANCIA = {Auto: (1, 20), Helicoptero: (20, 300), Avion: (300, 1700)} #km aleatorios cuando no se conoce la distancia real
+    SIN_VEHICULOS = {Auto: "No hay autos disponibles", Helicoptero: "No hay helicópteros disponibles", Avion: "No hay aviones disponibles"}
+    TRAFICO_ESTIMADO_AUTO = 1.5 #horas promedio que suma el trafico en un viaje en auto (rnd.randint(0, 3))
+    diario = None #DiarioEventos donde se anotan los traslados y las cirugias, lo conecta INCUCAI
+    reloj = None #Reloj de INCUCAI, se les pasa a los cirujanos que se agregan; lo conecta INCUCAI
     
-    def __init__(self, nombre, direccion, telefono, partido, provincia, lista_cirujanos = [], lista_vehiculos= [], lista_pacientes= []):
+    def __init__(self, nombre, direccion, telefono, partido, provincia, lista_cirujanos = [], lista_vehiculos= [], lista_pacientes= [], latitud = None, longitud = None):
         """
     Constructor de la clase CentroSalud.
     
@@ -21,6 +32,7 @@ class CentroSalud:
         - lista_cirujanos: Lista inicial de objetos Cirujano asociados al centro. Puede ser una lista vacía.
         - lista_vehiculos: Lista inicial de vehículos (Auto, Helicóptero o Avión) disponibles para traslados.
         - lista_pacientes: Lista inicial de pacientes (Receptores o Donantes), no se usa directamente en este constructor.
+        - latitud, longitud: Coordenadas del centro en grados (opcionales). Con ellas los traslados usan la distancia real.
     
     precon:
         - Se espera que las listas proporcionadas sean instancias de `list` o un solo objeto del tipo correspondiente (se encapsula en lista).
@@ -34,8 +46,12 @@ class CentroSalud:
         self.telefono = telefono
         self.partido = partido
         self.provincia = provincia
+        self.latitud = latitud
+        self.longitud = longitud
         self.lista_cirujanos: list[Cirujanos] = lista_cirujanos if isinstance(lista_cirujanos, list) else [lista_cirujanos] #lista de cirujanos
+        self.plantel = PlantelCirujanos(self.lista_cirujanos) #cirujanos listos por especialidad y en recuperacion por hora de fin
         self.lista_vehiculos: list[Auto | Helicoptero | Avion] = lista_vehiculos if isinstance(lista_vehiculos, list) else [lista_vehiculos] 
+        self.flota = FlotaVehiculos(self.lista_vehiculos) #vehiculos libres por clase, ordenados por velocidad
         self.lista_pacientes: list[Receptores | Donantes] = []
         self.pacientes_fallidos: list[Receptores] = []
         self.pacientes_exitosos: list[Receptores] = []
@@ -47,6 +63,69 @@ class CentroSalud:
         """
         return f"{self.nombre}"
         
+    def agregar_vehiculo(self, vehiculo: Auto | Helicoptero | Avion):
+        """
+    Suma un vehículo a la flota del centro (a la lista y al índice de vehículos libres).
+
+    params:
+        - vehiculo: Auto, Helicoptero o Avion.
+        """
+        self.lista_vehiculos.append(vehiculo)
+        self.flota.agregar(vehiculo)
+        if self.diario is not None:
+            self.diario.nombrar(vehiculo, f"{self.nombre}/vehiculo/{len(self.lista_vehiculos) - 1}")
+
+    def agregar_cirujano(self, cirujano: Cirujanos):
+        """
+    Suma un cirujano al centro (a la lista y al índice de disponibilidad).
+
+    params:
+        - cirujano: Objeto Cirujanos.
+        """
+        if self.reloj is not None: #mismo reloj que el resto del sistema
+            cirujano.reloj = self.reloj
+        self.lista_cirujanos.append(cirujano)
+        self.plantel.agregar(cirujano)
+        if self.diario is not None:
+            self.diario.nombrar(cirujano, f"{self.nombre}/cirujano/{len(self.lista_cirujanos) - 1}")
+            cirujano.diario = self.diario
+
+    def conectar_diario(self, diario):
+        """
+    Conecta el centro, sus cirujanos y sus vehículos a un diario de eventos (o los desconecta, con None).
+    Cada uno queda nombrado en el diario por el nombre del centro y su posición en la lista; un cirujano o
+    vehículo que ya tenía clave (por ejemplo, compartido con otro centro) la conserva.
+
+    params:
+        - diario: DiarioEventos, o None.
+        """
+        self.diario = diario
+        if diario is not None:
+            self.nombrar_en_diario(diario)
+        for cirujano in self.lista_cirujanos:
+            cirujano.diario = diario
+
+    def nombrar_en_diario(self, diario):
+        """
+        Método auxiliar que nombra al centro, sus vehículos y sus cirujanos en un diario, sin conectarlos (ver conectar_diario).
+        """
+        diario.nombrar(self, self.nombre)
+        for i, vehiculo in enumerate(self.lista_vehiculos):
+            diario.nombrar(vehiculo, f"{self.nombre}/vehiculo/{i}")
+        for i, cirujano in enumerate(self.lista_cirujanos):
+            diario.nombrar(cirujano, f"{self.nombre}/cirujano/{i}")
+
+    def conectar_reloj(self, reloj):
+        """
+    Conecta el centro y sus cirujanos al reloj del sistema; los cirujanos que se agreguen después también lo usan.
+
+    params:
+        - reloj: Reloj de INCUCAI.
+        """
+        self.reloj = reloj
+        for cirujano in self.lista_cirujanos:
+            cirujano.reloj = reloj
+
     def asignar_pacientes(self, pacientes: list[Receptores | Donantes]):
         """
     Asigna una lista de pacientes (Receptores o Donantes) al centro de salud.
@@ -69,16 +148,22 @@ class CentroSalud:
 
 
  #La logica es que el centro es el del donante
-    def asignar_y_mandar_vehiculo(self, receptor : Receptores):
+    def asignar_y_mandar_vehiculo(self, receptor : Receptores, distancia = None, despachador = None):
         """
     Asigna y despacha un vehículo adecuado para transportar un órgano hacia el receptor,
     según la ubicación del paciente en relación con el centro de salud. Una vez encuentra, su disponibilidad es "ocupado".
+    El vehículo sale del índice de la flota: siempre el más rápido libre de la clase adecuada.
+    Si el centro no tiene ninguno libre y se indica un despachador, se pide prestado al centro más cercano
+    que tenga uno, y el viaje suma el tramo desde ese centro hasta acá.
     
     params:
         - receptor: Objeto de tipo Receptor que representa al paciente que recibirá el órgano.
+        - distancia: Distancia real en km hasta el receptor (por ejemplo, de MatrizDistancias). Si es None,
+          se usa una distancia aleatoria dentro del rango de cada tipo de traslado.
+        - despachador: DespachadorNacional para pedir vehículos a otros centros (opcional).
     
     precon:
-        - Debe haber al menos un vehículo disponible del tipo adecuado en la lista del centro.
+        - Debe haber al menos un vehículo disponible del tipo adecuado en la lista del centro (o, con despachador, en el país).
     
     returns:
         El resultado del método `despachar(distancia)` del vehículo seleccionado si se encuentra uno disponible.
@@ -86,61 +171,124 @@ class CentroSalud:
     """
     #Despues de hacer pruebas, el receptor siempre tendra atributos de partido y provincia y tampoco sera un valor nulo, es por eso que omitimos los ifs para corroborar que dichos casos no ocurran.
 
-        if receptor.partido.__ne__(self.partido): #metodo magico ne (!=)
-            distancia = rnd.randint(20, 300)
-            for vehiculo in self.lista_vehiculos:
-                if isinstance(vehiculo, Helicoptero) and vehiculo.disponibilidad.__eq__("Disponible"): #metodo magico eq (==) y ademas, utiliza isistance para chequear que los vehiculos de la lista del centro sean del tipo adecuado
-                    vehiculo.disponibilidad = "Ocupado"
-                    return vehiculo.despachar(distancia)
-            print("No hay helicópteros disponibles")
-            return None
+        clase = self.clase_de_traslado(receptor.partido, receptor.provincia)
+        if distancia is None:
+            distancia = rnd.randint(*self.RANGO_DISTANCIA[clase])
+
+        return self.mandar_vehiculo(clase, distancia, despachador)
+
+    def mandar_vehiculo(self, clase: type, distancia, despachador = None):
+        """
+    Despacha el vehículo libre más rápido de una clase a una distancia dada. Si el centro no tiene ninguno
+    libre y se indica un despachador, se pide prestado al centro más cercano que tenga uno, y el viaje suma
+    el tramo desde ese centro hasta acá.
+
+    params:
+        - clase: Clase de vehículo (Auto, Helicoptero o Avion).
+        - distancia: Distancia del viaje en km.
+        - despachador: DespachadorNacional para pedir vehículos a otros centros (opcional).
+
+    returns:
+        Las horas que tardó el viaje, o None si no había ningún vehículo de esa clase.
+        """
+        vehiculo = self.flota.tomar(clase) #el vehiculo libre mas rapido del centro, O(log n)
+        if vehiculo is not None:
+            return self._despachar(vehiculo, distancia)
 
-        elif receptor.provincia.__ne__(self.provincia):
-            distancia = rnd.randint(300, 1700)
-            for vehiculo in self.lista_vehiculos:
-                if isinstance(vehiculo, Avion) and vehiculo.disponibilidad.__eq__("Disponible"):
-                    vehiculo.disponibilidad = "Ocupado"
-                    return vehiculo.despachar(distancia)
-            print("No hay aviones disponibles")
+        prestamo = despachador.tomar_mas_cercano(self, clase) if despachador is not None else None
+        if prestamo is None:
+            print(self.SIN_VEHICULOS[clase])
             return None
+        vehiculo, origen, reposicion = prestamo
+        print(f" {vehiculo.identificador} enviado desde {origen} ({reposicion:.1f} km hasta {self})")
+        return origen._despachar(vehiculo, reposicion + distancia) #el viaje incluye el tramo de reposicionamiento
+
+    def _despachar(self, vehiculo, distancia):
+        """
+        Método auxiliar que despacha un vehículo ya tomado de la flota y, si quedó disponible al terminar el viaje,
+        lo devuelve a la flota.
+        """
+        tiempo = vehiculo.despachar(distancia)
+        if vehiculo.disponibilidad is EstadoVehiculo.DISPONIBLE:
+            self.flota.liberar(vehiculo)
+        if self.diario is not None:
+            distancia, nivel_trafico, tiempo_viaje = vehiculo.registro_viajes.ultimo()
+            self.diario.registrar(self.diario.TRASLADO, centro=self, vehiculo=vehiculo, distancia=distancia,
+                                  nivel_trafico=nivel_trafico, tiempo=tiempo_viaje)
+        return tiempo
+
+    def clase_de_traslado(self, partido, provincia):
+        """
+    Indica qué tipo de vehículo se usa para llevar un órgano desde este centro hasta un partido y provincia dados.
+
+    params:
+        - partido: Partido de destino.
+        - provincia: Provincia de destino.
+
+    returns:
+        La clase Helicoptero si el partido es distinto, Avion si la provincia es distinta, o Auto si es local.
+        Es la misma regla que usa asignar_y_mandar_vehiculo.
+        """
+        if partido != self.partido:
+            return Helicoptero
+        elif provincia != self.provincia:
+            return Avion
+        return Auto
+
+    def tiempo_estimado_traslado(self, destino: "CentroSalud", distancia = None):
+        """
+    Estima cuántas horas tardaría en llegar un órgano desde este centro hasta el centro de destino,
+    usando el vehículo más rápido del tipo adecuado que tenga este centro.
+
+    params:
+        - destino: CentroSalud donde se encuentra el receptor.
+        - distancia: Distancia real en km (opcional). Si es None, se usa la distancia esperada del tipo de traslado.
+
+    returns:
+        Las horas estimadas de viaje, o None si este centro no tiene vehículos del tipo necesario.
+        """
+        clase = self.clase_de_traslado(destino.partido, destino.provincia)
+        if distancia is None:
+            distancia = self.DISTANCIA_ESTIMADA[clase]
+        return self.tiempo_estimado_tramo(clase, distancia)
+
+    def tiempo_estimado_tramo(self, clase: type, distancia):
+        """
+    Estima cuántas horas tarda el vehículo más rápido de una clase que tenga este centro en recorrer una distancia.
 
-        elif receptor.partido.__eq__(self.partido) and receptor.provincia.__eq__(self.provincia):
-            distancia = rnd.randint(1, 20)
-            autos_disponibles = [vehiculo for vehiculo in self.lista_vehiculos
-                                 if isinstance(vehiculo, Auto) and vehiculo.disponibilidad.__eq__("Disponible")]
+    params:
+        - clase: Clase de vehículo (Auto, Helicoptero o Avion).
+        - distancia: Distancia en km.
 
-            if autos_disponibles:
-                auto_mas_rapido = max(autos_disponibles, key=lambda vehiculo: vehiculo.velocidad_viajes)
-                auto_mas_rapido.disponibilidad = "Ocupado"
-                return auto_mas_rapido.despachar(distancia)
-            else:
-                print("No hay autos disponibles")
-                return None
+    returns:
+        Las horas estimadas (a los autos se les suma el tráfico promedio), o None si el centro no tiene vehículos de esa clase.
+        """
+        velocidades = [vehiculo.velocidad_viajes for vehiculo in self.lista_vehiculos if isinstance(vehiculo, clase)]
+        if not velocidades:
+            return None
 
-        return None
+        tiempo = distancia / max(velocidades)
+        if clase is Auto:
+            tiempo += self.TRAFICO_ESTIMADO_AUTO
+        return tiempo
 
     def obtener_cirujanos_disponibles(self):
         """
-        Obtiene una lista de cirujanos que están realmente disponibles.
-        Verifica automáticamente si han cumplido las 24 horas de recuperación.
+        Obtiene una lista de cirujanos que están realmente disponibles, en el orden de la lista del centro.
+        Sale del plantel, que solo revisa a los cirujanos cuya recuperación de 24 horas terminó desde la última consulta.
         """
-        cirujanos_disponibles = []
-        for cirujano in self.lista_cirujanos:
-            if cirujano.verificar_disponibilidad():
-                cirujanos_disponibles.append(cirujano)
-        return cirujanos_disponibles
+        return self.plantel.disponibles()
 
     def obtener_mejor_cirujano_para_organo(self, organo_necesario):
         """
     Retorna el mejor cirujano disponible para realizar un trasplante de un órgano específico.
 
     params:
-        - organo_necesario: Cadena de texto que representa el nombre del órgano que se necesita trasplantar.
+        - organo_necesario: Órgano que se necesita trasplantar (nombre o TipoOrgano).
 
     precon:
-        - `organo_necesario` debe ser una cadena válida y en un formato reconocible por los métodos de los cirujanos.
-        - Se asume que cada cirujano tiene un método `get_organos_compatibles()` que devuelve una lista de órganos que puede operar.
-        - La lista de cirujanos disponibles se obtiene a través del método `obtener_cirujanos_disponibles()`.
+        - `organo_necesario` debe ser uno de los órganos de TipoOrgano.
+        - La búsqueda usa el índice `plantel`, que arma los grupos especialista/general/otro a partir de la tabla de sinergias.
 
     returns:
         - Un objeto Cirujano compatible con el órgano requerido, priorizando especialistas por sobre cirujanos generales.
@@ -148,28 +296,7 @@ class CentroSalud:
         - Si no hay ninguno disponible, retorna el primer cirujano libre como último recurso.
         - Si no hay ningún cirujano disponible, retorna `None`.
     """
-        cirujanos_disponibles = self.obtener_cirujanos_disponibles()
-
-        if not cirujanos_disponibles:
-            return None
-
-        organo_necesario = organo_necesario.lower()
-
-        # Primero buscar especialistas compatibles
-        for cirujano in cirujanos_disponibles:
-            especialidad = cirujano.especialidad.lower()
-            if especialidad != "general":  # No es general
-                organos_compatibles = cirujano.get_organos_compatibles() 
-                if organo_necesario in organos_compatibles:
-                    return cirujano  # Encontrado especialista compatible
-
-        # Si no hay especialistas, buscar cirujano general
-        for cirujano in cirujanos_disponibles:
-            if cirujano.especialidad.lower() == "general":
-                return cirujano
-
-        # Si no hay generales, devolver cualquier cirujano disponible
-        return cirujanos_disponibles[0] if cirujanos_disponibles else None
+        return self.plantel.mejor_para_organo(TipoOrgano.desde_texto(organo_necesario)) #especialista, general u otro, sin recorrer la lista
 
 
     def mostrar_estado_cirujanos(self):
@@ -196,30 +323,31 @@ class CentroSalud:
         - Debe haber al menos un cirujano disponible en el centro de salud, preferentemente especializado.
 
     returns:
-        - No retorna ningún valor. Realiza acciones internas:
+        - True si la cirugía fue exitosa, False si falló y None si no había cirujanos disponibles. Además:
             - Asigna al mejor cirujano disponible para el órgano requerido.
             - Llama al método `realizar_cirujia()` del cirujano asignado.
             - Agrega al paciente a la lista de `pacientes_exitosos` o `pacientes_fallidos` según el resultado.
     """
 
-        cirujano_asignado = self.obtener_mejor_cirujano_para_organo(receptor.organo_a_recibir) #la funcion puede retornar al mejor cirujano o al disponible, por eso se la llama
+        cirujano_asignado = self.obtener_mejor_cirujano_para_organo(receptor.codigo_organo) #la funcion puede retornar al mejor cirujano o al disponible, por eso se la llama
 
         if cirujano_asignado is None:
             print(f" No hay cirujanos disponibles en {self.nombre}")
             # Mostrar información sobre cuándo estarán disponibles
-            print("Estado actual de cirujanos:")
-            for cirujano in self.lista_cirujanos:
-                tiempo_restante = cirujano.tiempo_restante_recuperacion()
-                if tiempo_restante > 0:
-                    print(f"  - {cirujano.especialidad.title()}: Disponible en {tiempo_restante} horas")
-                else:
-                    print(f"  - {cirujano.especialidad.title()}: Disponible ahora")
-            return
+            proximo = self.plantel.proximo_libre() #cuando se libera el primero, sin recorrer a todos
+            if proximo is not None:
+                cirujano, _ = proximo
+                print(f"  - Próximo disponible: {cirujano.especialidad.title()} en {cirujano.tiempo_restante_recuperacion()} horas")
+            return None
 
         # Realizar la cirugía
         print(f" Asignando cirujano {cirujano_asignado.especialidad.title()} para {receptor.organo_a_recibir}")
 
         resultado_cirugia = cirujano_asignado.realizar_cirujia(tiempo, receptor)
+        self.plantel.devolver(cirujano_asignado) #pasa a recuperacion si llego a operar
+        if self.diario is not None:
+            self.diario.registrar(self.diario.CIRUGIA, centro=self, cirujano=cirujano_asignado, dni=receptor.DNI,
+                                  exitosa=bool(resultado_cirugia))
 
         if resultado_cirugia:
             self.pacientes_exitosos.append(receptor)
@@ -227,5 +355,6 @@ class CentroSalud:
         else:
             self.pacientes_fallidos.append(receptor)
             print(f" Paciente {receptor.nombre} agregado a lista de fallidos")
+        return resultado_cirugia
 
             
@@ -0,0 +1,145 @@
+import heapq
+import math
+from centro_salud.Matriz_Distancias import MatrizDistancias
+
+
+class DespachadorNacional:
+
+    TAMAÑO_HOJA = 8 #centros por hoja del arbol, debajo de esto conviene revisarlos uno por uno
+
+    def __init__(self, centros: list, matriz_distancias: MatrizDistancias = None):
+        """
+    Despachador de la flota nacional: cuando un centro no tiene un vehículo libre de la clase que necesita,
+    busca el vehículo libre de esa clase en el centro más cercano que lo tenga.
+
+    Los centros se indexan en un árbol k-d sobre sus coordenadas pasadas a puntos de la esfera unitaria
+    (x, y, z), asi la distancia en línea recta entre puntos respeta el orden de las distancias sobre la
+    superficie. Los vecinos se recorren del más cercano al más lejano (búsqueda "best-first") y se corta
+    en el primero con un vehículo libre, sin revisar el resto del país.
+
+    params:
+        - centros: Lista de CentroSalud. Los centros sin coordenadas no prestan vehículos.
+        - matriz_distancias: Distancias reales entre centros para el tramo de reposicionamiento (opcional).
+          Sin ella se calcula la distancia geodésica en el momento.
+        """
+        self.matriz_distancias = matriz_distancias
+        self.actualizar(centros)
+
+    @staticmethod
+    def punto(latitud: float, longitud: float) -> tuple[float, float, float]:
+        """
+        Método auxiliar que pasa una latitud y longitud (en grados) a un punto (x, y, z) de la esfera unitaria.
+        """
+        latitud, longitud = math.radians(latitud), math.radians(longitud)
+        return (math.cos(latitud) * math.cos(longitud), math.cos(latitud) * math.sin(longitud), math.sin(latitud))
+
+    def actualizar(self, centros: list):
+        """
+    Reconstruye el árbol con una lista de centros (por ejemplo, si se agregaron centros nuevos). O(n log² n).
+
+    params:
+        - centros: Lista de CentroSalud.
+        """
+        self._centros = [centro for centro in centros if centro.latitud is not None and centro.longitud is not None]
+        self._puntos = [self.punto(centro.latitud, centro.longitud) for centro in self._centros]
+        self._raiz = self._construir(list(range(len(self._centros)))) if self._centros else None
+
+    def _construir(self, indices: list[int]) -> tuple:
+        """
+        Método auxiliar que arma un nodo del árbol: (mínimos, máximos, hijo izquierdo, hijo derecho) o,
+        si es una hoja, (mínimos, máximos, índices de sus centros, None). Se parte por el eje más largo de la caja.
+        """
+        puntos = self._puntos
+        minimos = tuple(min(puntos[i][eje] for i in indices) for eje in range(3))
+        maximos = tuple(max(puntos[i][eje] for i in indices) for eje in range(3))
+        if len(indices) <= self.TAMAÑO_HOJA:
+            return (minimos, maximos, indices, None)
+
+        eje = max(range(3), key=lambda e: maximos[e] - minimos[e])
+        indices.sort(key=lambda i: puntos[i][eje])
+        medio = len(indices) // 2
+        return (minimos, maximos, self._construir(indices[:medio]), self._construir(indices[medio:]))
+
+    def centros_cercanos(self, latitud: float, longitud: float):
+        """
+    Recorre los centros indexados del más cercano al más lejano a un punto. Cada paso cuesta O(log n),
+    asi que pedir solo los primeros vecinos no recorre todo el árbol.
+
+    params:
+        - latitud, longitud: Punto de consulta, en grados.
+
+    returns:
+        Un generador de CentroSalud ordenados por cercanía.
+        """
+        if self._raiz is None:
+            return
+        consulta = self.punto(latitud, longitud)
+        pendientes = [(0.0, 0, self._raiz, -1)] #(distancia² minima, desempate, nodo o None, indice del centro)
+        contador = 1
+        while pendientes:
+            _, _, nodo, indice = heapq.heappop(pendientes)
+            if nodo is None:
+                yield self._centros[indice]
+                continue
+
+            _, _, izquierdo, derecho = nodo
+            if derecho is None: #hoja: sus centros entran a la cola con su distancia exacta
+                for i in izquierdo:
+                    distancia = sum((a - b) ** 2 for a, b in zip(self._puntos[i], consulta))
+                    heapq.heappush(pendientes, (distancia, contador, None, i))
+                    contador += 1
+            else: #nodo interno: cada hijo entra con la distancia a su caja, que es una cota inferior
+                for hijo in (izquierdo, derecho):
+                    minimos, maximos = hijo[0], hijo[1]
+                    cota = sum(max(minimo - q, 0.0, q - maximo) ** 2 for minimo, maximo, q in zip(minimos, maximos, consulta))
+                    heapq.heappush(pendientes, (cota, contador, hijo, -1))
+                    contador += 1
+
+    def mas_cercano_con_libre(self, centro, clase: type) -> tuple | None:
+        """
+    Busca, sin tomarlo, el centro más cercano (sin contar al propio) que tenga un vehículo libre de una clase.
+
+    params:
+        - centro: CentroSalud que necesita el vehículo.
+        - clase: Clase de vehículo (Auto, Helicoptero o Avion).
+
+    returns:
+        Una tupla (centro de origen, km del tramo de reposicionamiento hasta `centro`), o None si el centro no
+        tiene coordenadas o no hay ningún vehículo libre de esa clase en el país.
+        """
+        if centro.latitud is None or centro.longitud is None:
+            return None
+
+        for vecino in self.centros_cercanos(centro.latitud, centro.longitud):
+            if vecino is centro or not vecino.flota.hay_libre(clase):
+                continue
+            distancia = self.matriz_distancias.distancia(vecino, centro) if self.matriz_distancias is not None else None
+            if distancia is None:
+                distancia = MatrizDistancias.distancia_geodesica(vecino.latitud, vecino.longitud, centro.latitud, centro.longitud)
+            return vecino, distancia
+        return None
+
+    def tomar_mas_cercano(self, centro, clase: type) -> tuple | None:
+        """
+    Toma el vehículo libre más rápido de una clase del centro más cercano que tenga uno, sin contar
+    al propio centro. El vehículo queda ocupado en la flota de su centro.
+
+    params:
+        - centro: CentroSalud que necesita el vehículo.
+        - clase: Clase de vehículo (Auto, Helicoptero o Avion).
+
+    returns:
+        Una tupla (vehiculo, centro de origen, km del tramo de reposicionamiento hasta `centro`), o None si el
+        centro no tiene coordenadas o no hay ningún vehículo libre de esa clase en el país.
+        """
+        cercano = self.mas_cercano_con_libre(centro, clase)
+        if cercano is None:
+            return None
+        vecino, distancia = cercano
+        return vecino.flota.tomar(clase), vecino, distancia
+
+    def __len__(self):
+        """
+        Método mágico que devuelve la cantidad de centros indexados.
+        """
+        return len(self._centros)
@@ -0,0 +1,165 @@
+import os
+import numpy as np
+from geographiclib.geodesic import Geodesic
+
+
+class MatrizDistancias:
+
+    def __init__(self, ruta: str = None):
+        """
+    Matriz de distancias geodésicas (en km, sobre el elipsoide WGS84) entre todos los pares de centros de salud.
+
+    Las distancias se calculan una sola vez con geographiclib y después cada consulta es una búsqueda en la
+    matriz. Si se indica una ruta, la matriz se guarda en ese archivo (.npz) y al volver a abrir el sistema
+    solo se calculan los pares de centros nuevos o que cambiaron de coordenadas.
+
+    params:
+        - ruta: Archivo donde se guarda la matriz (opcional). Si existe, se carga al crear el objeto.
+        """
+        self.ruta = ruta
+        self._claves: list[tuple] = [] #(nombre, latitud, longitud) de cada fila de la matriz
+        self._distancias = np.empty((0, 0))
+        self._centros: list = [] #centros de cada fila, en el mismo orden que _claves
+        self._indice: dict = {} #centro -> fila de la matriz
+
+        if ruta and os.path.exists(ruta):
+            self.cargar(ruta)
+
+    @staticmethod
+    def clave(centro) -> tuple:
+        """
+        Método auxiliar que identifica a un centro por su nombre y coordenadas: si alguno cambia, se recalculan sus distancias.
+        """
+        return (centro.nombre, getattr(centro, 'latitud', None), getattr(centro, 'longitud', None))
+
+    @staticmethod
+    def distancia_geodesica(latitud1: float, longitud1: float, latitud2: float, longitud2: float) -> float:
+        """
+    Calcula la distancia geodésica entre dos puntos.
+
+    returns:
+        La distancia en kilómetros.
+        """
+        return Geodesic.WGS84.Inverse(latitud1, longitud1, latitud2, longitud2, Geodesic.DISTANCE)['s12'] / 1000
+
+    def actualizar(self, centros: list) -> bool:
+        """
+    Deja la matriz al día con la lista de centros. Los pares que ya estaban calculados (mismo nombre y mismas
+    coordenadas) se reutilizan, solo se resuelven los pares que involucran centros nuevos o modificados.
+
+    params:
+        - centros: Lista de CentroSalud. Los centros sin coordenadas quedan sin distancia (NaN).
+
+    returns:
+        True si hubo que calcular distancias nuevas (y, si hay ruta, se guardó la matriz), False si no cambió nada.
+        """
+        claves = [self.clave(centro) for centro in centros]
+        self._centros = list(centros)
+        self._indice = {centro: i for i, centro in enumerate(self._centros)}
+        if claves == self._claves:
+            return False
+
+        anteriores = {clave: i for i, clave in enumerate(self._claves)}
+        posiciones = [anteriores.get(clave, -1) for clave in claves]
+        n = len(claves)
+        distancias = np.full((n, n), np.nan)
+
+        #copiar los pares ya calculados
+        reutilizadas = [i for i, posicion in enumerate(posiciones) if posicion >= 0]
+        if reutilizadas:
+            viejas = [posiciones[i] for i in reutilizadas]
+            distancias[np.ix_(reutilizadas, reutilizadas)] = self._distancias[np.ix_(viejas, viejas)]
+
+        #calcular solo las filas de los centros nuevos, contra todas las columnas (un par entre dos centros nuevos se
+        #calcula una vez, desde la fila del primero)
+        nuevos = [i for i, posicion in enumerate(posiciones) if posicion < 0]
+        con_coordenadas = [j for j, (_, latitud, longitud) in enumerate(claves) if latitud is not None and longitud is not None]
+        for i in nuevos:
+            _, latitud_i, longitud_i = claves[i]
+            if latitud_i is None or longitud_i is None:
+                continue
+            distancias[i, i] = 0.0
+            for j in con_coordenadas:
+                if j == i or (posiciones[j] < 0 and j < i):
+                    continue
+                _, latitud_j, longitud_j = claves[j]
+                distancias[i, j] = distancias[j, i] = self.distancia_geodesica(latitud_i, longitud_i, latitud_j, longitud_j)
+
+        self._claves = claves
+        self._distancias = distancias
+        if self.ruta:
+            self.guardar(self.ruta)
+        return True
+
+    def submatriz(self, centros: list) -> 'MatrizDistancias':
+        """
+    Arma una matriz (sin ruta) solo con los centros indicados, copiando sus distancias de esta en lugar de
+    volver a calcularlas. Los centros que no estaban en esta matriz se calculan como en actualizar().
+
+    params:
+        - centros: Lista de CentroSalud.
+
+    returns:
+        La nueva MatrizDistancias, ya al día con esos centros.
+        """
+        filas = [self._indice[centro] for centro in centros if centro in self._indice]
+        matriz = MatrizDistancias()
+        matriz._claves = [self._claves[fila] for fila in filas]
+        matriz._distancias = self._distancias[np.ix_(filas, filas)]
+        matriz.actualizar(centros)
+        return matriz
+
+    def distancia(self, origen, destino) -> float | None:
+        """
+    Devuelve la distancia entre dos centros con una búsqueda en la matriz. O(1).
+    Si alguno de los centros no estaba en la matriz, se agrega (calculando solo sus distancias).
+
+    params:
+        - origen: CentroSalud de salida.
+        - destino: CentroSalud de llegada.
+
+    returns:
+        La distancia en kilómetros, o None si alguno de los centros no tiene coordenadas.
+        """
+        if origen is None or destino is None:
+            return None
+        i = self._indice.get(origen)
+        j = self._indice.get(destino)
+        if i is None or j is None:
+            faltantes = [centro for centro in dict.fromkeys((origen, destino)) if centro not in self._indice]
+            self.actualizar(self._centros + faltantes)
+            i, j = self._indice[origen], self._indice[destino]
+
+        distancia = self._distancias[i, j]
+        return None if np.isnan(distancia) else float(distancia)
+
+    def guardar(self, ruta: str):
+        """
+    Guarda la matriz y las claves de sus centros en un archivo .npz.
+
+    params:
+        - ruta: Archivo de destino.
+        """
+        nombres = np.array([nombre for nombre, _, _ in self._claves], dtype=str)
+        coordenadas = np.array([[np.nan if latitud is None else latitud, np.nan if longitud is None else longitud]
+                                for _, latitud, longitud in self._claves], dtype=float).reshape(-1, 2)
+        with open(ruta, 'wb') as archivo: #con un archivo abierto, numpy no le agrega la extension .npz a la ruta
+            np.savez(archivo, nombres=nombres, coordenadas=coordenadas, distancias=self._distancias)
+
+    def cargar(self, ruta: str):
+        """
+    Carga una matriz guardada con guardar(). Las filas se asocian a los centros recién cuando se llama a actualizar().
+
+    params:
+        - ruta: Archivo .npz a leer.
+        """
+        with np.load(ruta, allow_pickle=False) as datos:
+            self._claves = [(str(nombre), None if np.isnan(latitud) else float(latitud), None if np.isnan(longitud) else float(longitud))
+                            for nombre, (latitud, longitud) in zip(datos['nombres'], datos['coordenadas'])]
+            self._distancias = datos['distancias']
+
+    def __len__(self):
+        """
+        Método mágico que devuelve la cantidad de centros de la matriz.
+        """
+        return len(self._claves)
@@ -0,0 +1,160 @@
+import math
+from itertools import islice
+from centro_salud.Despachador_Nacional import DespachadorNacional
+from centro_salud.Matriz_Distancias import MatrizDistancias
+from vehiculos.Auto import Auto
+from vehiculos.Avion import Avion
+from vehiculos.Helicoptero import Helicoptero
+
+
+class PlanificadorRutas:
+
+    LIMITE_ISQUEMIA = 20 #horas maximas entre la ablacion y la cirugia (mismo limite que Cirujanos.realizar_cirujia)
+    #km que puede cubrir cada tipo de vehiculo en un tramo, con los mismos cortes que CentroSalud.RANGO_DISTANCIA
+    ALCANCE = {Auto: (0, math.inf), Helicoptero: (20, 300), Avion: (300, math.inf)}
+    AERODROMOS_CANDIDATOS = 3 #aerodromos cercanos que se prueban a cada lado del vuelo
+
+    def __init__(self, centros: list, matriz_distancias: MatrizDistancias, despachador: DespachadorNacional = None):
+        """
+    Planificador de traslados de órganos: antes de despachar, arma el plan más rápido que llega dentro de la
+    ventana de isquemia, en vez de elegir el vehículo solo por partido y provincia.
+
+    Se comparan:
+        - un tramo directo en auto o en helicóptero;
+        - auto hasta un aeródromo, avión hasta el aeródromo más conveniente cerca del destino y auto hasta el
+          destino (los tramos en auto se omiten si el origen o el destino son aeródromos).
+
+    Los aeródromos son los centros con aviones en su flota: los aviones salen y aterrizan solo en ellos.
+    Si un centro no tiene un vehículo libre para su tramo, el tramo se estima con el que prestaría el
+    centro más cercano (ver DespachadorNacional). Los tiempos de cada tramo con la flota propia se guardan
+    en un caché, asi planificar bajo carga es solo sumar unos pocos valores ya calculados.
+
+    params:
+        - centros: Lista de CentroSalud.
+        - matriz_distancias: Distancias entre centros.
+        - despachador: DespachadorNacional para tramos con vehículos prestados (opcional).
+        """
+        self.matriz_distancias = matriz_distancias
+        self.despachador = despachador
+        self._aerodromos = DespachadorNacional([centro for centro in centros
+                                                if any(isinstance(vehiculo, Avion) for vehiculo in centro.lista_vehiculos)],
+                                               matriz_distancias)
+        self._tiempos: dict[tuple, tuple[float, float] | None] = {} #(origen, destino, clase) -> (km, horas) con la flota del origen
+
+    def limpiar_cache(self):
+        """
+        Método auxiliar que descarta los tiempos guardados (por ejemplo, si cambiaron las flotas de los centros).
+        """
+        self._tiempos.clear()
+
+    def tiempo_tramo(self, origen, destino, clase: type) -> tuple[float, float] | None:
+        """
+    Estima un tramo con el vehículo más rápido de la clase que tiene el centro de origen. El resultado se guarda en caché.
+
+    params:
+        - origen: CentroSalud de salida.
+        - destino: CentroSalud de llegada.
+        - clase: Clase de vehículo (Auto, Helicoptero o Avion).
+
+    returns:
+        Una tupla (km, horas estimadas), o None si no hay distancia entre los centros, está fuera del alcance
+        de esa clase o el origen no tiene vehículos de esa clase.
+        """
+        clave = (origen, destino, clase)
+        if clave not in self._tiempos:
+            distancia = self.matriz_distancias.distancia(origen, destino)
+            minimo, maximo = self.ALCANCE[clase]
+            horas = origen.tiempo_estimado_tramo(clase, distancia) if distancia is not None and minimo <= distancia <= maximo else None
+            self._tiempos[clave] = None if horas is None else (distancia, horas)
+        return self._tiempos[clave]
+
+    def _tramo(self, origen, destino, clase: type) -> tuple | None:
+        """
+        Método auxiliar que arma un tramo (clase, origen, destino, km, horas estimadas) con un vehículo libre del
+        origen o, si no tiene, con el que prestaría el centro más cercano (sumando el reposicionamiento).
+        """
+        estimado = self.tiempo_tramo(origen, destino, clase)
+        if estimado is not None and origen.flota.hay_libre(clase):
+            return (clase, origen, destino, *estimado)
+        if self.despachador is None:
+            return None
+
+        distancia = self.matriz_distancias.distancia(origen, destino)
+        minimo, maximo = self.ALCANCE[clase]
+        if distancia is None or not minimo <= distancia <= maximo:
+            return None
+        cercano = self.despachador.mas_cercano_con_libre(origen, clase)
+        if cercano is None:
+            return None
+        vecino, reposicion = cercano
+        return (clase, origen, destino, distancia, vecino.tiempo_estimado_tramo(clase, reposicion + distancia))
+
+    def _aerodromos_cercanos(self, centro, con_avion_libre: bool = False) -> list:
+        """
+        Método auxiliar que devuelve los AERODROMOS_CANDIDATOS aeródromos más cercanos a un centro (opcionalmente,
+        solo los que tienen un avión libre).
+        """
+        if centro.latitud is None or centro.longitud is None:
+            return []
+        cercanos = self._aerodromos.centros_cercanos(centro.latitud, centro.longitud)
+        if con_avion_libre:
+            cercanos = (aerodromo for aerodromo in cercanos if aerodromo.flota.hay_libre(Avion))
+        return list(islice(cercanos, self.AERODROMOS_CANDIDATOS))
+
+    def planificar(self, origen, destino, horas_transcurridas: float = 0.0) -> tuple[float, list[tuple]] | None:
+        """
+    Calcula el plan de traslado más rápido que llega antes del límite de isquemia.
+
+    params:
+        - origen: CentroSalud donde está el órgano.
+        - destino: CentroSalud del receptor.
+        - horas_transcurridas: Horas que ya pasaron desde la ablación del órgano.
+
+    returns:
+        Una tupla (horas estimadas, tramos) donde cada tramo es (clase, centro de salida, centro de llegada, km, horas),
+        o None si ningún plan llega a tiempo.
+        """
+        opciones = []
+        for clase in (Auto, Helicoptero):
+            tramo = self._tramo(origen, destino, clase)
+            if tramo is not None:
+                opciones.append([tramo])
+
+        llegadas = self._aerodromos_cercanos(destino)
+        for salida in self._aerodromos_cercanos(origen, con_avion_libre=True):
+            ida = [] if salida is origen else [self._tramo(origen, salida, Auto)]
+            if None in ida:
+                continue
+            for llegada in llegadas:
+                vuelo = self._tramo(salida, llegada, Avion) if llegada is not salida else None
+                vuelta = [] if llegada is destino else [self._tramo(llegada, destino, Auto)]
+                if vuelo is None or None in vuelta:
+                    continue
+                opciones.append(ida + [vuelo] + vuelta)
+
+        margen = self.LIMITE_ISQUEMIA - horas_transcurridas
+        factibles = [(sum(tramo[4] for tramo in tramos), tramos) for tramos in opciones]
+        factibles = [plan for plan in factibles if plan[0] <= margen]
+        return min(factibles, key=lambda plan: plan[0]) if factibles else None
+
+    def ejecutar(self, plan: tuple[float, list[tuple]], despachador: DespachadorNacional = None) -> float | None:
+        """
+    Despacha los vehículos de cada tramo de un plan, en orden.
+
+    params:
+        - plan: Plan devuelto por planificar().
+        - despachador: DespachadorNacional para pedir prestado un vehículo si el de un tramo ya no está libre (opcional).
+
+    returns:
+        Las horas reales del traslado (suma de los viajes), o None si algún tramo se quedó sin vehículo.
+        """
+        horas_estimadas, tramos = plan
+        print(f" Traslado planificado ({horas_estimadas:.1f} hs estimadas): "
+              + " | ".join(f"{clase.__name__} {origen} -> {destino}" for clase, origen, destino, _, _ in tramos))
+        total = 0.0
+        for clase, origen, _, distancia, _ in tramos:
+            horas = origen.mandar_vehiculo(clase, distancia, despachador or self.despachador)
+            if horas is None:
+                return None
+            total += horas
+        return total
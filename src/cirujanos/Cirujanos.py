@@ -1,16 +1,39 @@
 import random as rnd
-from datetime import datetime
+from datetime import timedelta
+from codigos.Codigos import Especialidad, TipoOrgano
 from pacientes.Receptores import Receptores  # Importar la clase Receptores desde el archivo Receptores.py de la carpeta pacientes
+from reloj.Reloj import Reloj, RELOJ_REAL
 
 
 class Cirujanos:
 
-    def __init__(self, especialidad):
+    #Tabla de sinergias, compartida por todos los cirujanos (antes cada instancia armaba su propia copia)
+    tabla_sinergias = {
+        "cardiovascular": ["corazon"],
+        "pulmonar": ["pulmon"],
+        "plastico": ["piel", "corneas"],
+        "traumatologo": ["huesos"],
+        "gastroenterologo": ["higado", "riñon", "intestinos"],
+        "general": ["corazon", "pulmon", "piel", "corneas", "huesos", "higado", "riñon", "intestinos"]
+    }
+    #una cirugia es exitosa si rnd.randint(1, 10) >= umbral
+    UMBRAL_GENERAL = 5 #60%, el cirujano general opera cualquier organo
+    UMBRAL_ESPECIALISTA = 3 #80%
+    UMBRAL_NO_ESPECIALISTA = 5 #60%
+    #la misma tabla con codigos: especialidad -> conjunto de organos que opera
+    ORGANOS_POR_ESPECIALIDAD = {
+        Especialidad.desde_texto(especialidad): frozenset(TipoOrgano.desde_texto(organo) for organo in organos)
+        for especialidad, organos in tabla_sinergias.items()
+    }
+    diario = None #DiarioEventos donde se anota cada cirugia que empieza, lo conecta el centro de salud
+
+    def __init__(self, especialidad, reloj: Reloj = None):
         """
     Constructor de la clase Cirujanos.
     
     params:
         - especialidad: La especialidad médica del cirujano (por ejemplo, 'cardiovascular', 'plastico', etc.).
+        - reloj: Reloj del que toma la hora actual para su recuperación (por defecto, el reloj real).
     
     precon:
         La especialidad debe estar en minúsculas o será convertida automáticamente. Se espera que coincida con alguna clave de la tabla de sinergias.
@@ -18,25 +41,20 @@ class Cirujanos:
     returns:
         No retorna nada directamente. Inicializa los atributos del objeto:
             - self.especialidad: almacena la especialidad en minúsculas.
+            - self.codigo_especialidad: la especialidad como Especialidad (OTRA si no figura en la tabla de sinergias).
             - self.disponibilidad: se setea como 'Disponible' por defecto.
             - self.ultima_cirugia: inicia como None y almacenará la última fecha de cirugía.
             - self.tiempo_recuperacion: valor fijo en horas (24) para volver a estar disponible.
-            - self.tabla_sinergias: diccionario que indica qué especialidades pueden operar qué órganos.
+            - self.organos_compatibles: códigos de los órganos de su especialidad (compartido, sale de ORGANOS_POR_ESPECIALIDAD).
+            - self.reloj: reloj que usa para saber cuánto tiempo pasó desde su última cirugía.
     """
         self.especialidad = especialidad.lower()
+        self.codigo_especialidad = Especialidad.desde_texto(especialidad, Especialidad.OTRA)
         self.disponibilidad = "Disponible"
         self.ultima_cirugia = None  #Almacena la fecha/hora de la última cirugía
         self.tiempo_recuperacion = 24  #Horas que debe esperar antes de estar disponible otra vez
-
-        #Tabla de sinergias
-        self.tabla_sinergias = {
-            "cardiovascular": ["corazon"],
-            "pulmonar": ["pulmon"],
-            "plastico": ["piel", "corneas"],
-            "traumatologo": ["huesos"],
-            "gastroenterologo": ["higado", "riñon", "intestinos"],  
-            "general": ["corazon", "pulmon", "piel", "corneas", "huesos", "higado", "riñon", "intestinos"]
-        }
+        self.organos_compatibles = self.ORGANOS_POR_ESPECIALIDAD.get(self.codigo_especialidad, frozenset())
+        self.reloj = reloj or RELOJ_REAL
 
     def verificar_disponibilidad(self):
         """
@@ -59,7 +77,7 @@ class Cirujanos:
             self.disponibilidad = "Disponible"
             return True
 
-        tiempo_actual = datetime.now()
+        tiempo_actual = self.reloj.ahora()
         tiempo_transcurrido = tiempo_actual - self.ultima_cirugia
         horas_transcurridas = tiempo_transcurrido.total_seconds() / 3600
 
@@ -91,7 +109,7 @@ class Cirujanos:
         if self.ultima_cirugia is None:
             return 0
 
-        tiempo_actual = datetime.now()
+        tiempo_actual = self.reloj.ahora()
         tiempo_transcurrido = tiempo_actual - self.ultima_cirugia
         horas_transcurridas = tiempo_transcurrido.total_seconds() / 3600
 
@@ -100,6 +118,24 @@ class Cirujanos:
         else:
             return round(self.tiempo_recuperacion - horas_transcurridas, 1)
 
+    def fin_recuperacion(self):
+        """
+        Método auxiliar que devuelve la fecha y hora en que termina la recuperación del cirujano (None si nunca operó).
+        """
+        if self.ultima_cirugia is None:
+            return None
+        return self.ultima_cirugia + timedelta(hours=self.tiempo_recuperacion)
+
+    def umbral_exito(self, codigo_organo: TipoOrgano) -> int:
+        """
+        Método auxiliar que devuelve el valor mínimo de rnd.randint(1, 10) para que este cirujano tenga éxito con un órgano.
+        """
+        if self.codigo_especialidad is Especialidad.GENERAL:
+            return self.UMBRAL_GENERAL
+        if codigo_organo in self.organos_compatibles:
+            return self.UMBRAL_ESPECIALISTA
+        return self.UMBRAL_NO_ESPECIALISTA
+
     def realizar_cirujia(self, tiempo, receptor: Receptores):
         """
         Simula el proceso de una cirugía y determina su éxito.
@@ -141,17 +177,19 @@ class Cirujanos:
 
         if tiempo_tardado <= 20:
             #Obtener la especialidad correctamente y verificar compatibilidad
-            organo_necesario = receptor.organo_a_recibir.lower()
-            especialidad_cirujano = self.especialidad.lower()
+            organo_necesario = receptor.organo_a_recibir
+            especialidad_cirujano = self.especialidad
 
             #Marcar el tiempo de la cirugía y cambiar disponibilidad
-            self.ultima_cirugia = datetime.now()
+            self.ultima_cirugia = self.reloj.ahora()
             self.disponibilidad = "Ocupado"
+            if self.diario is not None:
+                self.diario.registrar(self.diario.CIRUJANO_OPERO, cirujano=self, fecha=self.ultima_cirugia)
 
             #El cirujano general siempre tiene 50% de éxito independientemente del órgano
-            if especialidad_cirujano == "general":
+            if self.codigo_especialidad is Especialidad.GENERAL:
                 exito = rnd.randint(1, 10)
-                if exito >= 5: 
+                if exito >= self.UMBRAL_GENERAL:
                     print(f" Cirugía EXITOSA (cirujano general): {receptor.nombre} - {organo_necesario}")
                     return True
                 else:
@@ -159,10 +197,10 @@ class Cirujanos:
                     return False
 
             # Para cirujanos especialistas
-            elif organo_necesario in self.tabla_sinergias.get(especialidad_cirujano, []):
+            elif receptor.codigo_organo in self.organos_compatibles:
                 
                 exito = rnd.randint(1, 10)  
-                if exito >= 3:
+                if exito >= self.UMBRAL_ESPECIALISTA:
                     print(
                         f" Cirugía EXITOSA: {receptor.nombre} - {organo_necesario} por especialista en {especialidad_cirujano}")
                     return True
@@ -174,7 +212,7 @@ class Cirujanos:
             else:
                 # Cirugía no compatible
                 exito = rnd.randint(1, 10)
-                if exito >= 5:  
+                if exito >= self.UMBRAL_NO_ESPECIALISTA:
                     print(
                         f" Cirugía EXITOSA (no especialista): {receptor.nombre} - {organo_necesario} por {especialidad_cirujano}")
                     return True
@@ -0,0 +1,169 @@
+import heapq
+from datetime import datetime
+from codigos.Codigos import Especialidad, TipoOrgano
+from cirujanos.Cirujanos import Cirujanos
+
+
+class PlantelCirujanos:
+
+    #organo -> especialidades que conviene buscar, en orden: (especialistas, generales, el resto). Sale una sola vez de la tabla de sinergias
+    PREFERENCIAS_POR_ORGANO = {
+        organo: (
+            tuple(especialidad for especialidad, organos in Cirujanos.ORGANOS_POR_ESPECIALIDAD.items()
+                  if especialidad is not Especialidad.GENERAL and organo in organos),
+            (Especialidad.GENERAL,),
+            tuple(especialidad for especialidad in Especialidad
+                  if especialidad is not Especialidad.GENERAL and organo not in Cirujanos.ORGANOS_POR_ESPECIALIDAD.get(especialidad, ())),
+        )
+        for organo in TipoOrgano
+    }
+
+    def __init__(self, cirujanos: list[Cirujanos] = None):
+        """
+    Índice de los cirujanos de un centro de salud según su disponibilidad:
+        - los que están en recuperación, en una cola de prioridad (heap) ordenada por la hora en que terminan;
+        - los que pueden operar, en una cola por especialidad ordenada por su lugar en la lista del centro.
+
+    Cuando alguien pregunta, primero pasan a listos los que ya terminaron su recuperación (solo se mira el
+    tope del heap), asi "quién puede operar ahora" y "cuándo se libera el próximo" son O(log n) y no hace
+    falta revisar a todos los cirujanos. Si un cirujano opera por fuera del índice, su entrada se corrige
+    cuando llega al tope (borrado perezoso).
+
+    params:
+        - cirujanos: Cirujanos iniciales del centro (opcional).
+        """
+        self._listos: dict[Especialidad, list[tuple]] = {} #especialidad -> heap de (posicion, cirujano)
+        self._ocupados: list[tuple] = [] #heap de (fin de la recuperacion, posicion, cirujano)
+        self._posiciones: dict[Cirujanos, int] = {} #cirujano -> orden en la lista del centro
+        self._en_listos: set[Cirujanos] = set() #cirujanos con una entrada en su heap de listos
+        self._en_ocupados: set[Cirujanos] = set() #cirujanos con una entrada en el heap de ocupados
+        for cirujano in cirujanos or []:
+            self.agregar(cirujano)
+
+    def agregar(self, cirujano: Cirujanos):
+        """
+    Incorpora un cirujano al plantel, como listo o en recuperación según su última cirugía.
+
+    params:
+        - cirujano: Objeto Cirujanos.
+        """
+        if cirujano in self._posiciones:
+            return
+        self._posiciones[cirujano] = len(self._posiciones)
+        self.devolver(cirujano)
+
+    def devolver(self, cirujano: Cirujanos):
+        """
+    Ubica a un cirujano después de una cirugía (o de un intento): si está en recuperación entra al heap
+    de ocupados con la hora en que termina, si no vuelve a los listos de su especialidad. O(log n).
+
+    params:
+        - cirujano: Cirujano del plantel.
+        """
+        fin = cirujano.fin_recuperacion()
+        if fin is not None and fin > cirujano.reloj.ahora():
+            cirujano.disponibilidad = "Ocupado"
+            if cirujano not in self._en_ocupados:
+                self._en_ocupados.add(cirujano)
+                heapq.heappush(self._ocupados, (fin, self._posiciones[cirujano], cirujano))
+            return
+
+        cirujano.disponibilidad = "Disponible"
+        if cirujano not in self._en_listos:
+            self._en_listos.add(cirujano)
+            heap = self._listos.setdefault(cirujano.codigo_especialidad, [])
+            heapq.heappush(heap, (self._posiciones[cirujano], cirujano))
+
+    def _actualizar(self):
+        """
+        Método auxiliar que pasa a listos a los cirujanos cuya recuperación ya terminó (los del tope del heap).
+        """
+        ocupados = self._ocupados
+        while ocupados and ocupados[0][0] <= ocupados[0][2].reloj.ahora():
+            _, _, cirujano = heapq.heappop(ocupados)
+            self._en_ocupados.discard(cirujano)
+            self.devolver(cirujano) #si volvio a operar mientras tanto, entra de nuevo con su nueva hora de fin
+
+    def _limpiar(self, heap: list[tuple]):
+        """
+        Método auxiliar que saca del tope de un heap de listos a los cirujanos que se ocuparon por fuera del índice.
+        """
+        while heap and heap[0][1].disponibilidad != "Disponible":
+            _, cirujano = heapq.heappop(heap)
+            self._en_listos.discard(cirujano)
+            self.devolver(cirujano)
+
+    def primero_disponible(self, especialidad: Especialidad) -> Cirujanos | None:
+        """
+    Devuelve el cirujano de una especialidad que puede operar ahora y figura primero en la lista del centro,
+    sin sacarlo del índice (al operar, el centro lo reubica con devolver()). O(log n) amortizado.
+
+    params:
+        - especialidad: Especialidad buscada.
+
+    returns:
+        El cirujano, o None si no hay ninguno disponible de esa especialidad.
+        """
+        self._actualizar()
+        heap = self._listos.get(especialidad)
+        if not heap:
+            return None
+        self._limpiar(heap)
+        return heap[0][1] if heap else None
+
+    def mejor_para_organo(self, organo: TipoOrgano) -> Cirujanos | None:
+        """
+    Elige al cirujano disponible más adecuado para un órgano: primero un especialista en ese órgano, si no
+    un cirujano general y si no cualquier otro. Dentro de cada grupo, el que figura primero en la lista del
+    centro. Solo mira el tope de la cola de cada especialidad, asi que no depende de la cantidad de cirujanos.
+
+    params:
+        - organo: TipoOrgano a trasplantar.
+
+    returns:
+        El cirujano elegido, o None si no hay ninguno disponible.
+        """
+        for especialidades in self.PREFERENCIAS_POR_ORGANO[organo]:
+            candidatos = [cirujano for cirujano in map(self.primero_disponible, especialidades) if cirujano is not None]
+            if candidatos:
+                return min(candidatos, key=self._posiciones.__getitem__)
+        return None
+
+    def disponibles(self) -> list[Cirujanos]:
+        """
+    Devuelve todos los cirujanos que pueden operar ahora, en el orden de la lista del centro.
+
+    returns:
+        Una lista de Cirujanos (vacía si están todos en recuperación).
+        """
+        self._actualizar()
+        listos = []
+        for heap in self._listos.values():
+            self._limpiar(heap)
+            listos.extend(entrada for entrada in heap if entrada[1].disponibilidad == "Disponible")
+        return [cirujano for _, cirujano in sorted(listos, key=lambda entrada: entrada[0])]
+
+    def proximo_libre(self) -> tuple[Cirujanos, datetime] | None:
+        """
+    Indica qué cirujano en recuperación se libera primero. O(log n) amortizado.
+    Solo tiene en cuenta a los que se devolvieron al plantel después de operar (o que ya se detectaron como ocupados).
+
+    returns:
+        Una tupla (cirujano, fecha y hora en que termina su recuperación), o None si no hay nadie en recuperación.
+        """
+        self._actualizar()
+        ocupados = self._ocupados
+        while ocupados and ocupados[0][0] != ocupados[0][2].fin_recuperacion(): #volvio a operar: reubicarlo con su nueva hora
+            _, _, cirujano = heapq.heappop(ocupados)
+            self._en_ocupados.discard(cirujano)
+            self.devolver(cirujano)
+        if not ocupados:
+            return None
+        fin, _, cirujano = ocupados[0]
+        return cirujano, fin
+
+    def __len__(self):
+        """
+        Método mágico que devuelve la cantidad de cirujanos del plantel.
+        """
+        return len(self._posiciones)
@@ -0,0 +1,98 @@
+from enum import IntEnum
+
+
+_INTERNADOS: dict[type, dict] = {} #por cada enum, texto (o codigo) ya visto -> codigo, asi cada variante se normaliza una sola vez
+
+
+class CodigoInternado(IntEnum):
+    """
+    Clase base de los códigos enteros que reemplazan a los textos libres (órganos, grupos sanguíneos,
+    especialidades y estados de vehículos). Cada miembro guarda el texto con el que se muestra.
+    """
+
+    def __new__(cls, valor: int, texto: str):
+        miembro = int.__new__(cls, valor)
+        miembro._value_ = valor
+        miembro.texto = texto
+        return miembro
+
+    def __str__(self):
+        """
+        Método mágico que devuelve el texto del código, asi se imprime igual que el texto original.
+        """
+        return self.texto
+
+    def __format__(self, formato):
+        """
+        Método mágico para que los f-strings también muestren el texto y no el número.
+        """
+        return format(self.texto, formato)
+
+    @classmethod
+    def desde_texto(cls, valor, defecto=None):
+        """
+    Convierte un texto (sin importar mayúsculas ni espacios) en su código. Si ya es un código, lo devuelve tal cual.
+
+    params:
+        - valor: Texto o código a convertir.
+        - defecto: Código a devolver si el texto no corresponde a ningún miembro (opcional).
+
+    returns:
+        El miembro del enum correspondiente. Cada texto distinto se normaliza una sola vez y después se
+        resuelve con una búsqueda en un diccionario.
+
+    raises:
+        ValueError si el texto no es válido y no se indicó un valor por defecto.
+        """
+        tabla = _INTERNADOS.get(cls)
+        if tabla is None:
+            tabla = _INTERNADOS[cls] = {miembro.texto.lower(): miembro for miembro in cls}
+            tabla.update({miembro: miembro for miembro in cls})
+
+        codigo = tabla.get(valor)
+        if codigo is None:
+            if isinstance(valor, str):
+                codigo = tabla.get(valor.strip().lower())
+            if codigo is None:
+                if defecto is not None:
+                    return defecto
+                raise ValueError(f"'{valor}' no es un valor válido de {cls.__name__}.")
+            tabla[valor] = codigo
+        return codigo
+
+
+class TipoOrgano(CodigoInternado):
+    CORAZON = 0, "corazon"
+    PULMON = 1, "pulmon"
+    PIEL = 2, "piel"
+    CORNEAS = 3, "corneas"
+    HUESOS = 4, "huesos"
+    HIGADO = 5, "higado"
+    RINON = 6, "riñon"
+    INTESTINOS = 7, "intestinos"
+
+
+class GrupoSanguineo(CodigoInternado):
+    A_POSITIVO = 0, "A+"
+    A_NEGATIVO = 1, "A-"
+    B_POSITIVO = 2, "B+"
+    B_NEGATIVO = 3, "B-"
+    AB_POSITIVO = 4, "AB+"
+    AB_NEGATIVO = 5, "AB-"
+    O_POSITIVO = 6, "O+"
+    O_NEGATIVO = 7, "O-"
+
+
+class Especialidad(CodigoInternado):
+    CARDIOVASCULAR = 0, "cardiovascular"
+    PULMONAR = 1, "pulmonar"
+    PLASTICO = 2, "plastico"
+    TRAUMATOLOGO = 3, "traumatologo"
+    GASTROENTEROLOGO = 4, "gastroenterologo"
+    GENERAL = 5, "general"
+    OTRA = 6, "otra" #cualquier especialidad que no figura en la tabla de sinergias
+
+
+class EstadoVehiculo(CodigoInternado):
+    DISPONIBLE = 0, "Disponible"
+    OCUPADO = 1, "Ocupado"
@@ -0,0 +1,193 @@
+import random
+from datetime import datetime, timedelta
+from centro_salud.Centro_Salud import CentroSalud
+from cirujanos.Cirujanos import Cirujanos
+from organos.Organos import Organos
+from pacientes.Donantes import Donantes
+from pacientes.Receptores import Receptores
+from vehiculos.Auto import Auto
+from vehiculos.Avion import Avion
+from vehiculos.Helicoptero import Helicoptero
+
+
+class GeneradorDatos:
+
+    #provincias con su peso aproximado en la poblacion del pais (porcentaje), los centros se reparten con estos pesos
+    PROVINCIAS = {
+        "Buenos Aires": 38.0, "CABA": 6.8, "Cordoba": 8.2, "Santa Fe": 7.8, "Mendoza": 4.4, "Tucuman": 3.7,
+        "Entre Rios": 3.1, "Salta": 3.1, "Misiones": 2.8, "Chaco": 2.5, "Corrientes": 2.5,
+        "Santiago del Estero": 2.3, "San Juan": 1.8, "Jujuy": 1.7, "Rio Negro": 1.6, "Neuquen": 1.5,
+        "Formosa": 1.3, "Chubut": 1.3, "San Luis": 1.1, "Catamarca": 0.9, "La Rioja": 0.8, "La Pampa": 0.8,
+        "Santa Cruz": 0.8, "Tierra del Fuego": 0.4,
+    }
+    #coordenadas aproximadas (latitud, longitud) de la capital de cada provincia, los partidos se ubican alrededor
+    COORDENADAS_PROVINCIAS = {
+        "Buenos Aires": (-34.92, -57.95), "CABA": (-34.60, -58.38), "Cordoba": (-31.42, -64.18), "Santa Fe": (-31.63, -60.70),
+        "Mendoza": (-32.89, -68.85), "Tucuman": (-26.82, -65.22), "Entre Rios": (-31.73, -60.53), "Salta": (-24.79, -65.41),
+        "Misiones": (-27.37, -55.90), "Chaco": (-27.45, -58.99), "Corrientes": (-27.47, -58.83),
+        "Santiago del Estero": (-27.80, -64.26), "San Juan": (-31.54, -68.54), "Jujuy": (-24.19, -65.30),
+        "Rio Negro": (-40.81, -63.00), "Neuquen": (-38.95, -68.06), "Formosa": (-26.18, -58.17), "Chubut": (-43.30, -65.10),
+        "San Luis": (-33.30, -66.34), "Catamarca": (-28.47, -65.78), "La Rioja": (-29.41, -66.86), "La Pampa": (-36.62, -64.29),
+        "Santa Cruz": (-51.62, -69.22), "Tierra del Fuego": (-54.80, -68.30),
+    }
+    #frecuencia aproximada de cada grupo sanguineo en Argentina (porcentaje)
+    GRUPOS_SANGUINEOS = {"O+": 50.3, "A+": 30.3, "B+": 8.6, "AB+": 2.4, "O-": 4.9, "A-": 2.8, "B-": 0.5, "AB-": 0.2}
+    #organos que esperan los receptores (la mayoria de la lista de espera es renal)
+    DEMANDA_ORGANOS = {"riñon": 62, "higado": 14, "corneas": 12, "corazon": 4, "pulmon": 4, "intestinos": 1, "piel": 2, "huesos": 1}
+    #organos que puede donar un donante fallecido (probabilidad de que cada uno sea apto)
+    OFERTA_ORGANOS = {"riñon": 0.9, "higado": 0.7, "corneas": 0.8, "corazon": 0.3, "pulmon": 0.25, "intestinos": 0.05, "piel": 0.3, "huesos": 0.3}
+    ESPECIALIDADES = {"gastroenterologo": 30, "general": 30, "cardiovascular": 12, "pulmonar": 10, "plastico": 10, "traumatologo": 8}
+    PATOLOGIAS = {"riñon": "Insuficiencia renal", "higado": "Insuficiencia hepática", "corneas": "Queratocono",
+                  "corazon": "Miocardiopatía", "pulmon": "Fibrosis pulmonar", "intestinos": "Síndrome de intestino corto",
+                  "piel": "Quemaduras", "huesos": "Osteosarcoma"}
+    PROPORCION_DONANTES = 0.2 #de cada 100 pacientes, 20 son donantes
+    PARTIDOS_POR_PROVINCIA = 6
+    PACIENTES_POR_CENTRO = 1000 #si no se indica la cantidad de centros, se usa un centro cada tantos pacientes
+
+    def __init__(self, semilla: int = 0, fecha_referencia: datetime = None):
+        """
+    Generador de escenarios sintéticos (centros con sus vehículos y cirujanos, receptores y donantes)
+    para probar el sistema a escala. Con la misma semilla siempre genera los mismos datos.
+
+    params:
+        - semilla: Semilla del generador de números aleatorios.
+        - fecha_referencia: Fecha "actual" del escenario, de la que se calculan nacimientos y esperas (por defecto 2025-06-01).
+        """
+        self.rnd = random.Random(semilla)
+        self.fecha_referencia = fecha_referencia or datetime(2025, 6, 1)
+        self._proximo_dni = 20_000_000 #los DNI se asignan en orden, asi nunca se repiten
+        self._provincias, self._pesos_provincias = list(self.PROVINCIAS), list(self.PROVINCIAS.values())
+        self._grupos, self._pesos_grupos = list(self.GRUPOS_SANGUINEOS), list(self.GRUPOS_SANGUINEOS.values())
+        self._organos, self._pesos_organos = list(self.DEMANDA_ORGANOS), list(self.DEMANDA_ORGANOS.values())
+        self._especialidades, self._pesos_especialidades = list(self.ESPECIALIDADES), list(self.ESPECIALIDADES.values())
+        self._coordenadas_partidos: dict[str, tuple[float, float]] = {} #cada partido queda fijo en un punto cerca de la capital
+
+    def _fecha_anterior(self, dias_min: int, dias_max: int) -> datetime:
+        """
+        Método auxiliar que devuelve una fecha entre dias_min y dias_max días antes de la fecha de referencia.
+        """
+        return self.fecha_referencia - timedelta(days=self.rnd.randint(dias_min, dias_max), minutes=self.rnd.randint(0, 1439))
+
+    def generar_centro(self, numero: int) -> CentroSalud:
+        """
+    Genera un centro de salud con su flota y sus cirujanos.
+
+    params:
+        - numero: Número del centro, se usa para armar su nombre.
+
+    returns:
+        Un CentroSalud sin pacientes, con coordenadas dentro de su partido: siempre tiene autos, y según su
+        tamaño también helicópteros y aviones.
+        """
+        rnd = self.rnd
+        provincia = rnd.choices(self._provincias, self._pesos_provincias)[0]
+        partido = f"{provincia} - Partido {rnd.randint(1, self.PARTIDOS_POR_PROVINCIA)}"
+        if partido not in self._coordenadas_partidos:
+            latitud, longitud = self.COORDENADAS_PROVINCIAS[provincia]
+            self._coordenadas_partidos[partido] = (latitud + rnd.uniform(-1.5, 1.5), longitud + rnd.uniform(-1.5, 1.5))
+        latitud, longitud = self._coordenadas_partidos[partido]
+
+        vehiculos = [Auto(rnd.randint(60, 120), f"AU {numero:05d}-{k}") for k in range(rnd.randint(1, 4))]
+        if rnd.random() < 0.6:
+            vehiculos += [Helicoptero(rnd.randint(200, 300), f"HEL {numero:05d}-{k}") for k in range(rnd.randint(1, 2))]
+        if rnd.random() < 0.3:
+            vehiculos.append(Avion(rnd.randint(500, 800), f"AE {numero:05d}"))
+
+        cirujanos = [Cirujanos(especialidad) for especialidad in rnd.choices(self._especialidades, self._pesos_especialidades, k=rnd.randint(1, 5))]
+        return CentroSalud(f"Centro {numero:05d}", f"Calle {rnd.randint(1, 9999)}", f"0{rnd.randint(100000000, 999999999)}",
+                           partido, provincia, cirujanos, vehiculos,
+                           latitud=latitud + rnd.uniform(-0.1, 0.1), longitud=longitud + rnd.uniform(-0.1, 0.1))
+
+    def generar_centros(self, cantidad: int) -> list[CentroSalud]:
+        """
+    Genera varios centros de salud.
+
+    params:
+        - cantidad: Cantidad de centros.
+
+    returns:
+        Una lista de CentroSalud.
+        """
+        return [self.generar_centro(numero) for numero in range(cantidad)]
+
+    def generar_receptor(self) -> Receptores:
+        """
+    Genera un receptor con un órgano, grupo sanguíneo, edad y fecha de espera aleatorios.
+    Aproximadamente uno de cada diez está inestable.
+
+    returns:
+        Un objeto Receptores sin centro asignado.
+        """
+        rnd = self.rnd
+        dni = self._proximo_dni
+        self._proximo_dni += 1
+        organo = rnd.choices(self._organos, self._pesos_organos)[0]
+        receptor = Receptores(f"Receptor {dni}", dni, rnd.choice("MF"), self._fecha_anterior(365, 80 * 365),
+                              rnd.choices(self._grupos, self._pesos_grupos)[0], rnd.randint(1100000000, 1199999999),
+                              organo, self._fecha_anterior(0, 8 * 365), self.PATOLOGIAS[organo])
+        if rnd.random() < 0.1:
+            receptor.estado = "Inestable"
+        return receptor
+
+    def generar_donante(self) -> Donantes:
+        """
+    Genera un donante fallecido con los órganos que resultaron aptos para donar (al menos uno).
+
+    returns:
+        Un objeto Donantes sin centro asignado.
+        """
+        rnd = self.rnd
+        dni = self._proximo_dni
+        self._proximo_dni += 1
+        organos = [Organos(organo) for organo, probabilidad in self.OFERTA_ORGANOS.items() if rnd.random() < probabilidad]
+        if not organos:
+            organos = [Organos("riñon")]
+        return Donantes(f"Donante {dni}", dni, rnd.choice("MF"), self._fecha_anterior(18 * 365, 75 * 365),
+                        rnd.choices(self._grupos, self._pesos_grupos)[0], rnd.randint(1100000000, 1199999999),
+                        self._fecha_anterior(0, 2), organos)
+
+    def generar_pacientes(self, cantidad: int) -> list[Receptores | Donantes]:
+        """
+    Genera receptores y donantes mezclados, en la proporción de PROPORCION_DONANTES.
+
+    params:
+        - cantidad: Cantidad total de pacientes.
+
+    returns:
+        Una lista de pacientes sin centro asignado.
+        """
+        return [self.generar_donante() if self.rnd.random() < self.PROPORCION_DONANTES else self.generar_receptor()
+                for _ in range(cantidad)]
+
+    def repartir_pacientes(self, centros: list[CentroSalud], pacientes: list[Receptores | Donantes]):
+        """
+    Asigna cada paciente a un centro al azar (los centros más grandes, con más cirujanos, reciben más pacientes).
+
+    params:
+        - centros: Centros de salud donde repartir.
+        - pacientes: Pacientes a asignar.
+        """
+        pesos = [len(centro.lista_cirujanos) for centro in centros]
+        por_centro = {centro: [] for centro in centros}
+        for paciente, centro in zip(pacientes, self.rnd.choices(centros, pesos, k=len(pacientes))):
+            por_centro[centro].append(paciente)
+        for centro, asignados in por_centro.items():
+            centro.asignar_pacientes(asignados)
+
+    def generar_escenario(self, cantidad_pacientes: int, cantidad_centros: int = None) -> tuple[list[CentroSalud], list[Receptores | Donantes]]:
+        """
+    Genera un escenario completo: centros de salud con sus pacientes ya repartidos.
+
+    params:
+        - cantidad_pacientes: Cantidad total de pacientes.
+        - cantidad_centros: Cantidad de centros (por defecto, uno cada PACIENTES_POR_CENTRO pacientes, mínimo 4).
+
+    returns:
+        Una tupla (centros, pacientes).
+        """
+        if cantidad_centros is None:
+            cantidad_centros = max(4, cantidad_pacientes // self.PACIENTES_POR_CENTRO)
+        centros = self.generar_centros(cantidad_centros)
+        pacientes = self.generar_pacientes(cantidad_pacientes)
+        self.repartir_pacientes(centros, pacientes)
+        return centros, pacientes
@@ -0,0 +1,265 @@
+import csv
+import json
+import os
+from centro_salud.Centro_Salud import CentroSalud
+from cirujanos.Cirujanos import Cirujanos
+from organos.Organos import Organos
+from pacientes.Receptores import Receptores
+from pacientes.Donantes import Donantes
+from pacientes.Validaciones import leer_fecha, leer_dni, leer_nombre, leer_sexo, leer_grupo_sanguineo, leer_organo
+from vehiculos.Auto import Auto
+from vehiculos.Avion import Avion
+from vehiculos.Helicoptero import Helicoptero
+
+
+class ImportadorDatos:
+
+    TIPOS = ("centro", "vehiculo", "cirujano", "receptor", "donante")
+    CLASES_VEHICULO = {"auto": Auto, "helicoptero": Helicoptero, "avion": Avion}
+    FORMATOS_FECHA_HORA = ("%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d") #espera y fallecimiento, el primero es el del menu
+    ESTADOS_RECEPTOR = ("Estable", "Inestable")
+    SEPARADOR_ORGANOS = ";" #en CSV, los organos de un donante van en una sola columna: "riñon;higado"
+
+    def __init__(self, incucai, ruta_rechazos: str = None, registrar: bool = True):
+        """
+    Importación masiva de centros de salud, vehículos, cirujanos y pacientes desde archivos CSV o JSONL.
+
+    Los archivos se leen de a un registro por vez, asi la memoria que usa la importación no depende del
+    tamaño del archivo. Cada registro pasa por las mismas validaciones que la carga desde el menú
+    (fecha en rango, DNI de 8 dígitos y no repetido, grupos sanguíneos y órganos válidos) y el paciente
+    se asigna a su centro con asignar_pacientes y se registra en INCUCAI, igual que en agregar_receptor
+    y agregar_donante. Los registros inválidos no frenan la importación: se cuentan y, si hay una ruta
+    de rechazos, se escriben ahí (una línea JSON por rechazo, con el número de línea y el motivo).
+
+    Como al cargar desde el menú, los trasplantes de los pacientes importados se buscan después con
+    INCUCAI.procesar_nuevos_pacientes.
+
+    params:
+        - incucai: INCUCAI donde se cargan los datos.
+        - ruta_rechazos: Archivo JSONL donde se agregan los registros rechazados (opcional).
+        - registrar: Si es False, los pacientes solo se asignan a su centro y se registran al procesarlos
+          (con clasificar_centros_salud o procesar_nuevos_pacientes).
+        """
+        self.incucai = incucai
+        self.ruta_rechazos = ruta_rechazos
+        self.registrar = registrar
+        self._sin_registrar: set[int] = set() #DNIs importados sin registrar, para detectar repetidos
+        self._centros = {self._clave_centro(centro.nombre): centro for centro in incucai.centros_salud}
+        self._identificadores = {vehiculo.identificador for centro in incucai.centros_salud for vehiculo in centro.lista_vehiculos}
+
+    @staticmethod
+    def _clave_centro(nombre: str) -> str:
+        """
+        Método auxiliar que normaliza el nombre de un centro como obtener_centro_salud del menú.
+        """
+        return str(nombre).strip().lower()
+
+    @staticmethod
+    def _campo(fila: dict, nombre: str, obligatorio: bool = True, lista: bool = False):
+        """
+        Método auxiliar que devuelve un campo del registro como texto sin espacios en los extremos (en JSONL un
+        número o un booleano también se pasa a texto, como llegaría en CSV) o lanza ValueError si falta y es
+        obligatorio. Con lista=True el campo también puede ser una lista de JSON, que se devuelve tal cual.
+        """
+        valor = fila.get(nombre)
+        if isinstance(valor, list) and lista:
+            pass
+        elif isinstance(valor, (list, dict)):
+            raise ValueError(f"El campo '{nombre}' debe ser {'una lista o un texto' if lista else 'un texto o un número'}.")
+        elif valor is not None:
+            valor = str(valor).strip()
+        if valor in (None, "", []):
+            if obligatorio:
+                raise ValueError(f"Falta el campo '{nombre}'.")
+            return None
+        return valor
+
+    @staticmethod
+    def _numero(valor, tipo: type, nombre: str):
+        """
+        Método auxiliar que convierte un campo a int o float, con un mensaje claro si no es numérico.
+        """
+        try:
+            return tipo(valor)
+        except (TypeError, ValueError):
+            raise ValueError(f"El campo '{nombre}' debe ser numérico.") from None
+
+    def _fecha_hora(self, texto: str):
+        """
+        Método auxiliar que lee una fecha con hora con las reglas de leer_fecha. El formato de FORMATOS_FECHA_HORA
+        se elige por el largo del texto, asi cada fecha se convierte una sola vez.
+        """
+        formato = {16: self.FORMATOS_FECHA_HORA[0], 19: self.FORMATOS_FECHA_HORA[1]}.get(len(str(texto)), self.FORMATOS_FECHA_HORA[2])
+        return leer_fecha(texto, formato, hoy=self.incucai.reloj.ahora())
+
+    def _centro(self, fila: dict) -> CentroSalud:
+        """
+        Método auxiliar que busca el centro del registro por nombre.
+        """
+        nombre = self._campo(fila, "centro")
+        centro = self._centros.get(self._clave_centro(nombre))
+        if centro is None:
+            raise ValueError(f"Centro no encontrado: {nombre}.")
+        return centro
+
+    def _datos_paciente(self, fila: dict) -> tuple:
+        """
+        Método auxiliar que valida los datos comunes a receptores y donantes y devuelve
+        (nombre, dni, sexo, nacimiento, grupo sanguíneo, teléfono, centro).
+        """
+        dni = leer_dni(self._campo(fila, "dni"))
+        if self.incucai.es_donante(dni):
+            raise ValueError("Ya existe un donante con ese DNI.")
+        if self.incucai.es_receptor(dni):
+            raise ValueError("Ya existe un receptor con ese DNI.")
+        if dni in self._sin_registrar:
+            raise ValueError("Ya existe un paciente con ese DNI.")
+        return (leer_nombre(self._campo(fila, "nombre")), dni, leer_sexo(self._campo(fila, "sexo")),
+                leer_fecha(self._campo(fila, "nacimiento"), "%Y-%m-%d", hoy=self.incucai.reloj.ahora()),
+                leer_grupo_sanguineo(self._campo(fila, "sangre")),
+                self._numero(self._campo(fila, "telefono"), int, "telefono"), self._centro(fila))
+
+    def _importar_centro(self, fila: dict):
+        """
+        Método auxiliar que crea un CentroSalud y lo agrega a INCUCAI.
+        """
+        nombre = self._campo(fila, "nombre")
+        if self._clave_centro(nombre) in self._centros:
+            raise ValueError(f"Ya existe un centro de salud llamado {nombre}.")
+        latitud, longitud = self._campo(fila, "latitud", False), self._campo(fila, "longitud", False)
+        centro = CentroSalud(nombre, self._campo(fila, "direccion"), self._campo(fila, "telefono"),
+                             self._campo(fila, "partido"), self._campo(fila, "provincia"), [], [],
+                             latitud=None if latitud is None else self._numero(latitud, float, "latitud"),
+                             longitud=None if longitud is None else self._numero(longitud, float, "longitud"))
+        self.incucai.centros_salud.append(centro)
+        self._centros[self._clave_centro(nombre)] = centro
+
+    def _importar_vehiculo(self, fila: dict):
+        """
+        Método auxiliar que crea un vehículo y lo suma a la flota de su centro.
+        """
+        clase = self.CLASES_VEHICULO.get(self._campo(fila, "clase").lower())
+        if clase is None:
+            raise ValueError(f"Clase de vehículo inválida. Debe ser una de: {', '.join(self.CLASES_VEHICULO)}")
+        identificador = self._campo(fila, "identificador")
+        if identificador in self._identificadores:
+            raise ValueError(f"Ya existe un vehículo con identificador {identificador}.")
+        velocidad = self._numero(self._campo(fila, "velocidad"), float, "velocidad")
+        if velocidad <= 0:
+            raise ValueError("La velocidad del vehículo debe ser positiva.")
+        self._centro(fila).agregar_vehiculo(clase(velocidad_viajes=velocidad, identificador=identificador))
+        self._identificadores.add(identificador)
+
+    def _importar_cirujano(self, fila: dict):
+        """
+        Método auxiliar que crea un cirujano y lo suma al plantel de su centro.
+        """
+        centro = self._centro(fila)
+        centro.agregar_cirujano(Cirujanos(self._campo(fila, "especialidad"), self.incucai.reloj))
+
+    def _importar_receptor(self, fila: dict):
+        """
+        Método auxiliar que crea un receptor, lo asigna a su centro y lo registra en INCUCAI (si corresponde).
+        """
+        nombre, dni, sexo, nacimiento, sangre, telefono, centro = self._datos_paciente(fila)
+        organo = leer_organo(self._campo(fila, "organo"))
+        fecha_en_espera = self._fecha_hora(self._campo(fila, "fecha_en_espera"))
+        estado = self._campo(fila, "estado", False)
+        if estado is not None:
+            estado = estado.capitalize()
+            if estado not in self.ESTADOS_RECEPTOR:
+                raise ValueError(f"Estado inválido. Debe ser uno de: {', '.join(self.ESTADOS_RECEPTOR)}")
+
+        receptor = Receptores(nombre, dni, sexo, nacimiento, sangre, telefono, organo, fecha_en_espera,
+                              self._campo(fila, "patologia", False) or "")
+        if estado is not None:
+            receptor.estado = estado
+        centro.asignar_pacientes([receptor])
+        if self.registrar:
+            self.incucai.registrar_receptor(receptor)
+        else:
+            self._sin_registrar.add(dni)
+
+    def _importar_donante(self, fila: dict):
+        """
+        Método auxiliar que crea un donante con sus órganos, lo asigna a su centro y lo registra en INCUCAI (si corresponde).
+        """
+        nombre, dni, sexo, nacimiento, sangre, telefono, centro = self._datos_paciente(fila)
+        fallecimiento = self._fecha_hora(self._campo(fila, "fallecimiento"))
+        organos = self._campo(fila, "organos", lista=True)
+        if isinstance(organos, str):
+            organos = organos.split(self.SEPARADOR_ORGANOS)
+        organos = [Organos(leer_organo(str(organo).strip())) for organo in organos if str(organo).strip()]
+        if not organos:
+            raise ValueError("Debe seleccionar al menos un órgano.")
+
+        donante = Donantes(nombre, dni, sexo, nacimiento, sangre, telefono, fallecimiento, organos)
+        centro.asignar_pacientes([donante])
+        if self.registrar:
+            self.incucai.registrar_donante(donante)
+        else:
+            self._sin_registrar.add(dni)
+
+    @staticmethod
+    def _registros(ruta: str, formato: str):
+        """
+        Método auxiliar que recorre el archivo de a un registro: genera (número de línea, registro), donde el
+        registro es un diccionario (CSV) o el texto de la línea (JSONL, se interpreta al importarlo).
+        """
+        if formato == "csv":
+            with open(ruta, newline="", encoding="utf-8-sig") as archivo:
+                lector = csv.DictReader(archivo)
+                for fila in lector:
+                    yield lector.line_num, fila
+        else:
+            with open(ruta, encoding="utf-8-sig") as archivo:
+                for linea, texto in enumerate(archivo, start=1):
+                    if texto.strip():
+                        yield linea, texto
+
+    def importar(self, ruta: str, tipo: str = None, formato: str = None) -> dict:
+        """
+    Importa todos los registros de un archivo CSV o JSONL.
+
+    params:
+        - ruta: Archivo a importar.
+        - tipo: Tipo de todos los registros ("centro", "vehiculo", "cirujano", "receptor" o "donante"). Si no
+          se indica, cada registro lo trae en su campo "tipo".
+        - formato: "csv" o "jsonl" (por defecto, según la extensión del archivo).
+
+    returns:
+        Un diccionario con la cantidad de registros leídos, los importados por tipo y los rechazados.
+        """
+        formato = formato or os.path.splitext(ruta)[1].lstrip(".").lower()
+        if formato not in ("csv", "jsonl"):
+            raise ValueError("El formato debe ser csv o jsonl.")
+        if tipo is not None and tipo not in self.TIPOS:
+            raise ValueError(f"Tipo inválido. Debe ser uno de: {', '.join(self.TIPOS)}")
+
+        resumen = {"leidos": 0, "importados": dict.fromkeys(self.TIPOS, 0), "rechazados": 0}
+        rechazos = open(self.ruta_rechazos, "a", encoding="utf-8") if self.ruta_rechazos else None
+        try:
+            for linea, registro in self._registros(ruta, formato):
+                resumen["leidos"] += 1
+                fila = None
+                try:
+                    fila = json.loads(registro) if formato == "jsonl" else registro
+                    if not isinstance(fila, dict):
+                        raise ValueError("El registro debe ser un objeto JSON.")
+                    tipo_fila = tipo or self._campo(fila, "tipo").lower()
+                    if tipo_fila not in self.TIPOS:
+                        raise ValueError(f"Tipo inválido. Debe ser uno de: {', '.join(self.TIPOS)}")
+                    getattr(self, f"_importar_{tipo_fila}")(fila)
+                    resumen["importados"][tipo_fila] += 1
+                except ValueError as error:
+                    resumen["rechazados"] += 1
+                    if rechazos is not None:
+                        rechazado = fila if isinstance(fila, dict) else str(registro).strip() #en JSONL mal formado, el texto tal cual
+                        rechazos.write(json.dumps({"archivo": ruta, "linea": linea, "motivo": str(error), "registro": rechazado},
+                                                  ensure_ascii=False, default=str) + "\n")
+        finally:
+            if rechazos is not None:
+                rechazos.close()
+            if resumen["importados"]["centro"] or resumen["importados"]["vehiculo"]:
+                self.incucai.actualizar_centros() #una sola vez por archivo, no por cada centro o vehiculo
+        return resumen
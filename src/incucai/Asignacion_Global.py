@@ -0,0 +1,592 @@
+import numpy as np
+from collections import deque
+from datetime import datetime
+from pacientes.Receptores import Receptores
+from pacientes.Donantes import Donantes
+from organos.Organos import Organos
+from incucai.Inventario_Organos import InventarioOrganos
+from incucai.Listas_Espera import ListasEspera
+from pacientes.Compatibilidad_Sanguinea import es_compatible
+from centro_salud.Matriz_Distancias import MatrizDistancias
+from reloj.Reloj import RELOJ_REAL
+
+
+class AsignacionGlobal:
+
+    PUNTAJE_BASE = 100 #lo que vale conseguirle un organo a cualquier receptor
+    PUNTAJE_INESTABLE = 1000 #los inestables siempre pesan mas que cualquier diferencia de edad
+    EDAD_MAXIMA = 100 #un receptor suma (EDAD_MAXIMA - edad) puntos, el mas joven suma mas
+    PESO_HORA_TRASLADO = 2 #puntos que se pierden por cada hora estimada de traslado
+    LIMITE_ISQUEMIA = 20 #horas maximas entre la ablacion y la cirugia (mismo limite que Cirujanos.realizar_cirujia)
+
+    def __init__(self, fecha_referencia: datetime = None, estricto: bool = False, matriz_distancias: MatrizDistancias = None):
+        """
+    Motor de asignación global por lotes: en lugar de asignar en el orden en que aparecen los centros y
+    pacientes, toma todos los receptores en espera y todos los órganos disponibles y busca la asignación
+    de mayor puntaje total.
+
+    Como un órgano solo sirve para receptores que necesitan ese mismo órgano, el problema se resuelve
+    por separado para cada tipo de órgano. Dentro de cada tipo, todos los órganos de un mismo centro y
+    grupo sanguíneo son equivalentes y a los receptores de un mismo centro y grupo conviene darles
+    órganos en orden de puntaje, asi que el grafo bipartito receptor-organo se comprime a un grafo
+    (centro, sangre) -> (centro, sangre) y se resuelve como un flujo de costo mínimo (escalado de costos).
+
+    params:
+        - fecha_referencia: Fecha usada para calcular edades y tiempos de espera (por defecto, ahora).
+        - estricto: Si es True, solo se aceptan grupos sanguíneos idénticos; si no, la tabla ABO.
+        - matriz_distancias: Distancias reales entre centros (opcional). Sin ella se usan distancias estimadas.
+        """
+        self.fecha_referencia = fecha_referencia or RELOJ_REAL.ahora()
+        self.estricto = estricto
+        self.matriz_distancias = matriz_distancias
+        self._tiempos: dict[tuple, float | None] = {} #cache de tiempos estimados entre pares de centros
+
+    def puntaje_receptor(self, receptor: Receptores) -> float:
+        """
+    Calcula el puntaje de prioridad de un receptor, respetando la regla de prioridad_receptor:
+    inestables primero, despues el más joven y, como desempate, el que más espera.
+
+    params:
+        - receptor: Objeto Receptores.
+
+    returns:
+        El puntaje del receptor (mayor puntaje = mayor prioridad).
+        """
+        puntaje = self.PUNTAJE_BASE
+        if getattr(receptor, 'estado', 'estable').lower() == 'inestable':
+            puntaje += self.PUNTAJE_INESTABLE
+        edad = (self.fecha_referencia - receptor.nacimiento).days / 365.25
+        puntaje += max(0.0, self.EDAD_MAXIMA - edad)
+        dias_en_espera = (self.fecha_referencia - receptor.fecha_en_espera).days
+        puntaje += min(max(dias_en_espera, 0) / 3650, 1.0) #menos de un punto, nunca supera a un año de edad
+        return puntaje
+
+    def horas_traslado(self, centro_origen, centro_destino) -> float | None:
+        """
+    Devuelve el tiempo estimado de traslado entre dos centros, guardándolo en cache.
+
+    params:
+        - centro_origen: CentroSalud del donante (de donde sale el vehículo).
+        - centro_destino: CentroSalud del receptor.
+
+    returns:
+        Las horas estimadas, o None si el traslado no es posible o supera el límite de isquemia.
+        """
+        clave = (id(centro_origen), id(centro_destino))
+        if clave not in self._tiempos:
+            distancia = self.matriz_distancias.distancia(centro_origen, centro_destino) if self.matriz_distancias else None
+            horas = centro_origen.tiempo_estimado_traslado(centro_destino, distancia)
+            self._tiempos[clave] = horas if horas is not None and horas <= self.LIMITE_ISQUEMIA else None
+        return self._tiempos[clave]
+
+    def puntaje_par(self, receptor: Receptores, donante: Donantes) -> float | None:
+        """
+    Calcula el puntaje de darle a un receptor un órgano de un donante.
+
+    params:
+        - receptor: Receptor que recibiría el órgano.
+        - donante: Donante del órgano.
+
+    returns:
+        El puntaje del receptor menos la penalidad por horas de traslado, o None si los grupos
+        sanguíneos no son compatibles o el traslado no llega dentro del límite de isquemia.
+        """
+        if not es_compatible(donante.codigo_sangre, receptor.codigo_sangre, self.estricto):
+            return None
+        horas = self.horas_traslado(donante.centro_de_salud, receptor.centro_de_salud)
+        if horas is None:
+            return None
+        return self.puntaje_receptor(receptor) - self.PESO_HORA_TRASLADO * horas
+
+    def puntaje_total(self, asignaciones: list[tuple[Receptores, Donantes, Organos]]) -> float:
+        """
+    Suma los puntajes de una lista de asignaciones. Las asignaciones que no llegan dentro del
+    límite de isquemia no suman (el órgano se pierde).
+
+    params:
+        - asignaciones: Lista de tuplas (receptor, donante, organo).
+
+    returns:
+        El puntaje total.
+        """
+        total = 0.0
+        for receptor, donante, _ in asignaciones:
+            puntaje = self.puntaje_par(receptor, donante)
+            if puntaje is not None:
+                total += puntaje
+        return total
+
+    def resolver(self, receptores: list[Receptores], organos: list[tuple[Donantes, Organos]]) -> list[tuple[Receptores, Donantes, Organos]]:
+        """
+    Calcula la asignación de mayor puntaje total entre receptores en espera y órganos disponibles.
+    No modifica ningún paciente, solo devuelve las asignaciones.
+
+    params:
+        - receptores: Receptores en espera (con centro_de_salud asignado).
+        - organos: Pares (donante, organo) disponibles (con el donante asignado a un centro).
+
+    returns:
+        Una lista de tuplas (receptor, donante, organo).
+        """
+        receptores_por_organo: dict[int, list[Receptores]] = {}
+        for receptor in receptores:
+            receptores_por_organo.setdefault(receptor.codigo_organo, []).append(receptor)
+
+        organos_por_tipo: dict[int, list[tuple[Donantes, Organos]]] = {}
+        for donante, organo in organos:
+            organos_por_tipo.setdefault(organo.codigo_organo, []).append((donante, organo))
+
+        asignaciones = []
+        for tipo, organos_tipo in organos_por_tipo.items():
+            receptores_tipo = receptores_por_organo.get(tipo)
+            if receptores_tipo:
+                asignaciones.extend(self._resolver_balde(receptores_tipo, organos_tipo))
+        return asignaciones
+
+    def _resolver_balde(self, receptores: list[Receptores], organos: list[tuple[Donantes, Organos]]):
+        """
+    Resuelve un solo tipo de órgano como flujo de costo mínimo sobre el grafo comprimido:
+    (centro, sangre) del órgano -> (centro, sangre) del receptor -> sumidero.
+
+    params:
+        - receptores: Receptores en espera de este órgano.
+        - organos: Pares (donante, organo) de este órgano.
+
+    returns:
+        Una lista de tuplas (receptor, donante, organo).
+        """
+        #agrupar organos por centro de origen y grupo sanguineo
+        centros_origen = {}
+        for donante, organo in organos:
+            centros_origen.setdefault((donante.centro_de_salud, donante.codigo_sangre), []).append((donante, organo))
+        origenes = list(centros_origen)
+
+        #agrupar receptores por centro y grupo sanguineo y ordenarlos de mayor a menor puntaje
+        centros_destino = {}
+        for receptor in receptores:
+            centros_destino.setdefault((receptor.centro_de_salud, receptor.codigo_sangre), []).append((self.puntaje_receptor(receptor), receptor))
+        destinos = list(centros_destino)
+        for lista in centros_destino.values():
+            lista.sort(key=lambda par: -par[0])
+        puntajes = [[p for p, _ in centros_destino[c]] for c in destinos]
+
+        #costo de cada arista origen -> destino: la penalidad por horas de traslado depende solo de los centros y la
+        #compatibilidad solo de los grupos sanguineos, asi que se calculan una vez por par de centros y de grupos
+        centros_o = {centro: k for k, centro in enumerate(dict.fromkeys(centro for centro, _ in origenes))}
+        centros_d = {centro: k for k, centro in enumerate(dict.fromkeys(centro for centro, _ in destinos))}
+        sangres_o = {sangre: k for k, sangre in enumerate(dict.fromkeys(sangre for _, sangre in origenes))}
+        sangres_d = {sangre: k for k, sangre in enumerate(dict.fromkeys(sangre for _, sangre in destinos))}
+        penalidades = np.full((len(centros_o), len(centros_d)), np.inf) #infinito si no llega dentro del limite de isquemia
+        for origen, fila in centros_o.items():
+            for destino, columna in centros_d.items():
+                horas = self.horas_traslado(origen, destino)
+                if horas is not None:
+                    penalidades[fila, columna] = self.PESO_HORA_TRASLADO * horas
+        compatibles = np.array([[es_compatible(donante, receptor, self.estricto) for receptor in sangres_d] for donante in sangres_o], dtype=bool)
+
+        red = _RedDeFlujo([len(centros_origen[c]) for c in origenes], penalidades, compatibles,
+                          [(centros_o[centro], sangres_o[sangre]) for centro, sangre in origenes],
+                          [(centros_d[centro], sangres_d[sangre]) for centro, sangre in destinos], puntajes)
+        red.resolver()
+
+        #armar las asignaciones concretas a partir de los flujos
+        asignaciones = []
+        disponibles = [list(centros_origen[c]) for c in origenes]
+        for j, destino in enumerate(destinos):
+            receptores_j = [r for _, r in centros_destino[destino][:red.asignados_destino[j]]]
+            k = 0
+            for i, cantidad in red.flujo_inverso[j].items():
+                for _ in range(cantidad):
+                    donante, organo = disponibles[i].pop()
+                    asignaciones.append((receptores_j[k], donante, organo))
+                    k += 1
+        return asignaciones
+
+    def simular_greedy(self, centros) -> list[tuple[Receptores, Donantes, Organos]]:
+        """
+    Reproduce, sin modificar pacientes, las asignaciones que haría INCUCAI.clasificar_centros_salud
+    recorriendo los centros y pacientes en orden. Sirve para comparar puntajes.
+
+    params:
+        - centros: Lista de CentroSalud con sus lista_pacientes cargadas.
+
+    returns:
+        Una lista de tuplas (receptor, donante, organo).
+        """
+        return self.emparejar_en_orden((isinstance(paciente, Receptores), paciente)
+                                       for centro in centros for paciente in centro.lista_pacientes)
+
+    def emparejar_en_orden(self, pacientes) -> list[tuple]:
+        """
+    Aplica la regla de clasificar_centros_salud a una secuencia de pacientes, sin modificarlos: un receptor
+    que llega sin órgano toma el primer órgano compatible del inventario, y un donante que llega le da uno de
+    sus órganos al receptor en espera de mayor prioridad.
+
+    params:
+        - pacientes: Iterable de tuplas (es_receptor, paciente). Los pacientes solo necesitan los atributos
+          que usan InventarioOrganos y ListasEspera (códigos, estado, fechas, órganos).
+
+    returns:
+        Una lista de tuplas (receptor, donante, organo).
+        """
+        inventario = InventarioOrganos()
+        espera = ListasEspera()
+        asignaciones = []
+        for es_receptor, paciente in pacientes:
+            if es_receptor:
+                if paciente.organos_a_disposicion: #ya tiene su organo, no le saca uno a otro receptor
+                    continue
+                entrada = inventario.buscar_compatible(paciente.codigo_organo, paciente.codigo_sangre, self.estricto)
+                if entrada is not None:
+                    inventario.quitar_organo(*entrada)
+                    asignaciones.append((paciente, *entrada))
+                else:
+                    espera.agregar(paciente)
+
+            else:
+                inventario.agregar_donante(paciente)
+                mejor = None
+                for organo in paciente.organos_a_donar:
+                    candidato = espera.ver_primero_compatible(organo.codigo_organo, paciente.codigo_sangre, self.estricto)
+                    if candidato is not None and (mejor is None or candidato[0] < mejor[0]):
+                        mejor = (candidato[0], candidato[1], organo)
+                if mejor is not None:
+                    espera.quitar(mejor[1])
+                    inventario.quitar_organo(paciente, mejor[2])
+                    asignaciones.append((mejor[1], paciente, mejor[2]))
+        return asignaciones
+
+
+class _RedDeFlujo:
+
+    SUMIDERO = None #el sumidero en la cola de nodos activos (los orígenes van como i y los destinos como ~j)
+    ALFA = 8 #factor en el que se achica epsilon en cada fase
+    EPSILON_FINAL = 1e-9 #epsilon de la última fase, relativo al mayor puntaje
+    EPSILON_CHEQUEO = 1e-5 #desde este epsilon (relativo al mayor puntaje) se prueba si el flujo ya es óptimo
+    VUELTAS_CHEQUEO = 50 #vueltas de Bellman-Ford antes de dar la prueba por fallida
+
+    def __init__(self, oferta: list[int], penalidades: np.ndarray, compatibles: np.ndarray,
+                 origenes: list[tuple[int, int]], destinos: list[tuple[int, int]], puntajes: list[list[float]]):
+        """
+    Red de flujo de costo mínimo de un solo tipo de órgano, comprimida por (centro, sangre).
+
+    Nodos: los n_o orígenes (centro y sangre de los órganos, cada uno con su oferta), los n_d destinos (centro
+    y sangre de los receptores) y el sumidero. Un origen manda órganos a un destino (cuesta la penalidad del
+    traslado, infinito si no llega a tiempo o la sangre no es compatible) o los descarta directo al sumidero
+    (cuesta 0). Cada destino tiene una arista de capacidad 1 al sumidero por receptor, que cuesta -puntaje;
+    como conviene atender a los receptores de mayor a menor puntaje, alcanza con guardar cuántos tienen órgano.
+
+    params:
+        - oferta: Cantidad de órganos de cada origen.
+        - penalidades: Matriz (centros de origen x centros de destino) con la penalidad del traslado (infinito si no llega a tiempo).
+        - compatibles: Matriz booleana (grupos de origen x grupos de destino).
+        - origenes: Fila de centro y fila de grupo de cada origen.
+        - destinos: Columna de centro y columna de grupo de cada destino.
+        - puntajes: puntajes[j] = puntajes de los receptores del destino j, de mayor a menor.
+        """
+        self.n_o, self.n_d = len(origenes), len(destinos)
+        self.puntajes = puntajes
+        centro_o, sangre_o = (np.array([origen[k] for origen in origenes], dtype=np.intp) for k in (0, 1))
+        centro_d, sangre_d = (np.array([destino[k] for destino in destinos], dtype=np.intp) for k in (0, 1))
+        bloqueo = np.where(compatibles, 0.0, np.inf)
+        self.costos = penalidades[np.ix_(centro_o, centro_d)] + bloqueo[np.ix_(sangre_o, sangre_d)]
+        self._costos_llegada = np.ascontiguousarray(self.costos.T) #filas por destino, para recorrer columnas
+
+        #puntajes[j][k] va en la columna k + 1: la columna asignados_destino[j] es la del ultimo receptor con organo y
+        #la siguiente la del proximo sin organo (nan si no hay)
+        self._tabla_puntajes = np.full((self.n_d, max(map(len, puntajes), default=0) + 2), np.nan)
+        for j, lista in enumerate(puntajes):
+            self._tabla_puntajes[j, 1:len(lista) + 1] = lista
+        self._filas = np.arange(self.n_d)
+        self._ultimo = np.full(self.n_d, np.nan) #puntaje del ultimo receptor con organo de cada destino
+
+        self.asignados_destino = np.zeros(self.n_d, dtype=np.int64)
+        self.descartados = np.zeros(self.n_o, dtype=np.int64) #organos de cada origen que no se usan
+        self.flujo = [dict() for _ in range(self.n_o)] #flujo[i][j] = organos del origen i que van al destino j
+        self.flujo_inverso = [dict() for _ in range(self.n_d)] #flujo_inverso[j][i] = lo mismo, por destino
+
+        #precio y exceso (lo que entra menos lo que sale) de cada nodo: al empezar los organos estan en sus origenes
+        self.precio_origen = np.zeros(self.n_o)
+        self.precio_destino = np.zeros(self.n_d)
+        self.precio_sumidero = 0.0
+        self.exceso_origen = np.array(oferta, dtype=np.int64)
+        self.exceso_destino = np.zeros(self.n_d, dtype=np.int64)
+        self.exceso_sumidero = -int(self.exceso_origen.sum())
+
+        self.puntaje_maximo = max((lista[0] for lista in puntajes if lista), default=1.0)
+        self.epsilon = self.puntaje_maximo
+        self._activos = deque()
+        self._reetiquetados = 0
+
+    def _asignar(self, j: int, cantidad: int):
+        """
+        Método auxiliar que deja con órgano a los primeros receptores del destino j.
+        """
+        self.asignados_destino[j] = cantidad
+        self._ultimo[j] = self._tabla_puntajes[j, cantidad]
+
+    def _mover(self, i: int, j: int, cantidad: int):
+        """
+        Método auxiliar que suma (o resta, si es negativa) una cantidad al flujo del origen i al destino j.
+        """
+        total = self.flujo[i].get(j, 0) + cantidad
+        if total:
+            self.flujo[i][j] = self.flujo_inverso[j][i] = total
+        else:
+            del self.flujo[i][j], self.flujo_inverso[j][i]
+
+    def _sumar_exceso_origen(self, i: int, cantidad: int):
+        """
+        Método auxiliar que suma exceso al origen i y lo pone en la cola si se activa.
+        """
+        if self.exceso_origen[i] <= 0 < self.exceso_origen[i] + cantidad:
+            self._activos.append(i)
+        self.exceso_origen[i] += cantidad
+
+    def _sumar_exceso_destino(self, j: int, cantidad: int):
+        """
+        Método auxiliar que suma exceso al destino j y lo pone en la cola si se activa.
+        """
+        if self.exceso_destino[j] <= 0 < self.exceso_destino[j] + cantidad:
+            self._activos.append(~j)
+        self.exceso_destino[j] += cantidad
+
+    def _sumar_exceso_sumidero(self, cantidad: int):
+        """
+        Método auxiliar que suma exceso al sumidero y lo pone en la cola si se activa.
+        """
+        if self.exceso_sumidero <= 0 < self.exceso_sumidero + cantidad:
+            self._activos.append(self.SUMIDERO)
+        self.exceso_sumidero += cantidad
+
+    def _empezar_fase(self):
+        """
+    Método auxiliar que adapta el flujo al nuevo epsilon: baja los precios de los orígenes hasta que sus aristas
+    de salida tengan costo reducido >= -epsilon, deshace los traslados y descartes que quedan con costo reducido
+    < -epsilon y corrige cuántos receptores de cada destino tienen órgano. Lo que se deshace queda como exceso.
+        """
+        epsilon = self.epsilon
+        tope = np.minimum((self.costos + self.precio_destino).min(axis=1), self.precio_sumidero) + epsilon
+        np.minimum(self.precio_origen, tope, out=self.precio_origen)
+        for j, flujos in enumerate(self.flujo_inverso):
+            for i, cantidad in list(flujos.items()):
+                if self.precio_origen[i] - self.costos[i, j] - self.precio_destino[j] < -epsilon:
+                    self._mover(i, j, -cantidad)
+                    self.exceso_origen[i] += cantidad
+                    self.exceso_destino[j] -= cantidad
+        violan = (self.descartados > 0) & (self.precio_origen - self.precio_sumidero < -epsilon)
+        self.exceso_origen[violan] += self.descartados[violan]
+        self.exceso_sumidero -= int(self.descartados[violan].sum())
+        self.descartados[violan] = 0
+        for j, puntajes in enumerate(self.puntajes):
+            diferencia = self.precio_sumidero - self.precio_destino[j] #un receptor debe tener organo si su puntaje la supera
+            k = self.asignados_destino[j]
+            while k < len(puntajes) and puntajes[k] - diferencia > epsilon:
+                k += 1
+            while k > 0 and puntajes[k - 1] - diferencia < -epsilon:
+                k -= 1
+            self.exceso_destino[j] -= k - self.asignados_destino[j]
+            self.exceso_sumidero += k - self.asignados_destino[j]
+            self._asignar(j, k)
+
+        self._activos = deque(np.flatnonzero(self.exceso_origen > 0).tolist())
+        self._activos.extend(~j for j in np.flatnonzero(self.exceso_destino > 0).tolist())
+        if self.exceso_sumidero > 0:
+            self._activos.append(self.SUMIDERO)
+
+    def _descargar_origen(self, i: int):
+        """
+        Método auxiliar que manda todo el exceso del origen i por su arista más barata (reetiquetándolo si hace falta).
+        """
+        costos = self.costos[i] + self.precio_destino
+        j = int(costos.argmin())
+        mejor = min(costos[j], self.precio_sumidero)
+        if mejor >= self.precio_origen[i]: #ninguna arista admisible
+            self.precio_origen[i] = mejor + self.epsilon
+            self._reetiquetados += 1
+        cantidad = int(self.exceso_origen[i])
+        self.exceso_origen[i] = 0
+        if costos[j] <= self.precio_sumidero:
+            self._mover(i, j, cantidad)
+            self._sumar_exceso_destino(j, cantidad)
+        else:
+            self.descartados[i] += cantidad
+            self._sumar_exceso_sumidero(cantidad)
+
+    def _descargar_destino(self, j: int):
+        """
+    Método auxiliar que reparte el exceso del destino j: primero le da órganos a los receptores cuya arista al
+    sumidero es admisible y después deshace traslados admisibles. Si sobra, reetiqueta el destino y repite.
+        """
+        puntajes, costos = self.puntajes[j], self._costos_llegada[j]
+        while self.exceso_destino[j] > 0:
+            precio = self.precio_destino[j]
+            k = self.asignados_destino[j]
+            while self.exceso_destino[j] > 0 and k < len(puntajes) and puntajes[k] > self.precio_sumidero - precio:
+                k += 1
+                self.exceso_destino[j] -= 1
+                self._sumar_exceso_sumidero(1)
+            self._asignar(j, k)
+            if self.exceso_destino[j] > 0:
+                for i, cantidad in list(self.flujo_inverso[j].items()):
+                    if self.precio_origen[i] - costos[i] - precio < 0:
+                        cantidad = min(cantidad, int(self.exceso_destino[j]))
+                        self._mover(i, j, -cantidad)
+                        self.exceso_destino[j] -= cantidad
+                        self._sumar_exceso_origen(i, cantidad)
+                        if self.exceso_destino[j] == 0:
+                            break
+            if self.exceso_destino[j] > 0:
+                candidatos = [self.precio_origen[i] - costos[i] for i in self.flujo_inverso[j]]
+                if k < len(puntajes):
+                    candidatos.append(self.precio_sumidero - puntajes[k])
+                self.precio_destino[j] = min(candidatos) + self.epsilon
+                self._reetiquetados += 1
+
+    def _descargar_sumidero(self):
+        """
+    Método auxiliar que devuelve el exceso del sumidero: primero les saca el órgano a los últimos receptores con
+    arista de vuelta admisible y después deshace descartes admisibles. Si sobra, reetiqueta el sumidero y repite.
+        """
+        while self.exceso_sumidero > 0:
+            for j in np.flatnonzero(self._ultimo + self.precio_destino < self.precio_sumidero).tolist():
+                puntajes, k = self.puntajes[j], self.asignados_destino[j]
+                while self.exceso_sumidero > 0 and k > 0 and puntajes[k - 1] + self.precio_destino[j] < self.precio_sumidero:
+                    k -= 1
+                    self.exceso_sumidero -= 1
+                    self._sumar_exceso_destino(j, 1)
+                self._asignar(j, k)
+                if self.exceso_sumidero == 0:
+                    break
+            if self.exceso_sumidero > 0:
+                for i in np.flatnonzero((self.descartados > 0) & (self.precio_origen < self.precio_sumidero)).tolist():
+                    cantidad = min(int(self.descartados[i]), self.exceso_sumidero)
+                    self.descartados[i] -= cantidad
+                    self.exceso_sumidero -= cantidad
+                    self._sumar_exceso_origen(i, cantidad)
+                    if self.exceso_sumidero == 0:
+                        break
+            if self.exceso_sumidero > 0:
+                candidatos = np.concatenate([(self._ultimo + self.precio_destino)[self.asignados_destino > 0],
+                                             self.precio_origen[self.descartados > 0]])
+                self.precio_sumidero = float(candidatos.min()) + self.epsilon
+                self._reetiquetados += 1
+
+    def _actualizar_precios(self):
+        """
+    Método auxiliar que sube de una vez el precio de cada nodo según su distancia (en pasos de epsilon, medida
+    con los costos reducidos) a los nodos con déficit, recorriendo las aristas residuales hacia atrás por baldes.
+    Reemplaza muchos reetiquetados chicos; los nodos que no llegan a un déficit suben lo mismo que el más lejano.
+        """
+        self._reetiquetados = 0
+        infinito, epsilon = np.inf, self.epsilon
+        p_o, p_d, p_t = self.precio_origen, self.precio_destino, self.precio_sumidero
+        distancia_o = np.where(self.exceso_origen < 0, 0.0, infinito)
+        distancia_d = np.where(self.exceso_destino < 0, 0.0, infinito)
+        distancia_t = 0.0 if self.exceso_sumidero < 0 else infinito
+        fijo_o, fijo_d, fijo_t = np.zeros(self.n_o, dtype=bool), np.zeros(self.n_d, dtype=bool), False
+        activo_o, activo_d = self.exceso_origen > 0, self.exceso_destino > 0
+        siguiente = self._tabla_puntajes[self._filas, self.asignados_destino + 1]
+
+        def pasos(costos_reducidos):
+            return np.maximum(np.floor(costos_reducidos / epsilon) + 1, 0)
+
+        while True:
+            balde = min(np.where(fijo_o, infinito, distancia_o).min(), np.where(fijo_d, infinito, distancia_d).min(),
+                        infinito if fijo_t else distancia_t)
+            if balde == infinito:
+                break
+            if not ((activo_o & ~fijo_o).any() or (activo_d & ~fijo_d).any() or (self.exceso_sumidero > 0 and not fijo_t)):
+                break
+            nuevos_d = np.flatnonzero(~fijo_d & (distancia_d == balde))
+            nuevos_o = np.flatnonzero(~fijo_o & (distancia_o == balde))
+            nuevo_t = not fijo_t and distancia_t == balde
+            fijo_d[nuevos_d] = True
+            fijo_o[nuevos_o] = True
+            fijo_t = fijo_t or nuevo_t
+
+            if len(nuevos_d): #llegan traslados desde cualquier origen y receptores que se pueden deshacer desde el sumidero
+                largos = pasos(self.costos[:, nuevos_d] + p_d[nuevos_d] - p_o[:, None]).min(axis=1)
+                np.minimum(distancia_o, np.where(fijo_o, infinito, balde + largos), out=distancia_o)
+                con_organo = nuevos_d[self.asignados_destino[nuevos_d] > 0]
+                if len(con_organo) and not fijo_t:
+                    distancia_t = min(distancia_t, balde + pasos(self._ultimo[con_organo] + p_d[con_organo] - p_t).min())
+            for i in nuevos_o.tolist(): #llegan traslados que se pueden deshacer y descartes
+                for j in self.flujo[i]:
+                    if not fijo_d[j]:
+                        distancia_d[j] = min(distancia_d[j], balde + pasos(p_o[i] - self.costos[i, j] - p_d[j]))
+                if self.descartados[i] and not fijo_t:
+                    distancia_t = min(distancia_t, balde + pasos(p_o[i] - p_t))
+            if nuevo_t: #llegan descartes desde cualquier origen y el siguiente receptor de cada destino
+                np.minimum(distancia_o, np.where(fijo_o, infinito, balde + pasos(p_t - p_o)), out=distancia_o)
+                largos = np.where(fijo_d | np.isnan(siguiente), infinito, balde + pasos(p_t - siguiente - p_d))
+                np.minimum(distancia_d, largos, out=distancia_d)
+
+        if balde == infinito:
+            balde = max(distancia_o[fijo_o].max(initial=0), distancia_d[fijo_d].max(initial=0), distancia_t if fijo_t else 0) + 1
+        distancia_o[~fijo_o] = balde
+        distancia_d[~fijo_d] = balde
+        self.precio_origen += epsilon * distancia_o
+        self.precio_destino += epsilon * distancia_d
+        self.precio_sumidero += epsilon * (distancia_t if fijo_t else balde)
+
+    def _es_optimo(self) -> bool:
+        """
+    Método auxiliar que prueba si el flujo actual ya es de costo mínimo: busca con Bellman-Ford (vectorizado y
+    arrancando de los precios actuales) distancias que no dejen aristas residuales con costo reducido negativo.
+    Si siguen bajando después de VUELTAS_CHEQUEO vueltas se toma como que no.
+        """
+        infinito = np.inf
+        tolerancia = self.EPSILON_FINAL * self.puntaje_maximo
+        inversos = np.full(self.costos.shape, infinito) #costo de deshacer cada traslado con flujo
+        for j, flujos in enumerate(self.flujo_inverso):
+            if flujos:
+                i = list(flujos)
+                inversos[i, j] = -self.costos[i, j]
+        siguiente = self._tabla_puntajes[self._filas, self.asignados_destino + 1]
+        siguiente = np.where(np.isnan(siguiente), -infinito, siguiente)
+        con_organo, con_descarte = self.asignados_destino > 0, self.descartados > 0
+
+        distancia_o, distancia_d, distancia_t = -self.precio_origen, -self.precio_destino, -self.precio_sumidero
+        for _ in range(self.VUELTAS_CHEQUEO):
+            nueva_d = np.minimum(distancia_d, (distancia_o[:, None] + self.costos).min(axis=0))
+            nueva_d = np.where(con_organo, np.minimum(nueva_d, distancia_t + self._ultimo), nueva_d)
+            nueva_o = np.minimum(distancia_o, (nueva_d + inversos).min(axis=1))
+            nueva_o = np.where(con_descarte, np.minimum(nueva_o, distancia_t), nueva_o)
+            nueva_t = min(distancia_t, nueva_o.min(), (nueva_d - siguiente).min())
+            bajaron = ((nueva_d < distancia_d - tolerancia).any() or (nueva_o < distancia_o - tolerancia).any()
+                       or nueva_t < distancia_t - tolerancia)
+            distancia_o, distancia_d, distancia_t = nueva_o, nueva_d, nueva_t
+            if not bajaron:
+                return True
+        return False
+
+    def resolver(self):
+        """
+    Calcula el flujo de costo mínimo (máximo puntaje) con escalado de costos (push-relabel de Goldberg).
+
+    En cada fase epsilon se divide por ALFA y se busca un flujo epsilon-óptimo (ninguna arista residual con costo
+    reducido menor que -epsilon) partiendo del de la fase anterior: los nodos con exceso lo empujan por aristas
+    admisibles o suben su precio, y cada tanto los precios se recalculan de una vez (ver _actualizar_precios).
+    Con epsilon chico el flujo ya es exacto; desde EPSILON_CHEQUEO se prueba si es óptimo para cortar antes.
+        """
+        epsilon_final = self.EPSILON_FINAL * self.puntaje_maximo
+        epsilon_chequeo = self.EPSILON_CHEQUEO * self.puntaje_maximo
+        while True:
+            self.epsilon = max(self.epsilon / self.ALFA, epsilon_final)
+            self._empezar_fase()
+            if self._activos:
+                self._actualizar_precios()
+            while self._activos:
+                if self._reetiquetados >= self.n_o + self.n_d:
+                    self._actualizar_precios()
+                nodo = self._activos.popleft()
+                if nodo is self.SUMIDERO:
+                    self._descargar_sumidero()
+                elif nodo >= 0:
+                    if self.exceso_origen[nodo] > 0:
+                        self._descargar_origen(nodo)
+                else:
+                    self._descargar_destino(~nodo)
+            if self.epsilon <= epsilon_final or (self.epsilon <= epsilon_chequeo and self._es_optimo()):
+                break
@@ -0,0 +1,188 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from persistencia.Diario_Eventos import DiarioEventos
+
+_TRABAJOS: list = [] #trabajos de la ronda en curso: con fork los procesos los heredan y solo reciben su posicion
+_FUNCION = None
+
+
+def _correr_trabajo(posicion: int):
+    """
+    Función que corre en cada proceso trabajador creado con fork: aplica la función de la ronda al trabajo heredado
+    de esa posición (ver AsignacionProvincial.repartir). Es una función de módulo para que se pueda enviar a otro proceso.
+    """
+    return _FUNCION(_TRABAJOS[posicion])
+
+
+class AsignacionProvincial:
+
+    PARTICIONES = ("provincia", "partido") #atributos de CentroSalud por los que se puede partir el pais
+
+    def __init__(self, procesos: int = None, particion: str = "provincia"):
+        """
+    Reparto por regiones para procesar en paralelo: los centros (con sus pacientes, sus cirujanos y sus
+    vehículos) se agrupan por provincia y cada región se procesa en un proceso aparte, sin compartir nada con
+    las demás. Lo que sobra (órganos sin receptor compatible en su región) se concilia después a nivel
+    nacional, en INCUCAI.clasificar_centros_salud_por_provincia.
+
+    params:
+        - procesos: Cantidad de procesos trabajadores (por defecto, los núcleos disponibles).
+        - particion: "provincia" o "partido". Partir por partido da más trabajos y reparte mejor la carga
+          cuando una provincia concentra muchos centros, a cambio de dejar más órganos para la conciliación.
+        """
+        if particion not in self.PARTICIONES:
+            raise ValueError(f"La partición debe ser una de {self.PARTICIONES}.")
+        if procesos is not None and procesos < 1:
+            raise ValueError("La cantidad de procesos debe ser al menos 1.")
+        self.procesos = procesos or os.cpu_count() or 1
+        self.particion = particion
+
+    def _region(self, centro):
+        """
+        Método auxiliar que devuelve la región de un centro (hay partidos con el mismo nombre en distintas provincias).
+        """
+        if self.particion == "partido":
+            return (centro.provincia, centro.partido)
+        return centro.provincia
+
+    @staticmethod
+    def _raiz(padres: dict, region):
+        """
+        Método auxiliar que devuelve la región a la que quedó unida otra (union-find con compresión de caminos).
+        """
+        while padres[region] != region:
+            padres[region] = padres[padres[region]]
+            region = padres[region]
+        return region
+
+    def particionar(self, centros: list) -> dict[str, list]:
+        """
+    Agrupa los centros por provincia (o partido), respetando el orden en que aparecen. Un cirujano o un
+    vehículo compartido entre centros de distintas regiones une esas regiones en una sola: cada proceso
+    trabaja con su propia copia y no podría saber cuándo lo usó otro.
+
+    params:
+        - centros: Lista de CentroSalud.
+
+    returns:
+        Un diccionario región -> lista de CentroSalud de esa región.
+        """
+        padres = {self._region(centro): self._region(centro) for centro in centros}
+        dueños = {} #id del cirujano o vehiculo -> primera region que lo usa
+        for centro in centros:
+            region = self._region(centro)
+            for objeto in (*centro.lista_cirujanos, *centro.lista_vehiculos):
+                otra = dueños.setdefault(id(objeto), region)
+                padres[self._raiz(padres, otra)] = self._raiz(padres, region)
+
+        regiones = {}
+        for centro in centros:
+            regiones.setdefault(self._raiz(padres, self._region(centro)), []).append(centro)
+        return regiones
+
+    def repartir(self, funcion, trabajos: list, pesos: list[int] = None):
+        """
+    Corre `funcion` con cada trabajo en un proceso aparte, hasta `procesos` a la vez. Los trabajos más pesados
+    se mandan primero, asi ninguno queda solo al final.
+
+    Si el sistema permite fork, los procesos heredan los trabajos ya armados en memoria y solo reciben su
+    posición, asi los centros y los pacientes no se copian por un pipe; si no, cada trabajo se envía con pickle.
+
+    params:
+        - funcion: Función de módulo (o método estático) que recibe un trabajo.
+        - trabajos: Lista de trabajos.
+        - pesos: Tamaño de cada trabajo, para ordenarlos (opcional).
+
+    returns:
+        Un generador de tuplas (posición del trabajo, resultado), en el orden en que se mandaron; cada
+        resultado se puede usar mientras los procesos siguen con los demás.
+        """
+        global _TRABAJOS, _FUNCION
+        orden = sorted(range(len(trabajos)), key=lambda i: pesos[i], reverse=True) if pesos else list(range(len(trabajos)))
+        cantidad = max(1, min(self.procesos, len(trabajos)))
+        if "fork" in multiprocessing.get_all_start_methods():
+            _TRABAJOS, _FUNCION = trabajos, funcion
+            try:
+                with ProcessPoolExecutor(cantidad, mp_context=multiprocessing.get_context("fork")) as procesos:
+                    yield from zip(orden, procesos.map(_correr_trabajo, orden))
+            finally:
+                _TRABAJOS, _FUNCION = [], None
+        else:
+            with ProcessPoolExecutor(cantidad) as procesos:
+                yield from zip(orden, procesos.map(funcion, (trabajos[i] for i in orden)))
+
+
+class ResumenRegion(DiarioEventos):
+
+    def __init__(self, omitir: set = frozenset(), lineas: bool = False):
+        """
+    Diario en memoria para el proceso trabajador de una región (ver INCUCAI.clasificar_centros_salud_por_provincia).
+    En lugar de codificar cada evento en JSON para que el proceso principal lo vuelva a leer y aplicar de a uno,
+    junta lo que cambió en tuplas compactas que el proceso principal aplica de una vez (ver resultado()). Si el
+    proceso principal tiene diario, además anota los eventos como líneas JSON, que se le pasan tal cual.
+
+    params:
+        - omitir: DNIs de los pacientes que el proceso principal ya tenía registrados: su alta no se vuelve a anotar.
+        - lineas: Si es True, los eventos también se anotan como líneas JSON (ver DiarioEventos.agregar_lineas).
+        """
+        super().__init__(None)
+        self.omitir = omitir
+        self.anotar_lineas = lineas
+        self.registrados: list[int] = [] #dni de los pacientes dados de alta, en orden
+        self.trasplantes: list[list] = [] #[dni del receptor, dni del donante, posicion del organo, fecha de ablacion, cirugia]
+        self.traslados: list[tuple] = [] #(clave del vehiculo, distancia, nivel de trafico, tiempo)
+        self.quitados: list[int] = [] #dni de los donantes dados de baja
+        self._trasplante_de: dict[int, list] = {} #dni del receptor -> su ultimo trasplante
+        self._operaciones: dict[str, object] = {} #clave del cirujano -> fecha de la cirugia que empezo, hasta su evento CIRUGIA
+
+    def registrar(self, tipo: str, **datos):
+        """
+    Guarda el evento como tupla compacta y, si se pidió, también como línea JSON. La cirugía (CIRUJANO_OPERO y
+    CIRUGIA) queda en el trasplante de su receptor; el evento ESTADO no se guarda porque sale del resultado de la
+    cirugía (ver INCUCAI._trasplantar).
+
+    params:
+        - tipo: Tipo de evento (una de las constantes de DiarioEventos).
+        - datos: Datos del evento, con los objetos sin convertir.
+
+    returns:
+        El número de secuencia del evento.
+        """
+        if tipo in (self.RECEPTOR, self.DONANTE):
+            if datos["dni"] in self.omitir:
+                return self.ultima_secuencia
+            self.registrados.append(datos["dni"])
+        elif tipo == self.ORGANO_ASIGNADO:
+            trasplante = [datos["receptor"], datos["donante"], datos["posicion"], datos["fecha_ablacion"], None]
+            self.trasplantes.append(trasplante)
+            self._trasplante_de[datos["receptor"]] = trasplante
+        elif tipo == self.CIRUJANO_OPERO:
+            self._operaciones[self.clave(datos["cirujano"])] = datos["fecha"]
+        elif tipo == self.CIRUGIA:
+            clave = self.clave(datos["cirujano"])
+            self._trasplante_de[datos["dni"]][4] = (datos["centro"].nombre, clave, self._operaciones.pop(clave, None), datos["exitosa"])
+        elif tipo == self.TRASLADO:
+            self.traslados.append((self.clave(datos["vehiculo"]), datos["distancia"], datos["nivel_trafico"], datos["tiempo"]))
+        elif tipo == self.DONANTE_QUITADO:
+            self.quitados.append(datos["dni"])
+        elif tipo != self.ESTADO:
+            raise ValueError(f"Evento inesperado en una región: {tipo}")
+
+        if self.anotar_lineas:
+            return super().registrar(tipo, **datos)
+        self.ultima_secuencia += 1
+        return self.ultima_secuencia
+
+    def resultado(self) -> tuple:
+        """
+    Devuelve lo que cambió en la región, para mandarlo al proceso principal.
+
+    returns:
+        Una tupla (registrados, trasplantes, traslados, quitados, lineas). Cada trasplante es una tupla (dni del
+        receptor, dni del donante, posición del órgano entre los del donante, fecha de ablación, cirugía), con
+        cirugía None si no se llegó a operar o (nombre del centro, clave del cirujano, fecha en que empezó a
+        operar o None, exitosa). lineas es None si no se anotaron.
+        """
+        return (self.registrados, [tuple(trasplante) for trasplante in self.trasplantes], self.traslados, self.quitados,
+                self.lineas() if self.anotar_lineas else None)
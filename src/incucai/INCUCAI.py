@@ -2,15 +2,41 @@ from pacientes.Receptores import Receptores
 from pacientes.Donantes import Donantes
 from centro_salud.Centro_Salud import CentroSalud
 from organos.Organos import *
+from incucai.Inventario_Organos import InventarioOrganos
+from incucai.Listas_Espera import ListasEspera, prioridad_receptor
+from incucai.Asignacion_Global import AsignacionGlobal
+from incucai.Asignacion_Provincial import AsignacionProvincial, ResumenRegion
+from incucai.Simulacion_Montecarlo import SimulacionMontecarlo
+from incucai.Registro_DNI import RegistroDNI
+from incucai.Tabla_Receptores import TablaReceptores
+from centro_salud.Matriz_Distancias import MatrizDistancias
+from centro_salud.Despachador_Nacional import DespachadorNacional
+from centro_salud.Planificador_Rutas import PlanificadorRutas
+from reloj.Reloj import Reloj, RELOJ_REAL
+from persistencia.Almacen_SQLite import AlmacenSQLite
+from persistencia.Diario_Eventos import DiarioEventos
 from datetime import datetime
+import heapq
+import random
+import time
 class INCUCAI:
 
-    def __init__(self, centros = []):
+    def __init__(self, centros = [], compatibilidad_estricta = False, ruta_distancias = None, reloj: Reloj = None,
+                 almacen: AlmacenSQLite = None, diario: DiarioEventos = None, matriz_distancias: MatrizDistancias = None):
         """
     Inicializa una instancia de INCUCAI.
 
     params:
         - centros: Una lista de objetos CentroSalud que representa los centros de salud asociados.
+        - compatibilidad_estricta: Si es True, solo se aceptan donante y receptor con el mismo grupo sanguíneo.
+          Por defecto se usa la tabla de compatibilidad ABO (por ejemplo, O- puede donar a cualquiera).
+        - ruta_distancias: Archivo donde se guarda la matriz de distancias entre centros (opcional), asi no se
+          recalcula cada vez que se abre el sistema.
+        - reloj: Reloj del que salen las fechas (por defecto, la hora real).
+        - almacen: AlmacenSQLite donde se guardan los pacientes, las asignaciones y los resultados (opcional).
+        - diario: DiarioEventos donde se anota cada cambio de estado de INCUCAI, los centros y los cirujanos (opcional).
+        - matriz_distancias: MatrizDistancias ya calculada para estos centros (opcional, en lugar de ruta_distancias),
+          por ejemplo la parte de la matriz de otro INCUCAI que corresponde a una región.
     
     precon (opcional):
         - centros debe ser una lista (puede estar vacía) cuyos elementos sean instancias de CentroSalud.
@@ -21,106 +47,763 @@ class INCUCAI:
         self.lista_receptores: list[Receptores] = [] #listas para almacenar los receptores y donantes (vacias) 
         self.lista_donantes: list[Donantes] = []
         self.centros_salud: list[CentroSalud] = centros
-    
-    def clasificar_centros_salud(self):
+        self.compatibilidad_estricta = compatibilidad_estricta
+        self.inventario_organos = InventarioOrganos() #indice de organos disponibles por (organo, tipo de sangre), se mantiene a la par de lista_donantes
+        self.registro_dni = RegistroDNI() #dni -> paciente y estado de su trasplante, para busquedas y duplicados en O(1)
+        self._procesados_por_centro: dict[CentroSalud, int] = {} #cuantos pacientes de lista_pacientes de cada centro ya se procesaron
+        self.listas_espera = ListasEspera() #heaps de receptores en espera por (organo, tipo de sangre), ordenados por estado, edad y fecha de espera
+        self.matriz_distancias = matriz_distancias if matriz_distancias is not None else MatrizDistancias(ruta_distancias) #distancias geodesicas entre todos los pares de centros
+        self.matriz_distancias.actualizar(centros)
+        self.despachador = DespachadorNacional(centros, self.matriz_distancias) #si un centro no tiene vehiculo libre, se lo pide al mas cercano
+        self.planificador = PlanificadorRutas(centros, self.matriz_distancias, self.despachador) #traslados multimodales dentro de la ventana de isquemia
+        self.tabla_receptores = TablaReceptores() #columnas de NumPy con los datos de lista_receptores, para filtrar y ordenar por centro
+        self.reloj = reloj or RELOJ_REAL #de aca salen las fechas de ablacion y la hora de las cirugias
+        self.almacen = almacen #si hay almacen, cada alta y cada cambio de estado se guarda tambien en la base
+        self.diario = None #si hay diario, cada cambio de estado se anota ahi para poder reproducirlo
+        self._conectar_reloj()
+        if diario is not None:
+            self._conectar_diario(diario)
+
+    def _conectar_diario(self, diario: DiarioEventos):
+        """
+        Método auxiliar que conecta (o desconecta, con None) el diario de eventos a INCUCAI y a todos los centros, con sus cirujanos y vehículos.
+        """
+        self.diario = diario
+        for centro in self.centros_salud:
+            centro.conectar_diario(diario)
+
+    def _conectar_reloj(self):
+        """
+        Método auxiliar que le pasa el reloj de INCUCAI a todos los centros y sus cirujanos, asi todo el sistema compara horas del mismo reloj.
+        """
+        for centro in self.centros_salud:
+            centro.conectar_reloj(self.reloj)
+
+    def actualizar_centros(self):
+        """
+    Deja al día lo que depende de la lista de centros (distancias, despachador nacional, planificador de
+    traslados y reloj de los cirujanos) después de agregar centros, vehículos o cirujanos, por ejemplo con
+    una importación masiva. Las distancias entre centros que ya estaban no se recalculan.
+        """
+        self._conectar_reloj()
+        self.matriz_distancias.actualizar(self.centros_salud)
+        self.despachador.actualizar(self.centros_salud)
+        self.planificador = PlanificadorRutas(self.centros_salud, self.matriz_distancias, self.despachador)
+        if self.diario is not None: #los centros, cirujanos y vehiculos nuevos tambien necesitan su clave
+            self._conectar_diario(self.diario)
+
+    def registrar_receptor(self, receptor: Receptores, guardar: bool = True):
+        """
+    Agrega un receptor a la lista de receptores de INCUCAI y, si todavía no tiene un órgano asignado,
+    a la lista de espera del órgano que necesita.
+
+    params:
+        - receptor: Objeto Receptores a registrar.
+        - guardar: Si es False no se guarda en el almacén (por ejemplo, porque se acaba de leer de ahí).
+        """
+        self.registro_dni.agregar(receptor)
+        self.lista_receptores.append(receptor)
+        self.tabla_receptores.agregar(receptor)
+        if not receptor.organos_a_disposicion:
+            self.listas_espera.agregar(receptor)
+        if guardar and self.almacen is not None:
+            self.almacen.guardar_paciente(receptor, self.registro_dni.buscar(receptor.DNI)[1])
+        if self.diario is not None:
+            self.diario.registrar(DiarioEventos.RECEPTOR, **DiarioEventos.datos_paciente(receptor))
+
+    def registrar_donante(self, donante: Donantes, guardar: bool = True):
+        """
+    Agrega un donante a la lista de donantes de INCUCAI y carga sus órganos en el inventario.
+
+    params:
+        - donante: Objeto Donantes con sus organos_a_donar.
+        - guardar: Si es False no se guarda en el almacén (por ejemplo, porque se acaba de leer de ahí).
+        """
+        self.registro_dni.agregar(donante)
+        self.lista_donantes.append(donante)
+        self.inventario_organos.agregar_donante(donante)
+        if guardar and self.almacen is not None:
+            self.almacen.guardar_paciente(donante, RegistroDNI.DONANTE)
+        if self.diario is not None:
+            self.diario.registrar(DiarioEventos.DONANTE, **DiarioEventos.datos_paciente(donante))
+
+    def quitar_donante(self, donante: Donantes):
+        """
+    Quita a un donante de la lista de donantes y del inventario de órganos.
+
+    params:
+        - donante: Objeto Donantes a dar de baja.
+        """
+        if donante in self.lista_donantes:
+            self.lista_donantes.remove(donante)
+        self.inventario_organos.quitar_donante(donante)
+        if self.diario is not None:
+            self.diario.registrar(DiarioEventos.DONANTE_QUITADO, dni=donante.DNI)
+
+    def _asignar_organo(self, donante: Donantes, organo: Organos, receptor: Receptores, fecha_ablacion: datetime = None):
+        """
+    Transfiere un órgano del donante al receptor y actualiza el inventario y las listas de espera.
+
+    params:
+        - donante: Donante dueño del órgano.
+        - organo: Órgano que se transfiere.
+        - receptor: Receptor que lo recibe.
+        - fecha_ablacion: Fecha de ablación del órgano (por defecto, ahora; al reproducir el diario, la anotada).
+        """
+        if self.diario is not None:
+            posicion = donante.organos_a_donar.index(organo) #antes de sacarlo, para ubicarlo al reproducir
+        organo.fecha_ablacion = fecha_ablacion or self.reloj.ahora() # setea en "0hs" la fecha de ablacion del organo
+        receptor.organos_a_disposicion.append(organo)
+        donante.organos_a_donar.remove(organo)
+        self.inventario_organos.quitar_organo(donante, organo)
+        self.listas_espera.quitar(receptor)
+        self.registro_dni.actualizar_estado(receptor, RegistroDNI.EN_PROCESO)
+        if self.almacen is not None:
+            self.almacen.asignar_organo(donante, organo, receptor)
+            self.almacen.actualizar_estado(receptor, RegistroDNI.EN_PROCESO)
+        if self.diario is not None:
+            self.diario.registrar(DiarioEventos.ORGANO_ASIGNADO, donante=donante.DNI, posicion=posicion,
+                                  receptor=receptor.DNI, fecha_ablacion=organo.fecha_ablacion)
+
+    def _trasplantar(self, donante: Donantes, organo: Organos, receptor: Receptores, centro_cirugia: CentroSalud = None) -> bool:
+        """
+    Lleva un órgano del donante al receptor: primero planifica el traslado más rápido desde el centro del donante
+    (PlanificadorRutas) y recién si llega dentro de la ventana de isquemia asigna el órgano, despacha los vehículos
+    y, si llegan, asigna un cirujano y opera. Si ningún traslado llega a tiempo no se asigna nada: el órgano sigue
+    en el inventario y el receptor en su lista de espera. Si los centros no tienen coordenadas, el vehículo se
+    elige por partido y provincia. Actualiza el estado del receptor en el registro según el resultado de la cirugía.
+
+    params:
+        - donante: Donante dueño del órgano.
+        - organo: Órgano a trasplantar (todavía en organos_a_donar del donante).
+        - receptor: Receptor que lo recibe.
+        - centro_cirugia: CentroSalud donde se opera (por defecto, el del donante, que es el que despacha).
+
+    returns:
+        True si se asignó el órgano, se despachó el vehículo y se pasó a la etapa de cirugía. False si ningún
+        traslado llegaba dentro de la ventana de isquemia (el órgano no se asigna) o si, ya asignado, no había vehículo.
+        """
+        origen = donante.centro_de_salud or receptor.centro_de_salud #el organo sale del centro del donante
+        centro_cirugia = centro_cirugia or origen
+        plan = None
+        if self.matriz_distancias.distancia(origen, receptor.centro_de_salud) is not None:
+            plan = self.planificador.planificar(origen, receptor.centro_de_salud) #todavia no hubo ablacion, se cuenta la ventana entera
+            if plan is None:
+                print(f"Ningún traslado llega a {receptor.centro_de_salud} dentro de las {PlanificadorRutas.LIMITE_ISQUEMIA} hs de isquemia")
+                return False
+
+        self._asignar_organo(donante, organo, receptor)
+        horas_desde_ablacion = self.reloj.horas_desde(organo.fecha_ablacion) #la isquemia cuenta desde la ablacion, no desde que sale el vehiculo
+        if plan is None:
+            tiempo = origen.asignar_y_mandar_vehiculo(receptor, None, self.despachador) #sin coordenadas: vehiculo segun partido y provincia
+        else:
+            tiempo = self.planificador.ejecutar(plan, self.despachador)
+        if tiempo is None:
+            return False
+        tiempo += horas_desde_ablacion
+
+        resultado = centro_cirugia.asignar_cirujano_y_operar(receptor, tiempo)
+        if resultado is not None:
+            estado = RegistroDNI.EXITOSO if resultado else RegistroDNI.FALLIDO
+            self._actualizar_estado(receptor, estado, centro_cirugia)
+            if self.diario is not None:
+                self.diario.registrar(DiarioEventos.ESTADO, dni=receptor.DNI, estado=estado, centro=centro_cirugia)
+        return True
+
+    def _actualizar_estado(self, receptor: Receptores, estado: str, centro_cirugia: CentroSalud):
+        """
+        Método auxiliar que cambia el estado del trasplante de un receptor en el registro y, si hay almacén, también
+        ahí (con el resultado de la cirugía si ya se operó).
+        """
+        self.registro_dni.actualizar_estado(receptor, estado, centro_cirugia)
+        if self.almacen is not None:
+            self.almacen.actualizar_estado(receptor, estado, centro_cirugia)
+            if estado in (RegistroDNI.EXITOSO, RegistroDNI.FALLIDO):
+                self.almacen.guardar_resultado(receptor, estado == RegistroDNI.EXITOSO, centro_cirugia, self.reloj.ahora())
+
+    def _ofrecer_organos(self, donante: Donantes, centro_cirugia: CentroSalud = None, maximo: int = None) -> int:
+        """
+    Método auxiliar que ofrece los órganos del donante, de a uno, al receptor en espera de mayor prioridad
+    (buscar_compatibilidad_donante_a_receptor) y los trasplanta. Un órgano cuyo traslado no llega a tiempo no se
+    vuelve a ofrecer en esta llamada: queda en el inventario para los receptores que lleguen después. Si el
+    donante se queda sin órganos, se lo da de baja.
+
+    params:
+        - donante: Donante registrado.
+        - centro_cirugia: CentroSalud donde se opera (por defecto, el de cada receptor).
+        - maximo: Cantidad máxima de órganos a asignar (por defecto, todos los que encuentren receptor).
+
+    returns:
+        La cantidad de trasplantes que se realizaron (vehículo despachado y cirugía asignada).
+        """
+        trasplantes = asignados = 0
+        descartados = set() #organos sin traslado a tiempo hasta su mejor receptor
+        while maximo is None or asignados < maximo:
+            encontrado = self.buscar_compatibilidad_donante_a_receptor(donante, descartados)
+            if encontrado is None:
+                break
+            receptor, organo = encontrado
+            if self._trasplantar(donante, organo, receptor, centro_cirugia or receptor.centro_de_salud):
+                trasplantes += 1
+            if organo in donante.organos_a_donar: #no se asigno
+                descartados.add(organo)
+                continue
+            asignados += 1
+            if not donante.organos_a_donar:
+                self.quitar_donante(donante)
+        return trasplantes
+
+    def cargar_almacen(self, solo_activos: bool = False) -> int:
+        """
+    Carga los pacientes guardados en el almacén, en lugar de volver a cargarlos y procesarlos desde cero.
+    Cada paciente vuelve a su centro (por nombre) con el estado de su trasplante: los receptores en espera a
+    las listas de espera y los órganos sin asignar al inventario. Los pacientes quedan como ya procesados.
+
+    Con solo_activos se cargan solo los receptores en espera y los donantes con órganos sin asignar, que son
+    los únicos que pueden volver a emparejarse; los demás siguen en el almacén y se consultan desde ahí
+    (ver buscar_paciente, es_donante, es_receptor y receptores_por_centro), asi el arranque no depende de
+    cuántos pacientes se atendieron antes.
+
+    Si hay diario, cada paciente cargado se anota como un solo evento CARGA con sus datos y su estado (y no
+    como las altas y asignaciones que se hicieron en su momento), asi al reproducir el diario se llega al
+    mismo estado aunque el almacén ya no se vuelva a leer.
+
+    params:
+        - solo_activos: Si es True, carga solo los pacientes que todavía pueden emparejarse.
+
+    precon:
+        - INCUCAI debe tener un almacén y los centros de salud ya creados.
+
+    returns:
+        La cantidad de pacientes cargados.
+        """
+        if self.almacen is None:
+            raise ValueError("INCUCAI no tiene un almacén del que cargar pacientes.")
+        estados = (RegistroDNI.EN_ESPERA, RegistroDNI.DONANTE) if solo_activos else None
+        diario = self.diario
+        centros = {centro.nombre: centro for centro in self.centros_salud}
+        self._conectar_diario(None) #registrar_receptor y registrar_donante no anotan las altas, se anota la carga entera
+        cargados = 0
+        try:
+            for paciente, estado, nombre_centro in self.almacen.pacientes(centros, estados):
+                if solo_activos and isinstance(paciente, Donantes) and not paciente.organos_a_donar:
+                    continue
+                centro_cirugia = centros.get(nombre_centro)
+                if diario is not None: #antes de cargarlo, con los datos tal como estaban guardados
+                    diario.registrar(DiarioEventos.CARGA, paciente=DiarioEventos.RECEPTOR if isinstance(paciente, Receptores) else DiarioEventos.DONANTE,
+                                     trasplante=estado, centro_cirugia=centro_cirugia, **DiarioEventos.datos_paciente(paciente))
+                self._cargar_paciente(paciente, estado, centro_cirugia)
+                cargados += 1
+        finally:
+            self._conectar_diario(diario)
+
+        for centro in self.centros_salud:
+            self._procesados_por_centro[centro] = len(centro.lista_pacientes)
+        return cargados
+
+    def _cargar_paciente(self, paciente: Receptores | Donantes, estado: str, centro_cirugia: CentroSalud):
+        """
+        Método auxiliar que vuelve a poner a un paciente del almacén (o de un evento CARGA) en su centro, en el registro
+        con su estado y, según corresponda, en las listas de espera, el inventario y los resultados de su centro de cirugía.
+        """
+        if paciente.centro_de_salud is not None:
+            paciente.centro_de_salud.lista_pacientes.append(paciente)
+        if isinstance(paciente, Receptores):
+            self.registrar_receptor(paciente, guardar=False)
+        elif paciente.organos_a_donar:
+            self.registrar_donante(paciente, guardar=False)
+        else: #ya dono todos sus organos, solo figura en el registro
+            self.registro_dni.agregar(paciente)
+
+        self.registro_dni.actualizar_estado(paciente, estado, centro_cirugia)
+        if estado == RegistroDNI.EXITOSO and centro_cirugia is not None:
+            centro_cirugia.pacientes_exitosos.append(paciente)
+        elif estado == RegistroDNI.FALLIDO and centro_cirugia is not None:
+            centro_cirugia.pacientes_fallidos.append(paciente)
+
+    def buscar_paciente(self, dni: int) -> tuple | None:
+        """
+    Busca un paciente por DNI en el registro y, si no está cargado, en el almacén (ver cargar_almacen).
+
+    params:
+        - dni: Número de documento.
+
+    returns:
+        Una tupla (paciente, estado, centro) como la de RegistroDNI.buscar, o None si no hay ningún paciente con ese DNI.
+        """
+        registrado = self.registro_dni.buscar(dni)
+        if registrado is not None or self.almacen is None:
+            return registrado
+        centros = {centro.nombre: centro for centro in self.centros_salud}
+        guardado = self.almacen.buscar(dni, centros)
+        if guardado is None:
+            return None
+        paciente, estado, nombre_centro = guardado
+        return paciente, estado, centros.get(nombre_centro)
+
+    def es_donante(self, dni: int) -> bool:
+        """
+        Método auxiliar que indica si el DNI corresponde a un donante, registrado o guardado en el almacén.
+        """
+        if self.registro_dni.es_donante(dni):
+            return True
+        return self.almacen is not None and self.registro_dni.buscar(dni) is None and self.almacen.tipo_paciente(dni) == AlmacenSQLite.DONANTE
+
+    def es_receptor(self, dni: int) -> bool:
+        """
+        Método auxiliar que indica si el DNI corresponde a un receptor, registrado o guardado en el almacén.
+        """
+        if self.registro_dni.es_receptor(dni):
+            return True
+        return self.almacen is not None and self.registro_dni.buscar(dni) is None and self.almacen.tipo_paciente(dni) == AlmacenSQLite.RECEPTOR
+
+    def receptores_por_centro(self, nombre_centro: str) -> tuple[list[Receptores], list[Receptores]]:
+        """
+    Separa los receptores de un centro según su estado clínico, cada grupo ordenado por prioridad (ver
+    prioridad_receptor). Los receptores cargados salen de la tabla de receptores; si hay almacén, los que no se
+    cargaron se leen de ahí ya ordenados (ver AlmacenSQLite.receptores_por_prioridad) y se intercalan con ellos.
+
+    params:
+        - nombre_centro: Nombre del centro de salud.
+
+    returns:
+        Una tupla (inestables, estables) de listas de receptores.
+        """
+        cargados = self.tabla_receptores.receptores_por_centro(nombre_centro)
+        if self.almacen is None:
+            return cargados
+        centros = {centro.nombre: centro for centro in self.centros_salud}
+        omitir = {self.tabla_receptores.receptores[fila].DNI for fila in self.tabla_receptores.filas_por_centro(nombre_centro)}
+        inestables, estables = (list(heapq.merge(lista, self.almacen.receptores_por_prioridad(nombre_centro, estado, centros, omitir),
+                                                 key=prioridad_receptor)) #las dos ya vienen ordenadas
+                                for lista, estado in zip(cargados, ("inestable", "estable")))
+        return inestables, estables
+
+    def reproducir_diario(self, desde: int = 0) -> int:
+        """
+    Reconstruye el estado reproduciendo los eventos del diario, por ejemplo después de un corte: altas de
+    pacientes (vuelven a su centro) y pacientes cargados del almacén, asignaciones de órganos, bajas de donantes, traslados, cirugías y
+    cambios de estado, en el orden en que ocurrieron. Los eventos no se vuelven a anotar ni a guardar en el
+    almacén, y no se sortea nada: los resultados son los anotados. Los pacientes quedan como ya procesados.
+
+    params:
+        - desde: Número de secuencia hasta el que el estado ya está aplicado (por ejemplo, el de la última foto
+          guardada); con 0 se reproduce todo el diario.
+
+    precon:
+        - INCUCAI debe tener un diario, y los centros de salud, con sus cirujanos y vehículos, deben ser los
+          mismos (mismos nombres y mismo orden) que cuando se anotaron los eventos.
+
+    returns:
+        La cantidad de eventos reproducidos.
+        """
+        if self.diario is None:
+            raise ValueError("INCUCAI no tiene un diario de eventos que reproducir.")
+        diario, almacen = self.diario, self.almacen
+        centros = {centro.nombre: centro for centro in self.centros_salud}
+        self._conectar_diario(None) #lo que se reproduce ya esta anotado (y guardado, si hay almacen)
+        self.almacen = None
+        reproducidos = 0
+        try:
+            for evento in diario.leer(desde):
+                self._aplicar_evento(evento, centros, diario)
+                reproducidos += 1
+        finally:
+            self._conectar_diario(diario)
+            self.almacen = almacen
+
+        for centro in self.centros_salud:
+            self._procesados_por_centro[centro] = len(centro.lista_pacientes)
+        return reproducidos
+
+    def _aplicar_evento(self, evento: dict, centros: dict, diario: DiarioEventos, pacientes: dict = None):
+        """
+        Método auxiliar que aplica un evento del diario (ver reproducir_diario). `centros` es nombre -> CentroSalud y
+        `pacientes`, dni -> paciente que ya está en su centro y se registra tal cual, en vez de armar uno nuevo. Si
+        INCUCAI tiene almacén (al aplicar lo que hizo otro proceso), los cambios también se guardan ahí.
+        """
+        tipo = evento["t"]
+        if tipo in (DiarioEventos.RECEPTOR, DiarioEventos.DONANTE):
+            paciente = pacientes.get(evento["dni"]) if pacientes is not None else None
+            if paciente is None:
+                paciente = DiarioEventos.armar_paciente(evento, centros)
+                if paciente.centro_de_salud is not None:
+                    paciente.centro_de_salud.lista_pacientes.append(paciente)
+            if tipo == DiarioEventos.RECEPTOR:
+                self.registrar_receptor(paciente)
+            else:
+                self.registrar_donante(paciente)
+        elif tipo == DiarioEventos.CARGA:
+            paciente = DiarioEventos.armar_paciente(evento | {"t": evento["paciente"]}, centros)
+            self._cargar_paciente(paciente, evento["trasplante"], centros.get(evento["centro_cirugia"]))
+        elif tipo == DiarioEventos.ORGANO_ASIGNADO:
+            donante = self.registro_dni.buscar(evento["donante"])[0]
+            receptor = self.registro_dni.buscar(evento["receptor"])[0]
+            self._asignar_organo(donante, donante.organos_a_donar[evento["posicion"]], receptor,
+                                 datetime.fromisoformat(evento["fecha_ablacion"]))
+        elif tipo == DiarioEventos.DONANTE_QUITADO:
+            self.quitar_donante(self.registro_dni.buscar(evento["dni"])[0])
+        elif tipo == DiarioEventos.ESTADO:
+            self._actualizar_estado(self.registro_dni.buscar(evento["dni"])[0], evento["estado"], centros.get(evento["centro"]))
+        elif tipo == DiarioEventos.TRASLADO:
+            diario.objeto(evento["vehiculo"]).registro_viajes.agregar(evento["distancia"], evento["nivel_trafico"], evento["tiempo"])
+        elif tipo == DiarioEventos.CIRUJANO_OPERO:
+            cirujano = diario.objeto(evento["cirujano"])
+            cirujano.ultima_cirugia = datetime.fromisoformat(evento["fecha"])
+            cirujano.disponibilidad = "Ocupado"
+        elif tipo == DiarioEventos.CIRUGIA:
+            centro = centros[evento["centro"]]
+            centro.plantel.devolver(diario.objeto(evento["cirujano"]))
+            receptor = self.registro_dni.buscar(evento["dni"])[0]
+            (centro.pacientes_exitosos if evento["exitosa"] else centro.pacientes_fallidos).append(receptor)
+        else:
+            raise ValueError(f"Evento desconocido en el diario: {tipo}")
+
+    def clasificar_centros_salud(self, limite_segundos: float = None) -> int:
         
         """
         INCUCAI procesa todos los pacientes registrados en los centros de salud.
         Clasifica a cada paciente como receptor o donante, los agrega a sus respectivas listas
         y gestiona todo el proceso de búsqueda de compatibilidad, asignación de vehículo,
         y ejecución de la cirugía por parte del centro de salud.
+
+        Cada centro sigue desde el primer paciente que todavía no se procesó, asi una llamada cortada por
+        limite_segundos se retoma con otra llamada a este método, con la misma regla, sin repetir a nadie.
+
+    params:
+        - limite_segundos: Tiempo máximo de procesamiento (opcional). Se revisa entre paciente y paciente; los
+          que no llegan a procesarse quedan pendientes para la próxima llamada.
+
+    returns:
+        La cantidad de pacientes procesados.
         """
+        fin = time.perf_counter() + limite_segundos if limite_segundos is not None else None
+        procesados = 0
         for centro in self.centros_salud: #por cada lista de centro de salud, se verifica si los pacientes son receptor o donante y se agrega a la lista correspondiente
-            for paciente in centro.lista_pacientes:
+            desde = self._procesados_por_centro.get(centro, 0)
+            for posicion, paciente in enumerate(centro.lista_pacientes[desde:], desde):
+                if fin is not None and time.perf_counter() >= fin:
+                    self._procesados_por_centro[centro] = posicion
+                    return procesados
+
                 if isinstance(paciente, Receptores): #verificar si es receptor o donante en base a la clase
-                    self.lista_receptores.append(paciente)
-                    if self.buscar_compatibilidad_receptor_a_donante(paciente): 
-                        tiempo = centro.asignar_y_mandar_vehiculo(paciente) 
-                        if tiempo is not None:
-                            centro.asignar_cirujano_y_operar(paciente, tiempo)
+                    self.registrar_receptor(paciente)
+                    entrada = None if paciente.organos_a_disposicion else self.buscar_compatibilidad_receptor_a_donante(paciente)
+                    if entrada is not None: #el organo sale del centro del donante y se opera en el del receptor
+                        self._trasplantar(*entrada, paciente, centro)
 
                 elif isinstance(paciente, Donantes): #misma logica que los receptores, pero aplicado a los donantes
-                    self.lista_donantes.append(paciente)
-                    receptor_encontrado = self.buscar_compatibilidad_donante_a_receptor(paciente)  #como los organos del donante son los que van al receptor, esta funcion devuelve dicho receptor encontrado que necesita del organo
-                    if receptor_encontrado is not None: #si encuentra un receptor, entra a las demas funciones
-                        tiempo = centro.asignar_y_mandar_vehiculo(receptor_encontrado)
-                        if tiempo is not None:
-                            centro.asignar_cirujano_y_operar(receptor_encontrado, tiempo)
+                    self.registrar_donante(paciente)
+                    self._ofrecer_organos(paciente, centro, maximo=1) #como los organos del donante son los que van al receptor, se busca el receptor que necesita uno de ellos
 
                 else:
                     raise ValueError("El paciente debe ser un receptor o un donante.")
+                procesados += 1
+
+            self._procesados_por_centro[centro] = len(centro.lista_pacientes)
+        return procesados
+
+    def pacientes_pendientes(self) -> int:
+        """
+        Método auxiliar que devuelve cuántos pacientes de los centros todavía no se procesaron.
+        """
+        return sum(len(centro.lista_pacientes) - self._procesados_por_centro.get(centro, 0) for centro in self.centros_salud)
+
+    def procesar_nuevos_pacientes(self, limite_segundos: float = None) -> int:
+        """
+    Procesa solamente los pacientes que se agregaron a los centros de salud desde la última vez que
+    se procesaron (con este método, clasificar_centros_salud o clasificar_centros_salud_global).
+
+    Un receptor nuevo busca un órgano en el inventario; un donante nuevo reparte sus órganos entre los
+    receptores en espera que su llegada destraba. Como el inventario y las listas de espera se mantienen
+    al día, no hace falta volver a recorrer a los pacientes que ya estaban: el costo depende solo de
+    la cantidad de pacientes nuevos (y de centros), no del tamaño del registro.
+
+    params:
+        - limite_segundos: Tiempo máximo de procesamiento (opcional). Se revisa entre paciente y paciente; los
+          que no llegan a procesarse quedan pendientes para la próxima llamada.
+
+    returns:
+        La cantidad de trasplantes que se realizaron (vehículo despachado y cirugía asignada).
+        """
+        fin = time.perf_counter() + limite_segundos if limite_segundos is not None else None
+        nuevos = []
+        for centro in self.centros_salud:
+            desde = self._procesados_por_centro.get(centro, 0)
+            nuevos.extend((centro, posicion, paciente) for posicion, paciente in enumerate(centro.lista_pacientes[desde:], desde))
+            self._procesados_por_centro[centro] = len(centro.lista_pacientes)
+
+        trasplantes = 0
+        for i, (centro, posicion, paciente) in enumerate(nuevos):
+            if fin is not None and time.perf_counter() >= fin:
+                for centro_pendiente, posicion_pendiente, _ in reversed(nuevos[i:]): #queda el primero sin procesar de cada centro
+                    self._procesados_por_centro[centro_pendiente] = posicion_pendiente
+                break
+
+            if isinstance(paciente, Receptores):
+                if paciente not in self.registro_dni:
+                    self.registrar_receptor(paciente)
+                entrada = None if paciente.organos_a_disposicion else self.buscar_compatibilidad_receptor_a_donante(paciente)
+                if entrada is not None and self._trasplantar(*entrada, paciente, centro):
+                    trasplantes += 1
+
+            elif isinstance(paciente, Donantes):
+                if paciente not in self.registro_dni:
+                    self.registrar_donante(paciente)
+                trasplantes += self._ofrecer_organos(paciente, centro) #cada organo del donante puede destrabar a otro receptor en espera
+
+            else:
+                raise ValueError("El paciente debe ser un receptor o un donante.")
+
+        return trasplantes
+
+    def _registrar_nuevos(self):
+        """
+        Método auxiliar que registra a los pacientes de los centros que todavía no están en el registro (los que ya
+        se registraron, por ejemplo con clasificar_centros_salud o cargar_almacen, no se vuelven a agregar) y deja
+        a todos como procesados.
+        """
+        for centro in self.centros_salud:
+            for paciente in centro.lista_pacientes:
+                if paciente in self.registro_dni:
+                    continue
+                if isinstance(paciente, Receptores):
+                    self.registrar_receptor(paciente)
+                elif isinstance(paciente, Donantes):
+                    self.registrar_donante(paciente)
+                else:
+                    raise ValueError("El paciente debe ser un receptor o un donante.")
+            self._procesados_por_centro[centro] = len(centro.lista_pacientes)
 
-    def buscar_compatibilidad_receptor_a_donante(self, receptor: Receptores):  # Verificar si el órgano que el receptor necesita está en la lista de órganos que el donante puede donar    
+    def clasificar_centros_salud_global(self):
+        """
+    Alternativa por lotes a clasificar_centros_salud: registra a los pacientes de los centros que todavía no
+    estaban registrados y después asigna los órganos disponibles a los receptores en espera buscando el mayor puntaje total
+    (prioridad del receptor, horas de traslado y límite de isquemia), sin depender del orden de las listas.
+
+    Cada órgano sale en un vehículo del centro del donante y la cirugía se hace en el centro del receptor.
+
+    returns:
+        Un diccionario con la cantidad de asignaciones, el puntaje total de la asignación global y el
+        puntaje que hubiera obtenido clasificar_centros_salud con los mismos pacientes, para compararlos.
+        """
+        motor = AsignacionGlobal(self.reloj.ahora(), estricto=self.compatibilidad_estricta, matriz_distancias=self.matriz_distancias)
+        puntaje_greedy = motor.puntaje_total(motor.simular_greedy(self.centros_salud))
+
+        self._registrar_nuevos()
+        asignaciones = motor.resolver(self.listas_espera.receptores_en_espera(), self.inventario_organos.organos_disponibles())
+        puntaje_global = motor.puntaje_total(asignaciones)
+
+        for receptor, donante, organo in asignaciones:
+            self._trasplantar(donante, organo, receptor, receptor.centro_de_salud)
+            if not donante.organos_a_donar:
+                self.quitar_donante(donante)
+
+        return {
+            "asignaciones": len(asignaciones),
+            "puntaje_global": puntaje_global,
+            "puntaje_greedy": puntaje_greedy,
+        }
+
+    def clasificar_centros_salud_por_provincia(self, procesos: int = None, particion: str = "provincia") -> dict:
+        """
+    Alternativa en paralelo a clasificar_centros_salud para registros grandes: los centros se reparten por
+    provincia (ver AsignacionProvincial) y cada región procesa sus pacientes pendientes en un proceso aparte,
+    con la misma regla que clasificar_centros_salud: emparejamiento, traslados con los vehículos de la región
+    y cirugías con sus cirujanos. Después, los órganos que sobraron en su región se ofrecen a los receptores
+    que siguen en espera en todo el país.
+
+    Cada región recibe su parte de la matriz de distancias, sin recalcularla. Su proceso junta lo que cambió
+    (altas, trasplantes con su cirugía, traslados y bajas de donantes) en tuplas compactas (ver ResumenRegion) que
+    al volver se aplican de una vez sobre los pacientes de este proceso, y se guardan en el almacén de INCUCAI si
+    lo hay. Si INCUCAI tiene diario, el proceso también anota sus eventos y las líneas se pasan al diario tal
+    cual. Los sorteos de cada región salen de una semilla tomada del random global, asi el resultado no depende
+    de la cantidad de procesos.
+
+    params:
+        - procesos: Cantidad de procesos trabajadores (por defecto, los núcleos disponibles).
+        - particion: "provincia" o "partido" (ver AsignacionProvincial).
+
+    returns:
+        Un diccionario con la cantidad de regiones, las asignaciones dentro de cada región y las que
+        se hicieron en la conciliación nacional.
+        """
+        motor = AsignacionProvincial(procesos, particion)
+        regiones = list(motor.particionar(self.centros_salud).values())
+        donantes = set(self.lista_donantes)
+        trabajos, pesos, pendientes = [], [], {}
+        for centros in regiones:
+            procesados = [self._procesados_por_centro.get(centro, 0) for centro in centros]
+            en_espera, con_organos, registrados = [], [], set()
+            for centro, desde in zip(centros, procesados):
+                for paciente in centro.lista_pacientes[:desde]: #lo que la region ya tenia registrado
+                    if isinstance(paciente, Receptores) and paciente in self.listas_espera:
+                        en_espera.append(paciente)
+                    elif isinstance(paciente, Donantes) and paciente in donantes:
+                        con_organos.append(paciente)
+                for paciente in centro.lista_pacientes[desde:]:
+                    pendientes[paciente.DNI] = paciente
+                    if paciente in self.registro_dni: #pendiente pero ya registrado: no se vuelve a dar de alta
+                        registrados.add(paciente.DNI)
+            trabajos.append((centros, procesados, en_espera, con_organos, self.compatibilidad_estricta, self.reloj,
+                             random.getrandbits(64), self.matriz_distancias.submatriz(centros), registrados,
+                             self.diario is not None))
+            pesos.append(sum(len(centro.lista_pacientes) for centro in centros) - sum(procesados))
+
+        claves = self.diario #los objetos de los eventos se buscan por la clave con la que los nombro el proceso
+        if claves is None:
+            claves = DiarioEventos(None)
+            for centro in self.centros_salud:
+                centro.nombrar_en_diario(claves)
+        nombres = {centro.nombre: centro for centro in self.centros_salud}
+        diario = self.diario
+        self._conectar_diario(None) #los eventos ya vienen anotados por la region, se pasan al diario tal cual
+        asignaciones = 0
+        try:
+            for posicion, resultado in motor.repartir(INCUCAI._clasificar_region, trabajos, pesos):
+                asignaciones += self._aplicar_region(resultado, nombres, pendientes, claves, diario)
+                for centro in regiones[posicion]:
+                    self._procesados_por_centro[centro] = len(centro.lista_pacientes)
+        finally:
+            self._conectar_diario(diario)
+
+        #conciliacion: lo que quedo en el inventario no tenia receptor en su region, se busca en todo el pais
+        conciliadas = 0
+        for donante in list(self.lista_donantes):
+            conciliadas += self._ofrecer_organos(donante)
+
+        return {
+            "regiones": len(regiones),
+            "asignaciones": asignaciones,
+            "conciliadas": conciliadas,
+        }
+
+    @staticmethod
+    def _clasificar_region(trabajo: tuple) -> tuple:
+        """
+        Método auxiliar que corre en cada proceso trabajador (ver clasificar_centros_salud_por_provincia): arma un
+        INCUCAI solo con los centros de una región (con su parte de la matriz de distancias), sus receptores en
+        espera y sus donantes con órganos, procesa los pacientes pendientes con clasificar_centros_salud y devuelve
+        lo que cambió, como tuplas compactas (ver ResumenRegion.resultado).
+        """
+        centros, procesados, en_espera, donantes, estricto, reloj, semilla, matriz, registrados, lineas = trabajo
+        random.seed(semilla) #los traslados y las cirugias usan el random global
+        region = INCUCAI(centros, estricto, reloj=reloj, matriz_distancias=matriz)
+        for receptor in en_espera:
+            region.registrar_receptor(receptor)
+        for donante in donantes:
+            region.registrar_donante(donante)
+        region._procesados_por_centro.update(zip(centros, procesados))
+
+        resumen = ResumenRegion(registrados, lineas)
+        region._conectar_diario(resumen)
+        region.clasificar_centros_salud()
+        return resumen.resultado()
+
+    def _aplicar_region(self, resultado: tuple, centros: dict, pacientes: dict, claves: DiarioEventos, diario: DiarioEventos) -> int:
+        """
+        Método auxiliar que aplica lo que cambió en una región (ver _clasificar_region) sobre los pacientes de este
+        proceso: primero las altas, después cada trasplante con su cirugía, los traslados y las bajas de donantes.
+        Las líneas del diario de la región pasan al diario sin volver a codificarse. Devuelve la cantidad de órganos
+        asignados.
+        """
+        registrados, trasplantes, traslados, quitados, lineas = resultado
+        for dni in registrados:
+            paciente = pacientes[dni]
+            if isinstance(paciente, Receptores):
+                self.registrar_receptor(paciente)
+            else:
+                self.registrar_donante(paciente)
+
+        buscar = self.registro_dni.buscar
+        for dni_receptor, dni_donante, posicion, fecha_ablacion, cirugia in trasplantes:
+            donante, receptor = buscar(dni_donante)[0], buscar(dni_receptor)[0]
+            self._asignar_organo(donante, donante.organos_a_donar[posicion], receptor, fecha_ablacion)
+            if cirugia is not None:
+                nombre, clave, fecha, exitosa = cirugia
+                centro, cirujano = centros[nombre], claves.objeto(clave)
+                if fecha is not None: #llego a operar y paso a recuperacion
+                    cirujano.ultima_cirugia = fecha
+                    cirujano.disponibilidad = "Ocupado"
+                centro.plantel.devolver(cirujano)
+                (centro.pacientes_exitosos if exitosa else centro.pacientes_fallidos).append(receptor)
+                self._actualizar_estado(receptor, RegistroDNI.EXITOSO if exitosa else RegistroDNI.FALLIDO, centro)
+
+        for clave, distancia, nivel_trafico, tiempo in traslados:
+            claves.objeto(clave).registro_viajes.agregar(distancia, nivel_trafico, tiempo)
+        for dni in quitados:
+            self.quitar_donante(buscar(dni)[0])
+        if diario is not None and lineas:
+            diario.agregar_lineas(lineas)
+        return len(trasplantes)
+
+    def estimar_resultados(self, simulaciones: int = 10_000, semilla: int = None, asignaciones: list = None) -> dict:
+        """
+    Estima, sin operar a nadie, la distribución de cirugías exitosas de una ronda de asignación repitiéndola
+    con SimulacionMontecarlo. Sirve para comparar tasas de éxito esperadas por centro y por especialidad.
+
+    params:
+        - simulaciones: Cantidad de repeticiones de la ronda.
+        - semilla: Semilla para repetir los resultados (opcional).
+        - asignaciones: Tuplas (receptor, donante, organo) de la ronda. Por defecto, las que haría
+          clasificar_centros_salud con los pacientes de los centros (la cirugía se cuenta en el centro del receptor).
+
+    returns:
+        El diccionario de SimulacionMontecarlo.simular.
+        """
+        motor = AsignacionGlobal(self.reloj.ahora(), estricto=self.compatibilidad_estricta, matriz_distancias=self.matriz_distancias)
+        if asignaciones is None:
+            asignaciones = motor.simular_greedy(self.centros_salud)
+        return SimulacionMontecarlo(motor, simulaciones, semilla, self.planificador, self.reloj).simular(asignaciones)
+
+    def buscar_compatibilidad_receptor_a_donante(self, receptor: Receptores) -> tuple[Donantes, Organos] | None:  # Verificar si el órgano que el receptor necesita está en la lista de órganos que el donante puede donar    
             """
-            Busca donantes compatibles para un receptor dado y realiza la transferencia del órgano si es posible.
+            Busca un órgano compatible para un receptor dado, sin asignarlo: el órgano se asigna recién cuando hay un
+            traslado desde el centro del donante que llega a tiempo (ver _trasplantar).
 
     params:
         - receptor: Un objeto Receptores que contiene la información del receptor que necesita un órgano.
     
     precon (opcional):
-        - receptor debe tener los atributos 'organo_a_recibir' (str) y 'Tsangre' (tipo de sangre).
-        - Los donantes en self.lista_donantes deben tener una lista 'organos_a_donar' con órganos disponibles.
+        - receptor debe tener los atributos 'codigo_organo' y 'codigo_sangre' (se calculan al crearlo).
+        - La compatibilidad sanguínea sigue la tabla ABO, o grupos idénticos si compatibilidad_estricta es True.
+        - Los donantes deben haberse registrado con registrar_donante, asi sus órganos figuran en el inventario.
     
     returns:
-        - True si se encontró un donante compatible y se realizó la transferencia del órgano.
-        - False si no se encontró ningún donante compatible.
+        - Una tupla (donante, organo) con el primer órgano compatible del inventario.
+        - None si no se encontró ningún donante compatible.
             """
-            #Usar estado por defecto si no está definido
-            estado_receptor = getattr(receptor, 'estado', 'estable').lower()
-
-            if estado_receptor == "inestable": #la jerarquia de busqueda de pacientes se da primero en inestables, si bien las listas se ordenan ademas de mas joven a mas viejo, es evidente que primero tiene que haber un match mas alla de la edad
-                for donante in self.lista_donantes:
-                    #Comparar correctamente con los órganos del donante
-                    for organo in donante.organos_a_donar:
-                        if (receptor.organo_a_recibir.lower() == organo.tipo_de_organo.lower() and
-                                receptor.Tsangre == donante.Tsangre):
-                            organo.fecha_ablacion = datetime.now() # setea en "0hs" la fecha de ablacion del organo
-                            receptor.organos_a_disposicion.append(organo) 
-                            donante.organos_a_donar.remove(organo) 
-                            return True 
-
-            else:  
-                for donante in self.lista_donantes:
-                    for organo in donante.organos_a_donar[:]:  # Crear copia para iterar seguro
-                        if (receptor.organo_a_recibir.lower() == organo.tipo_de_organo.lower() and
-                                receptor.Tsangre == donante.Tsangre):
-                            organo.fecha_ablacion = datetime.now()
-                            receptor.organos_a_disposicion.append(organo)
-                            donante.organos_a_donar.remove(organo)
-                            return True
-
-            return False
+            #En lugar de recorrer todos los donantes y sus organos, se consulta el inventario indexado por (organo, tipo de sangre), en todos los grupos compatibles
+            return self.inventario_organos.buscar_compatible(receptor.codigo_organo, receptor.codigo_sangre, self.compatibilidad_estricta)
 
-    def buscar_compatibilidad_donante_a_receptor(self, donante: Donantes) -> Receptores:
+    def buscar_compatibilidad_donante_a_receptor(self, donante: Donantes, descartados: set = ()) -> tuple[Receptores, Organos] | None:
             """
-            Busca receptores compatibles para un donante dado y realiza la transferencia del órgano si es posible.
+            Busca el receptor compatible de mayor prioridad para alguno de los órganos de un donante, sin asignarlo:
+            el órgano se asigna recién cuando hay un traslado que llega a tiempo (ver _trasplantar).
 
     params:
         - donante: Un objeto Donantes que contiene la información del donante y los órganos disponibles para donar.
+        - descartados: Órganos del donante que no se tienen en cuenta (opcional).
 
     precon (opcional):
         - donante debe tener una lista 'organos_a_donar' con órganos disponibles.
-        - Los receptores en self.lista_receptores deben tener los atributos 'organo_a_recibir' (str) y 'Tsangre'.
+        - Los receptores deben haberse registrado con registrar_receptor, asi figuran en las listas de espera.
 
     returns:
-        - El objeto Receptores compatible que recibió un órgano del donante.
+        - Una tupla (receptor, organo) con el receptor compatible de mayor prioridad (inestables primero, luego
+          el más joven, luego el que más espera) y el órgano del donante que necesita.
         - None si no se encontró ningún receptor compatible.
             """
             #segun la consigna, el matcheo es distinto si ingresa un receptor o un donante
-            for receptor in self.lista_receptores:
-                #Iterar sobre una copia de la lista para evitar modificar durante iteración
-                for organo in donante.organos_a_donar[:]:
-                    if (organo.tipo_de_organo.lower().__eq__(receptor.organo_a_recibir.lower()) and
-                            donante.Tsangre.__eq__(receptor.Tsangre)): #metodo magico eq (==)
-                        organo.fecha_ablacion = datetime.now() 
-                        receptor.organos_a_disposicion.append(organo)
-                        donante.organos_a_donar.remove(organo)
-
-                        if not donante.organos_a_donar:
-                            if donante in self.lista_donantes:
-                                self.lista_donantes.remove(donante)
-
-                        return receptor
-
-            return None
+            #por cada organo del donante se mira el tope de la lista de espera correspondiente y se elige al receptor de mayor prioridad
+            mejor = None
+            for organo in donante.organos_a_donar:
+                if organo in descartados:
+                    continue
+                candidato = self.listas_espera.ver_primero_compatible(organo.codigo_organo, donante.codigo_sangre, self.compatibilidad_estricta)
+                if candidato is not None and (mejor is None or candidato[0] < mejor[0]):
+                    mejor = (candidato[0], candidato[1], organo)
 
+            if mejor is None:
+                return None
+            return mejor[1], mejor[2]
@@ -0,0 +1,140 @@
+from collections import deque
+from pacientes.Donantes import Donantes
+from organos.Organos import Organos
+from pacientes.Compatibilidad_Sanguinea import grupos_donantes_compatibles
+from codigos.Codigos import TipoOrgano, GrupoSanguineo
+
+
+class InventarioOrganos:
+
+    def __init__(self):
+        """
+    Inicializa un inventario de órganos disponibles, agrupados por tipo de órgano y tipo de sangre.
+
+    Cada "balde" (bucket) es una cola con los pares (donante, organo) en el orden en que se registraron,
+    de esta forma se respeta el mismo orden que tenia la busqueda lineal sobre lista_donantes.
+    Los pares que se quitan no se borran de la cola en el momento (eso seria O(n)), sino que se
+    descartan la proxima vez que llegan al frente (borrado perezoso).
+
+    returns:
+        None. Inicializa los diccionarios internos vacíos.
+        """
+        self._baldes: dict[tuple[str, str], deque[tuple[Donantes, Organos]]] = {}
+        self._vigentes: dict[tuple[Donantes, Organos], int] = {} #cuantas veces esta vigente cada par, las copias viejas de la cola se descartan
+
+    @staticmethod
+    def clave(tipo_de_organo, Tsangre) -> tuple[TipoOrgano, GrupoSanguineo]:
+        """
+    Convierte un tipo de órgano y un tipo de sangre en la clave del inventario.
+
+    params:
+        - tipo_de_organo: Nombre del órgano (sin importar mayúsculas ni espacios) o TipoOrgano.
+        - Tsangre: Grupo sanguíneo (por ejemplo "O+") o GrupoSanguineo.
+
+    returns:
+        Una tupla (codigo de organo, codigo de sangre). Si ya se pasan códigos, no se normaliza ningún texto.
+        """
+        return (TipoOrgano.desde_texto(tipo_de_organo), GrupoSanguineo.desde_texto(Tsangre))
+
+    def agregar_organo(self, donante: Donantes, organo: Organos):
+        """
+    Registra un órgano de un donante como disponible. O(1).
+
+    params:
+        - donante: Donante dueño del órgano.
+        - organo: Órgano disponible para donar.
+        """
+        entrada = (donante, organo)
+        self._baldes.setdefault((organo.codigo_organo, donante.codigo_sangre), deque()).append(entrada)
+        self._vigentes[entrada] = self._vigentes.get(entrada, 0) + 1
+
+    def agregar_donante(self, donante: Donantes):
+        """
+    Registra todos los órganos que el donante tiene en organos_a_donar.
+
+    params:
+        - donante: Donante con su lista de organos_a_donar cargada.
+        """
+        for organo in donante.organos_a_donar:
+            self.agregar_organo(donante, organo)
+
+    def quitar_organo(self, donante: Donantes, organo: Organos):
+        """
+    Marca un órgano como no disponible (por ejemplo, porque ya fue asignado a un receptor). O(1).
+
+    params:
+        - donante: Donante dueño del órgano.
+        - organo: Órgano que deja de estar disponible.
+        """
+        entrada = (donante, organo)
+        cantidad = self._vigentes.get(entrada, 0)
+        if cantidad > 1:
+            self._vigentes[entrada] = cantidad - 1
+        elif cantidad == 1:
+            del self._vigentes[entrada]
+
+    def quitar_donante(self, donante: Donantes):
+        """
+    Quita del inventario todos los órganos que el donante todavía tiene para donar.
+
+    params:
+        - donante: Donante que se da de baja.
+        """
+        for organo in donante.organos_a_donar:
+            self.quitar_organo(donante, organo)
+
+    def buscar(self, tipo_de_organo, Tsangre) -> tuple[Donantes, Organos] | None:
+        """
+    Devuelve el primer órgano disponible del tipo y grupo sanguíneo pedidos, sin quitarlo del inventario.
+
+    params:
+        - tipo_de_organo: Órgano que se necesita (nombre o TipoOrgano).
+        - Tsangre: Grupo sanguíneo del receptor (texto o GrupoSanguineo).
+
+    returns:
+        Una tupla (donante, organo) si hay un órgano compatible, o None si no hay ninguno.
+        O(1) amortizado: las entradas ya quitadas se descartan una sola vez.
+        """
+        cola = self._baldes.get(self.clave(tipo_de_organo, Tsangre))
+        while cola:
+            entrada = cola[0]
+            if entrada in self._vigentes:
+                return entrada
+            cola.popleft()
+        return None
+
+    def buscar_compatible(self, tipo_de_organo, Tsangre_receptor, estricto: bool = False) -> tuple[Donantes, Organos] | None:
+        """
+    Devuelve el primer órgano disponible de ese tipo de cualquier grupo sanguíneo compatible con el receptor,
+    sin quitarlo del inventario. Se revisa primero el balde del mismo grupo y después los demás grupos
+    compatibles de menos a más universal (asi los órganos O- se guardan para quien solo puede recibir O-).
+
+    params:
+        - tipo_de_organo: Órgano que se necesita (nombre o TipoOrgano).
+        - Tsangre_receptor: Grupo sanguíneo del receptor (texto o GrupoSanguineo).
+        - estricto: Si es True, solo se busca en el balde del mismo grupo sanguíneo.
+
+    returns:
+        Una tupla (donante, organo) si hay un órgano compatible, o None si no hay ninguno.
+        """
+        tipo_de_organo = TipoOrgano.desde_texto(tipo_de_organo)
+        for grupo in grupos_donantes_compatibles(Tsangre_receptor, estricto):
+            entrada = self.buscar(tipo_de_organo, grupo)
+            if entrada is not None:
+                return entrada
+        return None
+
+    def organos_disponibles(self) -> list[tuple[Donantes, Organos]]:
+        """
+    Devuelve todos los pares (donante, organo) que siguen disponibles en el inventario.
+
+    returns:
+        Una lista de tuplas (donante, organo), en el orden en que se registraron.
+        """
+        return list(self._vigentes)
+
+    def __len__(self):
+        """
+        Método mágico que devuelve la cantidad de órganos disponibles en el inventario.
+        """
+        return len(self._vigentes)
@@ -0,0 +1,152 @@
+import heapq
+from itertools import count
+from pacientes.Receptores import Receptores
+from incucai.Inventario_Organos import InventarioOrganos
+from pacientes.Compatibilidad_Sanguinea import grupos_receptores_compatibles
+from codigos.Codigos import TipoOrgano
+
+
+def prioridad_receptor(receptor: Receptores) -> tuple[int, int, object]:
+    """
+    Calcula la clave de prioridad de un receptor (menor clave = mayor prioridad).
+
+    params:
+        - receptor: Objeto Receptores con 'estado', 'nacimiento' y 'fecha_en_espera'.
+
+    returns:
+        Una tupla (estado, edad, espera): primero los inestables, despues el mas joven
+        (fecha de nacimiento mas reciente) y por ultimo el que lleva mas tiempo en espera.
+        Es la misma regla que usa el menu para listar receptores por centro.
+    """
+    inestable = 0 if getattr(receptor, 'estado', 'estable').lower() == 'inestable' else 1
+    return (inestable, -receptor.nacimiento.toordinal(), receptor.fecha_en_espera)
+
+
+class ListasEspera:
+
+    def __init__(self):
+        """
+    Inicializa las listas de espera de receptores, una cola de prioridad (heap) por cada
+    par (organo, tipo de sangre).
+
+    Las bajas y los cambios de prioridad son perezosos: cada receptor tiene una version vigente
+    y las entradas del heap con otra version se descartan cuando llegan al tope.
+
+    returns:
+        None. Inicializa los diccionarios internos vacíos.
+        """
+        self._heaps: dict[tuple[str, str], list[tuple]] = {}
+        self._versiones: dict[Receptores, int] = {} #receptor -> version vigente de su entrada en el heap
+        self._contador = count() #desempata entradas con la misma prioridad, asi nunca se comparan receptores
+
+    def agregar(self, receptor: Receptores):
+        """
+    Agrega un receptor a la lista de espera del órgano que necesita. O(log n).
+    Si ya estaba en espera, se actualiza su prioridad.
+
+    params:
+        - receptor: Receptor que espera un órgano.
+        """
+        version = next(self._contador)
+        self._versiones[receptor] = version
+        clave = (receptor.codigo_organo, receptor.codigo_sangre)
+        heapq.heappush(self._heaps.setdefault(clave, []), (prioridad_receptor(receptor), version, receptor))
+
+    def actualizar(self, receptor: Receptores):
+        """
+    Recalcula la prioridad de un receptor en espera (por ejemplo, si cambió su estado).
+
+    params:
+        - receptor: Receptor cuya prioridad cambió.
+        """
+        if receptor in self._versiones:
+            self.agregar(receptor)
+
+    def quitar(self, receptor: Receptores):
+        """
+    Saca a un receptor de la lista de espera. O(1), la entrada vieja se descarta despues.
+
+    params:
+        - receptor: Receptor que deja de esperar (porque recibió un órgano o se dio de baja).
+        """
+        self._versiones.pop(receptor, None)
+
+    def ver_primero(self, tipo_de_organo, Tsangre) -> tuple[tuple, Receptores] | None:
+        """
+    Devuelve el receptor de mayor prioridad que espera ese órgano con ese tipo de sangre, sin sacarlo.
+
+    params:
+        - tipo_de_organo: Órgano disponible (nombre o TipoOrgano).
+        - Tsangre: Grupo sanguíneo del donante (texto o GrupoSanguineo).
+
+    returns:
+        Una tupla (clave, receptor) donde la clave permite comparar receptores de distintas listas,
+        o None si no hay nadie esperando.
+        """
+        heap = self._heaps.get(InventarioOrganos.clave(tipo_de_organo, Tsangre))
+        while heap:
+            prioridad, version, receptor = heap[0]
+            if self._versiones.get(receptor) == version:
+                return (prioridad, version), receptor
+            heapq.heappop(heap)
+        return None
+
+    def ver_primero_compatible(self, tipo_de_organo, Tsangre_donante, estricto: bool = False) -> tuple[tuple, Receptores] | None:
+        """
+    Devuelve el receptor de mayor prioridad que espera ese órgano entre todos los grupos sanguíneos
+    que pueden recibir del donante, sin sacarlo.
+
+    params:
+        - tipo_de_organo: Órgano disponible (nombre o TipoOrgano).
+        - Tsangre_donante: Grupo sanguíneo del donante (texto o GrupoSanguineo).
+        - estricto: Si es True, solo se mira la lista del mismo grupo sanguíneo.
+
+    returns:
+        Una tupla (clave, receptor) o None si no hay nadie esperando.
+        """
+        mejor = None
+        tipo_de_organo = TipoOrgano.desde_texto(tipo_de_organo)
+        for grupo in grupos_receptores_compatibles(Tsangre_donante, estricto):
+            candidato = self.ver_primero(tipo_de_organo, grupo)
+            if candidato is not None and (mejor is None or candidato[0] < mejor[0]):
+                mejor = candidato
+        return mejor
+
+    def sacar_primero(self, tipo_de_organo, Tsangre) -> Receptores | None:
+        """
+    Saca y devuelve el receptor de mayor prioridad que espera ese órgano. O(log n).
+
+    params:
+        - tipo_de_organo: Órgano disponible (nombre o TipoOrgano).
+        - Tsangre: Grupo sanguíneo del donante (texto o GrupoSanguineo).
+
+    returns:
+        El receptor de mayor prioridad, o None si no hay nadie esperando.
+        """
+        primero = self.ver_primero(tipo_de_organo, Tsangre)
+        if primero is None:
+            return None
+        receptor = primero[1]
+        self.quitar(receptor)
+        return receptor
+
+    def receptores_en_espera(self) -> list[Receptores]:
+        """
+    Devuelve todos los receptores que siguen esperando un órgano.
+
+    returns:
+        Una lista de receptores, en el orden en que se agregaron por última vez.
+        """
+        return list(self._versiones)
+
+    def __contains__(self, receptor: Receptores):
+        """
+        Método mágico que indica si el receptor está en alguna lista de espera.
+        """
+        return receptor in self._versiones
+
+    def __len__(self):
+        """
+        Método mágico que devuelve la cantidad de receptores en espera.
+        """
+        return len(self._versiones)
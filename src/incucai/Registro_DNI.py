@@ -0,0 +1,103 @@
+from pacientes.Receptores import Receptores
+from pacientes.Donantes import Donantes
+
+
+class RegistroDNI:
+
+    EXITOSO = "exitoso"
+    FALLIDO = "fallido"
+    EN_PROCESO = "en proceso" #el receptor ya tiene un organo a disposicion, falta la cirugia
+    EN_ESPERA = "en espera"
+    DONANTE = "donante"
+
+    def __init__(self):
+        """
+    Inicializa el registro de pacientes por DNI, que guarda para cada DNI el paciente y el estado
+    actual de su trasplante. Permite buscar un paciente y detectar DNIs repetidos en O(1).
+
+    returns:
+        None. Inicializa el diccionario interno vacío.
+        """
+        self._por_dni: dict[int, tuple] = {} #dni -> (paciente, estado, centro donde se opero o None)
+
+    def agregar(self, paciente: Receptores | Donantes):
+        """
+    Registra un paciente con su estado inicial: donante, en proceso (si ya tiene un órgano) o en espera.
+
+    params:
+        - paciente: Receptor o donante a registrar.
+
+    precon:
+        - No debe haber otro paciente registrado con el mismo DNI.
+        """
+        registrado = self._por_dni.get(paciente.DNI)
+        if registrado is not None and registrado[0] is not paciente:
+            raise ValueError(f"Ya existe un paciente registrado con DNI {paciente.DNI}.")
+
+        if isinstance(paciente, Donantes):
+            estado = self.DONANTE
+        elif paciente.organos_a_disposicion:
+            estado = self.EN_PROCESO
+        else:
+            estado = self.EN_ESPERA
+        self._por_dni[paciente.DNI] = (paciente, estado, None)
+
+    def actualizar_estado(self, paciente: Receptores | Donantes, estado: str, centro=None):
+        """
+    Cambia el estado del trasplante de un paciente ya registrado.
+
+    params:
+        - paciente: Paciente registrado.
+        - estado: Uno de los estados de la clase (EXITOSO, FALLIDO, EN_PROCESO, EN_ESPERA, DONANTE).
+        - centro: CentroSalud donde se realizó la cirugía (solo para EXITOSO y FALLIDO).
+        """
+        self._por_dni[paciente.DNI] = (paciente, estado, centro)
+
+    def buscar(self, dni: int) -> tuple | None:
+        """
+    Busca un paciente por DNI.
+
+    params:
+        - dni: Número de documento.
+
+    returns:
+        Una tupla (paciente, estado, centro) o None si no hay ningún paciente con ese DNI.
+        El centro es donde se operó al paciente, solo si el estado es exitoso o fallido.
+        """
+        return self._por_dni.get(dni)
+
+    def contar_por_estado(self) -> dict[str, int]:
+        """
+        Método auxiliar que devuelve cuántos pacientes hay en cada estado (solo los estados con algún paciente).
+        """
+        cantidades = {}
+        for _, estado, _ in self._por_dni.values():
+            cantidades[estado] = cantidades.get(estado, 0) + 1
+        return cantidades
+
+    def es_donante(self, dni: int) -> bool:
+        """
+        Método auxiliar que indica si el DNI corresponde a un donante registrado.
+        """
+        registrado = self._por_dni.get(dni)
+        return registrado is not None and isinstance(registrado[0], Donantes)
+
+    def es_receptor(self, dni: int) -> bool:
+        """
+        Método auxiliar que indica si el DNI corresponde a un receptor registrado.
+        """
+        registrado = self._por_dni.get(dni)
+        return registrado is not None and isinstance(registrado[0], Receptores)
+
+    def __contains__(self, paciente: Receptores | Donantes):
+        """
+        Método mágico que indica si ese mismo paciente (no solo su DNI) está registrado.
+        """
+        registrado = self._por_dni.get(paciente.DNI)
+        return registrado is not None and registrado[0] is paciente
+
+    def __len__(self):
+        """
+        Método mágico que devuelve la cantidad de pacientes registrados.
+        """
+        return len(self._por_dni)
@@ -0,0 +1,193 @@
+import numpy as np
+from pacientes.Receptores import Receptores
+from pacientes.Donantes import Donantes
+from organos.Organos import Organos
+from cirujanos.Plantel_Cirujanos import PlantelCirujanos
+from incucai.Asignacion_Global import AsignacionGlobal
+from vehiculos.Auto import Auto
+from reloj.Reloj import RELOJ_REAL
+
+
+class SimulacionMontecarlo:
+
+    TRAFICO_MAXIMO_AUTO = 3 #Auto.despachar suma rnd.randint(0, 3) horas de trafico
+    CELDAS_POR_LOTE = 4_000_000 #simulaciones x cirugias que se sortean de una vez, acota la memoria
+
+    def __init__(self, motor: AsignacionGlobal, simulaciones: int = 10_000, semilla: int = None, planificador=None, reloj=None):
+        """
+    Estima la distribución de resultados de una ronda de asignación repitiéndola muchas veces.
+
+    La parte determinística de la ronda (qué cirujano opera a cada receptor y cuánto tarda el traslado sin
+    contar el tráfico, más las horas que ya pasaron desde la ablación) se arma una sola vez, igual que la
+    haría el sistema. Después se sortean juntas, con
+    NumPy, todas las tiradas de éxito de realizar_cirujia y el tráfico de los autos para todas las
+    simulaciones, sin llamar a los métodos de Python de cada cirugía.
+
+    params:
+        - motor: AsignacionGlobal que se usa para estimar los tiempos de traslado y el límite de isquemia.
+        - simulaciones: Cantidad de veces que se repite la ronda.
+        - semilla: Semilla del generador de NumPy (opcional), para repetir los resultados.
+        - planificador: PlanificadorRutas con el que se estiman los traslados entre centros con coordenadas,
+          como en INCUCAI._trasplantar (opcional; sin él se usa el tiempo estimado del motor).
+        - reloj: Reloj con el que se cuentan las horas desde la ablación (por defecto, el reloj de pared).
+        """
+        if simulaciones < 1:
+            raise ValueError("La cantidad de simulaciones debe ser al menos 1.")
+        self.motor = motor
+        self.simulaciones = simulaciones
+        self.semilla = semilla
+        self.planificador = planificador
+        self.reloj = reloj or RELOJ_REAL
+
+    @staticmethod
+    def _elegir_cirujano(disponibles: list, codigo_organo):
+        """
+        Método auxiliar que elige de una lista de cirujanos disponibles al mismo que elegiría
+        PlantelCirujanos.mejor_para_organo (especialista, general u otro, el primero de la lista).
+        """
+        for especialidades in PlantelCirujanos.PREFERENCIAS_POR_ORGANO[codigo_organo]:
+            for cirujano in disponibles:
+                if cirujano.codigo_especialidad in especialidades:
+                    return cirujano
+        return None
+
+    def _estimar_traslado(self, origen, destino, transcurridas: float) -> tuple[float, int] | None:
+        """
+        Método auxiliar que estima un traslado igual que INCUCAI._trasplantar: con el plan de PlanificadorRutas si
+        los centros tienen distancia y, si no, con el vehículo según partido y provincia. Devuelve las horas
+        estimadas sin el tráfico de los autos y la cantidad de tramos en auto (cada uno sortea su tráfico), o None
+        si ningún traslado llega a tiempo.
+        """
+        if self.planificador is not None and self.planificador.matriz_distancias.distancia(origen, destino) is not None:
+            plan = self.planificador.planificar(origen, destino, transcurridas)
+            if plan is None:
+                return None
+            horas, tramos = plan
+            autos = sum(1 for tramo in tramos if tramo[0] is Auto)
+            return horas - autos * origen.TRAFICO_ESTIMADO_AUTO, autos
+
+        horas = self.motor.horas_traslado(origen, destino)
+        if horas is None:
+            return None
+        if origen.clase_de_traslado(destino.partido, destino.provincia) is Auto:
+            return horas - origen.TRAFICO_ESTIMADO_AUTO, 1
+        return horas, 0
+
+    def armar_ronda(self, asignaciones: list[tuple[Receptores, Donantes, Organos]]) -> dict:
+        """
+    Arma la parte determinística de una ronda: para cada asignación, el centro donde se opera (el del
+    receptor), el cirujano que la haría (cada cirujano opera una sola vez por ronda, después queda en
+    recuperación) y las horas que llevará el órgano al llegar: las que ya pasaron desde la ablación (cero si
+    todavía no se hizo) más las del traslado.
+
+    params:
+        - asignaciones: Lista de tuplas (receptor, donante, organo), por ejemplo de AsignacionGlobal.resolver
+          o AsignacionGlobal.simular_greedy.
+
+    returns:
+        Un diccionario con las columnas de las cirugías que se pueden hacer (centro, especialidad, umbral,
+        horas sin el tráfico, autos: tramos en auto que sortean tráfico) y la cantidad de asignaciones sin traslado posible o sin cirujano, por centro.
+        """
+        disponibles = {} #centro -> cirujanos que todavia pueden operar en esta ronda
+        ronda = {'centro': [], 'especialidad': [], 'umbral': [], 'horas': [], 'autos': [],
+                 'sin_traslado': {}, 'sin_cirujano': {}}
+        for receptor, donante, organo in asignaciones:
+            centro, origen = receptor.centro_de_salud, donante.centro_de_salud
+            transcurridas = self.reloj.horas_desde(organo.fecha_ablacion) if organo.fecha_ablacion is not None else 0.0
+            traslado = self._estimar_traslado(origen, centro, transcurridas)
+            if traslado is None:
+                ronda['sin_traslado'][centro.nombre] = ronda['sin_traslado'].get(centro.nombre, 0) + 1
+                continue
+            if centro not in disponibles:
+                disponibles[centro] = centro.obtener_cirujanos_disponibles()
+            cirujano = self._elegir_cirujano(disponibles[centro], organo.codigo_organo)
+            if cirujano is None:
+                ronda['sin_cirujano'][centro.nombre] = ronda['sin_cirujano'].get(centro.nombre, 0) + 1
+                continue
+            disponibles[centro].remove(cirujano)
+
+            horas, autos = traslado
+            ronda['centro'].append(centro.nombre)
+            ronda['especialidad'].append(cirujano.especialidad)
+            ronda['umbral'].append(cirujano.umbral_exito(organo.codigo_organo))
+            ronda['horas'].append(transcurridas + horas) #el trafico se sortea
+            ronda['autos'].append(autos)
+        return ronda
+
+    def _sortear_exitos(self, ronda: dict, rng: np.random.Generator, cantidad: int) -> np.ndarray:
+        """
+        Método auxiliar que sortea `cantidad` repeticiones de la ronda y devuelve una matriz booleana
+        (repeticiones x cirugías) con True donde la cirugía fue exitosa.
+        """
+        umbrales = np.asarray(ronda['umbral'], dtype=np.int8)
+        tiradas = rng.integers(1, 11, size=(cantidad, len(umbrales)), dtype=np.int8) #rnd.randint(1, 10)
+        exitos = tiradas >= umbrales
+
+        horas = np.asarray(ronda['horas'], dtype=float)
+        autos = np.asarray(ronda['autos'], dtype=int)
+        exitos[:, (autos == 0) & (horas > self.motor.LIMITE_ISQUEMIA)] = False
+        for tramos in np.unique(autos[autos > 0]): #el trafico de cada tramo en auto se sortea por separado
+            columnas = autos == tramos
+            trafico = rng.integers(0, self.TRAFICO_MAXIMO_AUTO + 1, size=(cantidad, int(columnas.sum()), int(tramos))).sum(axis=2)
+            exitos[:, columnas] &= (horas[columnas] + trafico) <= self.motor.LIMITE_ISQUEMIA
+        return exitos
+
+    @staticmethod
+    def _resumir(exitos: np.ndarray, cirugias: int) -> dict:
+        """
+        Método auxiliar que resume los éxitos de un grupo en todas las simulaciones: promedio, tasa de éxito,
+        desvío, intervalo del 95% y distribución (probabilidad de cada cantidad de éxitos).
+        """
+        inferior, superior = np.percentile(exitos, [2.5, 97.5])
+        promedio = float(exitos.mean())
+        return {
+            'cirugias': cirugias,
+            'exitos_promedio': promedio,
+            'tasa_exito': promedio / cirugias if cirugias else None,
+            'desvio': float(exitos.std()),
+            'intervalo_95': (float(inferior), float(superior)),
+            'distribucion': (np.bincount(exitos, minlength=cirugias + 1) / len(exitos)).tolist(),
+        }
+
+    def simular(self, asignaciones: list[tuple[Receptores, Donantes, Organos]]) -> dict:
+        """
+    Repite una ronda de asignación `simulaciones` veces y resume los resultados.
+
+    params:
+        - asignaciones: Lista de tuplas (receptor, donante, organo) de la ronda.
+
+    returns:
+        Un diccionario con:
+            - 'simulaciones' y 'cirugias': cuántas repeticiones y cuántas cirugías por ronda.
+            - 'total': resumen de éxitos de toda la ronda.
+            - 'por_centro' y 'por_especialidad': resumen de éxitos de cada grupo (ver _resumir).
+            - 'sin_traslado' y 'sin_cirujano': asignaciones que no llegan a operarse, por centro.
+        """
+        ronda = self.armar_ronda(asignaciones)
+        cirugias = len(ronda['umbral'])
+        resultado = {'simulaciones': self.simulaciones, 'cirugias': cirugias,
+                     'sin_traslado': ronda['sin_traslado'], 'sin_cirujano': ronda['sin_cirujano']}
+
+        agrupaciones = {}
+        for nombre, claves in (('por_centro', ronda['centro']), ('por_especialidad', ronda['especialidad'])):
+            grupos, indices = np.unique(np.asarray(claves, dtype=str), return_inverse=True) if claves else (np.empty(0, dtype=str), np.empty(0, dtype=int))
+            orden = np.argsort(indices, kind='stable') #columnas ordenadas por grupo, para sumar cada grupo con reduceat
+            inicios = np.searchsorted(indices[orden], np.arange(len(grupos)))
+            agrupaciones[nombre] = (grupos, orden, inicios, np.zeros((self.simulaciones, len(grupos)), dtype=np.int32))
+        totales = np.zeros(self.simulaciones, dtype=np.int32)
+
+        rng = np.random.default_rng(self.semilla)
+        lote = max(1, self.CELDAS_POR_LOTE // max(cirugias, 1))
+        for desde in range(0, self.simulaciones, lote):
+            hasta = min(desde + lote, self.simulaciones)
+            exitos = self._sortear_exitos(ronda, rng, hasta - desde)
+            totales[desde:hasta] = exitos.sum(axis=1)
+            for grupos, orden, inicios, suma in agrupaciones.values():
+                if len(grupos):
+                    suma[desde:hasta] = np.add.reduceat(exitos[:, orden].astype(np.int32), inicios, axis=1)
+
+        resultado['total'] = self._resumir(totales, cirugias)
+        for nombre, (grupos, orden, inicios, suma) in agrupaciones.items():
+            tamaños = np.diff(np.append(inicios, cirugias))
+            resultado[nombre] = {str(grupo): self._resumir(suma[:, i], int(tamaños[i])) for i, grupo in enumerate(grupos)}
+        return resultado
@@ -0,0 +1,157 @@
+import numpy as np
+from pacientes.Receptores import Receptores
+
+
+class TablaReceptores:
+
+    INESTABLE = 0 #codigos de estado, el orden es el de prioridad
+    ESTABLE = 1
+    OTRO = 2
+    CAPACIDAD_INICIAL = 64
+
+    def __init__(self):
+        """
+    Inicializa una tabla columnar de receptores: en lugar de recorrer los objetos Receptores, cada dato
+    que se usa para filtrar y ordenar se guarda codificado en un arreglo de NumPy, una fila por receptor
+    en el mismo orden en que se registraron. Asi filtrar por centro y ordenar por prioridad se resuelve
+    con máscaras y argsort sobre los arreglos, sin llamar a Python por cada receptor.
+
+    El órgano y la sangre se guardan con los códigos de TipoOrgano y GrupoSanguineo que ya tiene el receptor;
+    el nombre del centro se traduce a un código entero con un diccionario.
+
+    returns:
+        None. Inicializa los arreglos vacíos con una capacidad inicial que se duplica cuando se llena.
+        """
+        self.receptores: list[Receptores] = [] #objetos de cada fila, en el mismo orden que los arreglos
+        self._filas: dict[Receptores, int] = {} #receptor -> numero de fila
+        self._codigos_centro: dict[str, int] = {}
+
+        capacidad = self.CAPACIDAD_INICIAL
+        self._centro = np.empty(capacidad, dtype=np.int32)
+        self._organo = np.empty(capacidad, dtype=np.int16)
+        self._sangre = np.empty(capacidad, dtype=np.int8)
+        self._estado = np.empty(capacidad, dtype=np.int8)
+        self._nacimiento = np.empty(capacidad, dtype=np.int32) #ordinal de la fecha de nacimiento
+        self._espera = np.empty(capacidad, dtype=np.float64) #ordinal del inicio de la espera, con la hora como fraccion del dia
+
+    @staticmethod
+    def _codigo(codigos: dict[str, int], texto: str) -> int:
+        """
+        Método auxiliar que devuelve el código entero de un texto, asignándole uno nuevo si no lo tenía.
+        """
+        codigo = codigos.get(texto)
+        if codigo is None:
+            codigo = codigos[texto] = len(codigos)
+        return codigo
+
+    @staticmethod
+    def _codigo_estado(estado: str | None) -> int:
+        """
+        Método auxiliar que codifica el estado clínico del receptor (inestable, estable u otro).
+        """
+        estado = (estado or 'estable').lower()
+        if estado == 'inestable':
+            return TablaReceptores.INESTABLE
+        if estado == 'estable':
+            return TablaReceptores.ESTABLE
+        return TablaReceptores.OTRO
+
+    @staticmethod
+    def _ordinal_espera(fecha) -> float:
+        """
+        Método auxiliar que convierte la fecha de inicio de espera en un ordinal con la hora como fracción del día,
+        asi el orden entre fechas es el mismo que el de los datetime originales.
+        """
+        segundos = getattr(fecha, 'hour', 0) * 3600 + getattr(fecha, 'minute', 0) * 60 + getattr(fecha, 'second', 0)
+        return fecha.toordinal() + (segundos + getattr(fecha, 'microsecond', 0) / 1e6) / 86400
+
+    def _crecer(self):
+        """
+        Método auxiliar que duplica la capacidad de todos los arreglos (crecimiento amortizado O(1) por fila).
+        """
+        capacidad = 2 * len(self._centro)
+        for nombre in ('_centro', '_organo', '_sangre', '_estado', '_nacimiento', '_espera'):
+            viejo = getattr(self, nombre)
+            nuevo = np.empty(capacidad, dtype=viejo.dtype)
+            nuevo[:len(viejo)] = viejo
+            setattr(self, nombre, nuevo)
+
+    def _escribir(self, fila: int, receptor: Receptores):
+        """
+        Método auxiliar que codifica los datos de un receptor en una fila de los arreglos.
+        """
+        centro = receptor.centro_de_salud
+        self._centro[fila] = self._codigo(self._codigos_centro, centro.nombre.lower()) if centro is not None else -1
+        self._organo[fila] = receptor.codigo_organo
+        self._sangre[fila] = receptor.codigo_sangre
+        self._estado[fila] = self._codigo_estado(getattr(receptor, 'estado', None))
+        self._nacimiento[fila] = receptor.nacimiento.toordinal()
+        self._espera[fila] = self._ordinal_espera(receptor.fecha_en_espera)
+
+    def agregar(self, receptor: Receptores):
+        """
+    Agrega un receptor como una fila nueva de la tabla. O(1) amortizado.
+
+    params:
+        - receptor: Receptor con su centro_de_salud ya asignado.
+        """
+        fila = len(self.receptores)
+        if fila == len(self._centro):
+            self._crecer()
+        self._escribir(fila, receptor)
+        self._filas[receptor] = fila
+        self.receptores.append(receptor)
+
+    def actualizar(self, receptor: Receptores):
+        """
+    Vuelve a codificar la fila de un receptor ya registrado (por ejemplo, si cambió su estado o su centro).
+
+    params:
+        - receptor: Receptor cuyos datos cambiaron.
+        """
+        fila = self._filas.get(receptor)
+        if fila is not None:
+            self._escribir(fila, receptor)
+
+    def filas_por_centro(self, nombre_centro: str) -> np.ndarray:
+        """
+    Devuelve las filas de los receptores de un centro, ordenadas por prioridad.
+
+    params:
+        - nombre_centro: Nombre del centro de salud (sin importar mayúsculas).
+
+    returns:
+        Un arreglo con los números de fila: primero los inestables, después el más joven y por último
+        el que lleva más tiempo en espera (la misma regla que prioridad_receptor). Los empates quedan
+        en el orden de registro.
+        """
+        codigo = self._codigos_centro.get(nombre_centro.lower())
+        if codigo is None:
+            return np.empty(0, dtype=np.intp)
+        n = len(self.receptores)
+        filas = np.flatnonzero(self._centro[:n] == codigo)
+        no_inestable = self._estado[filas] != self.INESTABLE
+        orden = np.lexsort((self._espera[filas], -self._nacimiento[filas], no_inestable)) #lexsort ordena por la ultima clave primero
+        return filas[orden]
+
+    def receptores_por_centro(self, nombre_centro: str) -> tuple[list[Receptores], list[Receptores]]:
+        """
+    Separa los receptores de un centro según su estado clínico, cada grupo ordenado por prioridad.
+
+    params:
+        - nombre_centro: Nombre del centro de salud (sin importar mayúsculas).
+
+    returns:
+        Una tupla (inestables, estables) de listas de receptores. Los receptores con otro estado no se incluyen.
+        """
+        filas = self.filas_por_centro(nombre_centro)
+        estados = self._estado[filas]
+        inestables = [self.receptores[i] for i in filas[estados == self.INESTABLE]]
+        estables = [self.receptores[i] for i in filas[estados == self.ESTABLE]]
+        return inestables, estables
+
+    def __len__(self):
+        """
+        Método mágico que devuelve la cantidad de receptores en la tabla.
+        """
+        return len(self.receptores)
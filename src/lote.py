@@ -0,0 +1,181 @@
+"""
+Modo por lotes: corre una ronda de asignación sin el menú interactivo y escribe los resultados en JSON.
+
+Sirve para usar el sistema desde scripts o tareas programadas: no limpia la terminal ni pide datos por
+teclado, y los mensajes de traslados y cirugías se descartan, asi el tiempo se va en el emparejamiento.
+
+Los datos pueden salir de una foto del estado (--foto), de un escenario sintético (--generar) y de archivos
+CSV/JSONL (--datos, ver ImportadorDatos), en ese orden. Los pacientes se procesan con clasificar_centros_salud
+(--modo clasificar), con procesar_nuevos_pacientes (--modo incremental) o con clasificar_centros_salud_por_provincia
+(--modo provincia, una región por proceso; --procesos fija cuántos a la vez).
+
+Con --distancias la matriz de distancias entre centros se guarda en ese archivo y las corridas siguientes solo
+calculan las distancias de los centros nuevos o que cambiaron de coordenadas.
+
+Con --presupuesto los pacientes que no llegan a procesarse quedan pendientes. Si además se guarda una foto al
+terminar (--guardar-foto), otra corrida desde esa foto con el mismo modo los retoma con la misma regla.
+
+Uso (desde la raíz del repositorio):
+    python src/lote.py --generar 100000 --semilla 1 --salida resultado.json
+    python src/lote.py --generar 100000 --semilla 1 --distancias distancias.npz --salida resultado.json
+    python src/lote.py --datos centros.csv pacientes.jsonl --modo incremental --presupuesto 60 --salida -
+    python src/lote.py --foto estado.foto --presupuesto 60 --guardar-foto estado.foto
+    python src/lote.py --generar 100000 --modo provincia --procesos 8 --salida resultado.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import random
+import sys
+import time
+from incucai.INCUCAI import INCUCAI
+from importacion.Importador_Datos import ImportadorDatos
+from generador.Generador_Datos import GeneradorDatos
+from persistencia.Foto_Estado import FotoEstado
+
+MODOS = ("clasificar", "incremental", "provincia")
+
+
+def leer_argumentos(argumentos: list[str] = None) -> argparse.Namespace:
+    """
+    Lee y valida los argumentos de la línea de comandos.
+    """
+    parser = argparse.ArgumentParser(description="Corre una ronda de asignación de órganos sin el menú y escribe los resultados en JSON.")
+    parser.add_argument("--foto", help="foto del estado (FotoEstado) desde la que se arranca")
+    parser.add_argument("--generar", type=int, metavar="PACIENTES", help="generar un escenario sintético con esta cantidad de pacientes")
+    parser.add_argument("--centros", type=int, help="cantidad de centros del escenario sintético (por defecto, uno cada 1000 pacientes)")
+    parser.add_argument("--datos", nargs="+", default=[], metavar="ARCHIVO", help="archivos CSV o JSONL a importar, en orden")
+    parser.add_argument("--distancias", metavar="ARCHIVO",
+                        help="archivo .npz de la matriz de distancias entre centros: se reutiliza y solo se calculan los centros nuevos")
+    parser.add_argument("--rechazos", help="archivo JSONL donde se agregan los registros rechazados al importar")
+    parser.add_argument("--modo", choices=MODOS, default="clasificar")
+    parser.add_argument("--procesos", type=int, help="procesos trabajadores del modo provincia (por defecto, los núcleos disponibles)")
+    parser.add_argument("--semilla", type=int, help="semilla de los traslados, las cirugías y el escenario sintético")
+    parser.add_argument("--presupuesto", type=float, metavar="SEGUNDOS",
+                        help="tiempo máximo de procesamiento; los pacientes que no llegan quedan pendientes (ver --guardar-foto)")
+    parser.add_argument("--guardar-foto", metavar="ARCHIVO", help="guardar una foto del estado al terminar, para retomar los pendientes con --foto")
+    parser.add_argument("--detalle", action="store_true", help="incluir el estado de cada receptor en la salida")
+    parser.add_argument("--salida", default="-", help="archivo JSON de salida (por defecto, la salida estándar)")
+    args = parser.parse_args(argumentos)
+
+    if not (args.foto or args.generar or args.datos):
+        parser.error("hay que indicar de dónde salen los datos: --foto, --generar o --datos")
+    if args.generar is not None and args.generar < 1:
+        parser.error("--generar debe ser al menos 1")
+    if args.presupuesto is not None and args.presupuesto <= 0:
+        parser.error("--presupuesto debe ser positivo")
+    if args.presupuesto is not None and args.modo == "provincia":
+        parser.error("el modo provincia no admite --presupuesto: cada región se procesa entera")
+    if args.distancias and args.foto:
+        parser.error("--distancias no se usa con --foto: la foto ya trae la matriz de distancias")
+    if args.procesos is not None and (args.procesos < 1 or args.modo != "provincia"):
+        parser.error("--procesos debe ser al menos 1 y solo se usa con --modo provincia")
+    return args
+
+
+def cargar(args: argparse.Namespace) -> tuple[INCUCAI, list[dict]]:
+    """
+    Arma el INCUCAI con los datos indicados. Los pacientes importados quedan asignados a su centro, sin
+    registrar, para que los procese el modo elegido.
+
+    returns:
+        Una tupla (incucai, resumen de la importación de cada archivo).
+    """
+    if args.foto:
+        incucai = FotoEstado(args.foto).cargar()
+    else:
+        centros = []
+        if args.generar:
+            centros, _ = GeneradorDatos(args.semilla or 0).generar_escenario(args.generar, args.centros)
+        incucai = INCUCAI(centros, ruta_distancias=args.distancias)
+
+    importaciones = []
+    if args.datos:
+        importador = ImportadorDatos(incucai, args.rechazos, registrar=False)
+        for ruta in args.datos:
+            importaciones.append({"archivo": ruta} | importador.importar(ruta))
+    return incucai, importaciones
+
+
+def resumir(incucai: INCUCAI, detalle: bool) -> dict:
+    """
+    Arma el resumen de resultados: pacientes por estado, cirugías por centro y, si se pide, el estado de cada receptor.
+    """
+    resultado = {
+        "pacientes": {
+            "registrados": len(incucai.registro_dni),
+            "pendientes": incucai.pacientes_pendientes(),
+            "por_estado": incucai.registro_dni.contar_por_estado(),
+        },
+        "cirugias": {
+            "exitosas": sum(len(centro.pacientes_exitosos) for centro in incucai.centros_salud),
+            "fallidas": sum(len(centro.pacientes_fallidos) for centro in incucai.centros_salud),
+        },
+        "centros": [{"nombre": centro.nombre, "pacientes": len(centro.lista_pacientes),
+                     "exitosas": len(centro.pacientes_exitosos), "fallidas": len(centro.pacientes_fallidos)}
+                    for centro in incucai.centros_salud],
+    }
+    if detalle:
+        resultado["receptores"] = []
+        for receptor in incucai.lista_receptores:
+            _, estado, centro = incucai.registro_dni.buscar(receptor.DNI)
+            resultado["receptores"].append({"dni": receptor.DNI, "organo": receptor.organo_a_recibir, "estado": estado,
+                                            "centro": receptor.centro_de_salud.nombre if receptor.centro_de_salud else None,
+                                            "centro_cirugia": centro.nombre if centro is not None else None})
+    return resultado
+
+
+def main(argumentos: list[str] = None) -> int:
+    """
+    Corre el modo por lotes y devuelve el código de salida (0 si se pudo escribir el resultado).
+    """
+    args = leer_argumentos(argumentos)
+    inicio = time.perf_counter()
+    with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo): #los mensajes del sistema no se muestran
+        incucai, importaciones = cargar(args)
+        carga = time.perf_counter() - inicio
+
+        random.seed(args.semilla) #los traslados y las cirugias usan el random global
+        inicio_proceso = time.perf_counter()
+        reparto = None
+        if args.modo == "clasificar":
+            procesados = incucai.clasificar_centros_salud(args.presupuesto)
+        elif args.modo == "provincia":
+            pendientes = incucai.pacientes_pendientes()
+            reparto = incucai.clasificar_centros_salud_por_provincia(args.procesos)
+            procesados = pendientes - incucai.pacientes_pendientes()
+        else:
+            pendientes = incucai.pacientes_pendientes()
+            incucai.procesar_nuevos_pacientes(args.presupuesto)
+            procesados = pendientes - incucai.pacientes_pendientes()
+        proceso = time.perf_counter() - inicio_proceso
+        if args.guardar_foto:
+            FotoEstado(args.guardar_foto).guardar(incucai)
+
+    resultado = {
+        "modo": args.modo,
+        "semilla": args.semilla,
+        "presupuesto_segundos": args.presupuesto,
+        "completo": incucai.pacientes_pendientes() == 0,
+        "procesados": procesados,
+        "segundos": {"carga": round(carga, 4), "procesamiento": round(proceso, 4)},
+    }
+    if importaciones:
+        resultado["importacion"] = importaciones
+    if reparto is not None:
+        resultado["provincias"] = reparto
+    resultado |= resumir(incucai, args.detalle)
+    resultado["segundos"]["total"] = round(time.perf_counter() - inicio, 4)
+
+    if args.salida == "-":
+        json.dump(resultado, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    else:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(resultado, archivo, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,6 +8,10 @@ from centro_salud.Centro_Salud import CentroSalud
 from cirujanos.Cirujanos import Cirujanos
 from pacientes.Donantes import Donantes
 import datetime
+import os
+from persistencia.Almacen_SQLite import AlmacenSQLite
+from persistencia.Diario_Eventos import DiarioEventos
+from persistencia.Foto_Estado import FotoEstado
 from menu import menu
 
 cirujanos = [Cirujanos("Cardiovascular"),
@@ -24,10 +28,10 @@ vehiculos = [
     Avion(velocidad_viajes=700, identificador="AE02")]
 
 centros_salud = [
-    CentroSalud("Hospital Italiano", "Calle Falsa 123", "1122334455", "3 de Febrero", "Buenos Aires", [cirujanos[1]], [vehiculos[0], vehiculos[2]]),
-    CentroSalud("Hospital Privado Rosario", " Pres. Roca 2440", "0341 489-3500", "Rosario", "Santa Fe", [cirujanos[1], cirujanos[2]], [vehiculos[1], vehiculos[3]]),
-    CentroSalud("Hospital Zonal Dr. Ramón Carrillo", "20 de Febrero 598 ", "0294 452-5000", "Bariloche", "Rio Negro", [cirujanos[2]], [vehiculos[4]]),
-    CentroSalud("Sanatorio Parque", "Blvd. Oroño 860", " 0341 420-0222", "Rosario", "Santa Fe", [cirujanos[1]], [vehiculos[5]])]
+    CentroSalud("Hospital Italiano", "Calle Falsa 123", "1122334455", "3 de Febrero", "Buenos Aires", [cirujanos[1]], [vehiculos[0], vehiculos[2]], latitud=-34.6066, longitud=-58.5635),
+    CentroSalud("Hospital Privado Rosario", " Pres. Roca 2440", "0341 489-3500", "Rosario", "Santa Fe", [cirujanos[1], cirujanos[2]], [vehiculos[1], vehiculos[3]], latitud=-32.9571, longitud=-60.6607),
+    CentroSalud("Hospital Zonal Dr. Ramón Carrillo", "20 de Febrero 598 ", "0294 452-5000", "Bariloche", "Rio Negro", [cirujanos[2]], [vehiculos[4]], latitud=-41.1424, longitud=-71.2975),
+    CentroSalud("Sanatorio Parque", "Blvd. Oroño 860", " 0341 420-0222", "Rosario", "Santa Fe", [cirujanos[1]], [vehiculos[5]], latitud=-32.9437, longitud=-60.6520)]
 
 organos = [
     Organos("riñon"),
@@ -58,14 +62,47 @@ pacientes = [
     Receptores("Emilia Gómez", 30123456, "F", datetime.datetime.strptime("1988-06-03", "%Y-%m-%d"), "AB+", 341456789, "higado", datetime.datetime.strptime("2023-07-10", "%Y-%m-%d"), 1, "Diabetes tipo 1"),
 ]
 
-centros_salud[0].asignar_pacientes([pacientes[0], pacientes[4], pacientes[13]])
-centros_salud[1].asignar_pacientes([pacientes[1], pacientes[2], pacientes[3]])
-centros_salud[2].asignar_pacientes([pacientes[5], pacientes[6], pacientes[7], pacientes[8], pacientes[9]])
-centros_salud[3].asignar_pacientes([pacientes[10], pacientes[11], pacientes[12]])
+#Con la variable de entorno INCUCAI_BASE (ruta a un archivo SQLite) lo que se carga desde el menu se guarda
+#y la proxima vez se arranca desde la base, en lugar de desde las listas de arriba
+ruta_base = os.environ.get("INCUCAI_BASE")
+almacen = AlmacenSQLite(ruta_base) if ruta_base else None
+#Con INCUCAI_DIARIO (ruta a un archivo) cada cambio de estado se anota en un diario de eventos y, si el
+#sistema se corta, al volver a arrancar se reproduce el diario
+ruta_diario = os.environ.get("INCUCAI_DIARIO")
+diario = DiarioEventos(ruta_diario) if ruta_diario else None
+#Con INCUCAI_FOTO (ruta a un archivo) al salir se guarda una foto de todo el estado y al volver a arrancar se
+#carga la foto (y, si hay diario, se reproducen solo los eventos posteriores a ella)
+ruta_foto = os.environ.get("INCUCAI_FOTO")
+foto = FotoEstado(ruta_foto) if ruta_foto else None
+#Con INCUCAI_DISTANCIAS (ruta a un archivo .npz) la matriz de distancias entre centros se guarda y al volver a
+#arrancar solo se calculan las distancias de los centros nuevos o que cambiaron de coordenadas
+ruta_distancias = os.environ.get("INCUCAI_DISTANCIAS")
 
+if foto is not None and foto.existe():
+    incucai = foto.cargar(almacen, diario)
+    if diario is not None:
+        incucai.reproducir_diario(foto.secuencia)
+else:
+    incucai = INCUCAI(centros_salud, ruta_distancias=ruta_distancias, almacen=almacen, diario=diario)
 
-incucai = INCUCAI(centros_salud)
+    if diario is not None and diario.ultima_secuencia:
+        incucai.reproducir_diario()
+    elif almacen is not None and almacen.cantidad_pacientes():
+        incucai.cargar_almacen(solo_activos=True)
+    else:
+        centros_salud[0].asignar_pacientes([pacientes[0], pacientes[4], pacientes[13]])
+        centros_salud[1].asignar_pacientes([pacientes[1], pacientes[2], pacientes[3]])
+        centros_salud[2].asignar_pacientes([pacientes[5], pacientes[6], pacientes[7], pacientes[8], pacientes[9]])
+        centros_salud[3].asignar_pacientes([pacientes[10], pacientes[11], pacientes[12]])
 
-incucai.clasificar_centros_salud()
+        incucai.clasificar_centros_salud()
 
-menu(incucai)
+try:
+    menu(incucai)
+finally:
+    if foto is not None:
+        foto.guardar(incucai)
+    if almacen is not None:
+        almacen.cerrar()
+    if diario is not None:
+        diario.cerrar()
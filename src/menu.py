@@ -1,12 +1,16 @@
 from incucai.INCUCAI import *
 from centro_salud.Centro_Salud import *
+from incucai.Registro_DNI import RegistroDNI
+from pacientes.Compatibilidad_Sanguinea import GRUPOS_VALIDOS
+from pacientes.Validaciones import ORGANOS_VALIDOS, leer_fecha
+from reloj.Reloj import RELOJ_REAL
 from typing import List
 import datetime
 import os
 
 
 # --------- Funciones para el menu ---------
-def validar_fecha(fecha_str, formato="%Y-%m-%d", anios_max=100):
+def validar_fecha(fecha_str, formato="%Y-%m-%d", anios_max=100, hoy=None):
     """
     Valida si una fecha ingresada como string está dentro de un rango lógico.
 
@@ -14,6 +18,7 @@ def validar_fecha(fecha_str, formato="%Y-%m-%d", anios_max=100):
         - fecha_str: Fecha en formato string, se espera 'Año-Mes-Día' u otro formato definido.
         - formato: El formato esperado de la fecha (por defecto "%Y-%m-%d").
         - anios_max: Cantidad máxima de años hacia atrás desde hoy que se consideran válidos (por defecto 100).
+        - hoy: Fecha actual, la del reloj de INCUCAI (por defecto, la del reloj real).
 
     precon:
         La fecha debe seguir el formato especificado y encontrarse dentro de los últimos `anios_max` años.
@@ -22,15 +27,9 @@ def validar_fecha(fecha_str, formato="%Y-%m-%d", anios_max=100):
         Un objeto datetime correspondiente a la fecha válida, o None si la fecha es inválida.
     """
     try:
-        fecha = datetime.datetime.strptime(fecha_str, formato)
-        hoy = datetime.datetime.now()
-        fecha_minima = hoy - datetime.timedelta(days=anios_max*365)
-        if fecha_minima <= fecha <= hoy:
-            return fecha
-        else:
-            print("Fecha fuera de rango lógico.")
-    except ValueError:
-        print("Formato de fecha inválido, Ingrese correctamente: Año, Mes, Dia.")
+        return leer_fecha(fecha_str, formato, anios_max, hoy) #la regla esta en pacientes.Validaciones, la comparte la importacion masiva
+    except ValueError as error:
+        print(error)
     return None
 
 def obtener_centro_salud(incucai: INCUCAI, nombre_centro: str):
@@ -73,39 +72,40 @@ def dni_donante_ya_existe(incucai: INCUCAI, dni: int) -> bool:
     Verifica si un donante con el DNI dado ya está registrado en la base de datos de INCUCAI.
 
     params:
-        - incucai: Objeto que contiene la lista de donantes (se asume que tiene `lista_donantes`).
+        - incucai: Objeto que contiene el registro de pacientes por DNI (`registro_dni`) y, si lo tiene, el almacén.
         - dni: Número de Documento Nacional de Identidad del donante a verificar.
 
     precon:
-        `lista_donantes` debe estar correctamente poblada con objetos que tengan el atributo `DNI`.
+        Los donantes deben haberse registrado en INCUCAI con `registrar_donante` o estar guardados en su almacén.
 
     returns:
         True si existe un donante con el DNI especificado, False en caso contrario.
     """
-    return any(d.DNI == dni for d in incucai.lista_donantes)
+    return incucai.es_donante(dni)
 
 def dni_receptor_ya_existe(incucai: INCUCAI, dni: int) -> bool:
     """
     Verifica si un receptor con el DNI dado ya está registrado en la base de datos de INCUCAI.
 
     params:
-        - incucai: Objeto que contiene la lista de receptores (se asume que tiene `lista_receptores`).
+        - incucai: Objeto que contiene el registro de pacientes por DNI (`registro_dni`) y, si lo tiene, el almacén.
         - dni: Número de Documento Nacional de Identidad del receptor a verificar.
 
     precon:
-        `lista_receptores` debe estar correctamente poblada con objetos que tengan el atributo `DNI`.
+        Los receptores deben haberse registrado en INCUCAI con `registrar_receptor` o estar guardados en su almacén.
 
     returns:
         True si existe un receptor con el DNI especificado, False en caso contrario.
     """
-    return any(r.DNI == dni for r in incucai.lista_receptores)
+    return incucai.es_receptor(dni)
 
-def calcular_edad(nacimiento: datetime.datetime) -> int:
+def calcular_edad(nacimiento: datetime.datetime, hoy: datetime.datetime = None) -> int:
     """
     Calcula la edad actual en años a partir de una fecha de nacimiento.
 
     params:
         - nacimiento: Fecha de nacimiento como objeto datetime.
+        - hoy: Fecha actual, la del reloj de INCUCAI (por defecto, la del reloj real).
 
     precon:
         La fecha de nacimiento debe ser anterior a la fecha actual.
@@ -113,7 +113,7 @@ def calcular_edad(nacimiento: datetime.datetime) -> int:
     returns:
         La edad de la persona en años completos.
     """
-    hoy = datetime.datetime.now()
+    hoy = hoy or RELOJ_REAL.ahora()
     return hoy.year - nacimiento.year - ((hoy.month, hoy.day) < (nacimiento.month, nacimiento.day))
 
 
@@ -150,28 +150,17 @@ def listas_receptores_por_centro(incucai: INCUCAI):
         print("Centro no encontrado. Verifique el nombre.")
         return
 
-    receptores_filtrados = [r for r in incucai.lista_receptores if
-                            r.centro_de_salud.nombre.lower() == centro.nombre.lower()]
+    # Filtra y ordena con INCUCAI (desde el almacén si lo hay, si no con la tabla columnar): inestables primero
+    # y luego por edad (más joven primero), la misma regla que usan las listas de espera
+    inestables, estables = incucai.receptores_por_centro(centro.nombre)
+    hoy = incucai.reloj.ahora()
 
-    if not receptores_filtrados:
+    if not inestables and not estables:
         print(f"No hay receptores registrados en el centro de salud: {centro.nombre}")
         return
 
-    # Ordena por estado (inestables primero) y luego por edad (más joven primero)
-    receptores_ordenados = sorted(
-        receptores_filtrados,
-        key=lambda r: (
-            0 if getattr(r, 'estado', 'estable').lower() == 'inestable' else 1,  # Inestables primero
-            calcular_edad(r.nacimiento)  # Más joven primero
-        )
-    )
-
     print(f"\nReceptores en {centro.nombre} (ordenados por estado y edad):")
 
-    # Separar por grupos y mostrar con títulos
-    inestables = [r for r in receptores_ordenados if getattr(r, 'estado', 'estable').lower() == 'inestable']
-    estables = [r for r in receptores_ordenados if getattr(r, 'estado', 'estable').lower() == 'estable']
-
     contador = 1
 
     # Mostrar receptores inestables
@@ -180,7 +169,7 @@ def listas_receptores_por_centro(incucai: INCUCAI):
         print("-" * 50)
         for i in inestables:
             print(
-                f"{contador}. Nombre: {i.nombre} - Órgano: {i.organo_a_recibir} - Sangre: {i.Tsangre} - Edad: {calcular_edad(i.nacimiento)} - Partido: {i.partido} - Provincia: {i.provincia}")
+                f"{contador}. Nombre: {i.nombre} - Órgano: {i.organo_a_recibir} - Sangre: {i.Tsangre} - Edad: {calcular_edad(i.nacimiento, hoy)} - Partido: {i.partido} - Provincia: {i.provincia}")
             contador += 1
 
     # Mostrar receptores estables
@@ -189,11 +178,8 @@ def listas_receptores_por_centro(incucai: INCUCAI):
         print("-" * 30)
         for i in estables:
             print(
-                f"{contador}. Nombre: {i.nombre} - Órgano: {i.organo_a_recibir} - Sangre: {i.Tsangre} - Edad: {calcular_edad(i.nacimiento)} - Partido: {i.partido} - Provincia: {i.provincia}")
+                f"{contador}. Nombre: {i.nombre} - Órgano: {i.organo_a_recibir} - Sangre: {i.Tsangre} - Edad: {calcular_edad(i.nacimiento, hoy)} - Partido: {i.partido} - Provincia: {i.provincia}")
             contador += 1
-
-    if not inestables and not estables:
-        print("No hay receptores para mostrar.")
         
 def listas_donantes(incucai:INCUCAI):
     """
@@ -303,10 +289,10 @@ def agregar_receptor(incucai: INCUCAI):
     nacimiento = None
     while not nacimiento: #se ejecuta el bucle mientras la variable nacimiento siga siendo none, mientras que no tengamos una fecha valida
         nacimiento_input = input("Fecha de nacimiento (YYYY-MM-DD): ") #Ingresa el usuario una fecha en el formato adecuado
-        nacimiento = validar_fecha(nacimiento_input, "%Y-%m-%d") #Se llama a la funcion validar fecha para hacer la validacion real. Se escribe en el formato correcto y la fecha es logica, la funcion devuelve un objeto datetime, sino muestra error y el while sigue.
+        nacimiento = validar_fecha(nacimiento_input, "%Y-%m-%d", hoy=incucai.reloj.ahora()) #Se llama a la funcion validar fecha para hacer la validacion real. Se escribe en el formato correcto y la fecha es logica, la funcion devuelve un objeto datetime, sino muestra error y el while sigue.
     
     #bucle grupos sanguineos
-    grupos_validos = ["A+", "A-", "B+", "B-", "AB+", "AB-", "O+", "O-"]
+    grupos_validos = GRUPOS_VALIDOS
     while True:     
         grupo_sanguineo = input("Grupo sanguíneo (A+, A-, B+, B-, AB+, AB-, O+, O-): ").strip().upper()
         if grupo_sanguineo in grupos_validos:
@@ -325,7 +311,7 @@ def agregar_receptor(incucai: INCUCAI):
             print("Centro no encontrado. Verifique el nombre.")
     
     #bucle organos        
-    organos_validos = ["corazon", "pulmon", "piel", "corneas", "huesos", "higado", "riñon", "intestinos"]
+    organos_validos = ORGANOS_VALIDOS
     while True:
         organo_a_recibir = input("Órgano que necesita: ").strip().lower()
         if organo_a_recibir in organos_validos:
@@ -338,7 +324,7 @@ def agregar_receptor(incucai: INCUCAI):
     fecha_en_espera = None
     while not fecha_en_espera:
         espera_input = input("Fecha de espera (YYYY-MM-DD HH:MM): ")
-        fecha_en_espera = validar_fecha(espera_input, "%Y-%m-%d %H:%M")
+        fecha_en_espera = validar_fecha(espera_input, "%Y-%m-%d %H:%M", hoy=incucai.reloj.ahora())
     
     patologia = input("Patología: ").strip()
 
@@ -349,7 +335,7 @@ def agregar_receptor(incucai: INCUCAI):
     nuevo.partido = centro_de_salud.partido
     nuevo.provincia = centro_de_salud.provincia
 
-    incucai.lista_receptores.append(nuevo)
+    incucai.registrar_receptor(nuevo)
     centro_de_salud.lista_pacientes.append(nuevo)
     print("Receptor agregado correctamente.")
 
@@ -418,10 +404,10 @@ def agregar_donante(incucai: INCUCAI):
     fecha_nacimiento = None
     while not fecha_nacimiento:
         nacimiento_input = input("Fecha de nacimiento (YYYY-MM-DD): ")
-        fecha_nacimiento = validar_fecha(nacimiento_input, "%Y-%m-%d")
+        fecha_nacimiento = validar_fecha(nacimiento_input, "%Y-%m-%d", hoy=incucai.reloj.ahora())
 
     # Bucle grupo sanguíneo
-    grupos_validos = ["A+", "A-", "B+", "B-", "AB+", "AB-", "O+", "O-"]
+    grupos_validos = GRUPOS_VALIDOS
     while True:
         grupo_sanguineo = input("Grupo sanguíneo (A+, A-, B+, B-, AB+, AB-, O+, O-): ").strip().upper()
         if grupo_sanguineo in grupos_validos:
@@ -444,10 +430,10 @@ def agregar_donante(incucai: INCUCAI):
     fecha_hora_fallecimiento = None
     while not fecha_hora_fallecimiento:
         fallecimiento_input = input("Fecha y hora de fallecimiento (YYYY-MM-DD HH:MM): ")
-        fecha_hora_fallecimiento = validar_fecha(fallecimiento_input, "%Y-%m-%d %H:%M")
+        fecha_hora_fallecimiento = validar_fecha(fallecimiento_input, "%Y-%m-%d %H:%M", hoy=incucai.reloj.ahora())
 
     # Agregar selección de órganos a donar
-    organos_validos = ["corazon", "pulmon", "piel", "corneas", "huesos", "higado", "riñon", "intestinos"]
+    organos_validos = ORGANOS_VALIDOS
     organos_donante = []
 
     print("\nSeleccione los órganos a donar (escriba 'fin' para terminar):")
@@ -486,7 +472,7 @@ def agregar_donante(incucai: INCUCAI):
     nuevo_donante.provincia = centro_salud.provincia
 
     # Agregar a las listas
-    incucai.lista_donantes.append(nuevo_donante)
+    incucai.registrar_donante(nuevo_donante)
     centro_salud.lista_pacientes.append(nuevo_donante)
 
     print(f"\nDonante agregado correctamente.")
@@ -502,8 +488,8 @@ def consultar_resultado_trasplante(incucai: INCUCAI):
     estado del trasplante y órganos involucrados.
 
     params:
-        - incucai: Objeto del sistema INCUCAI que contiene listas de centros de salud,
-          donantes y receptores.
+        - incucai: Objeto del sistema INCUCAI con el registro de pacientes por DNI (`registro_dni`),
+          que guarda el estado del trasplante de cada paciente; los que no están cargados se buscan en su almacén.
 
     precon:
         - El usuario debe ingresar un DNI válido (numérico).
@@ -529,140 +515,76 @@ def consultar_resultado_trasplante(incucai: INCUCAI):
         print("DNI inválido. Debe ser un número.")
         return
 
-    # Buscar en todos los centros de salud
-    for centro in incucai.centros_salud:
-        # Buscar en pacientes exitosos
-        for paciente in centro.pacientes_exitosos:
-            if paciente.DNI == dni_buscado:
-                print(f" TRASPLANTE EXITOSO")
-                print(f"Paciente: {paciente.nombre}")
-                print(f"DNI: {paciente.DNI}")
-                print(f"Órgano trasplantado: {paciente.organo_a_recibir}")
-                print(f"Centro de salud: {centro.nombre}")
-                return
-
-        # Buscar en pacientes fallidos
-        for paciente in centro.pacientes_fallidos:
-            if paciente.DNI == dni_buscado:
-                print(f" TRASPLANTE FALLIDO")
-                print(f"Paciente: {paciente.nombre}")
-                print(f"DNI: {paciente.DNI}")
-                print(f"Órgano que necesitaba: {paciente.organo_a_recibir}")
-                print(f"Centro de salud: {centro.nombre}")
-                return
-
-    # Si no se encontró en exitosos/fallidos, buscar si existe como receptor
-    receptor_encontrado = None
-    for receptor in incucai.lista_receptores:
-        if receptor.DNI == dni_buscado:
-            receptor_encontrado = receptor
-            break
-
-    if receptor_encontrado:
-        # Verificar si tiene órganos a disposición
-        if hasattr(receptor_encontrado, 'organos_a_disposicion') and receptor_encontrado.organos_a_disposicion:
-            print(f" RECEPTOR EN PROCESO")
-            print(f"Paciente: {receptor_encontrado.nombre}")
-            print(f"DNI: {receptor_encontrado.DNI}")
-            print(f"Órgano necesario: {receptor_encontrado.organo_a_recibir}")
-            print(f"Estado: Órgano compatible encontrado, pendiente de cirugía")
-            print(
-                f"Centro de salud: {receptor_encontrado.centro_de_salud.nombre if receptor_encontrado.centro_de_salud else 'No asignado'}")
-        else:
-            print(f" RECEPTOR EN ESPERA")
-            print(f"Paciente: {receptor_encontrado.nombre}")
-            print(f"DNI: {receptor_encontrado.DNI}")
-            print(f"Órgano necesario: {receptor_encontrado.organo_a_recibir}")
-            print(f"Estado: En lista de espera, sin órgano compatible disponible")
-            print(
-                f"Centro de salud: {receptor_encontrado.centro_de_salud.nombre if receptor_encontrado.centro_de_salud else 'No asignado'}")
+    registrado = incucai.buscar_paciente(dni_buscado)
+    if registrado is None:
+        print(" No se encontró ningún paciente (receptor o donante) con ese DNI.")
         return
 
-    # Buscar si existe como donante
-    donante_encontrado = None
-    for donante in incucai.lista_donantes:
-        if donante.DNI == dni_buscado:
-            donante_encontrado = donante
-            break
+    paciente, estado, centro = registrado
+
+    if estado == RegistroDNI.EXITOSO:
+        print(f" TRASPLANTE EXITOSO")
+        print(f"Paciente: {paciente.nombre}")
+        print(f"DNI: {paciente.DNI}")
+        print(f"Órgano trasplantado: {paciente.organo_a_recibir}")
+        print(f"Centro de salud: {centro.nombre}")
+
+    elif estado == RegistroDNI.FALLIDO:
+        print(f" TRASPLANTE FALLIDO")
+        print(f"Paciente: {paciente.nombre}")
+        print(f"DNI: {paciente.DNI}")
+        print(f"Órgano que necesitaba: {paciente.organo_a_recibir}")
+        print(f"Centro de salud: {centro.nombre}")
+
+    elif estado == RegistroDNI.EN_PROCESO:
+        print(f" RECEPTOR EN PROCESO")
+        print(f"Paciente: {paciente.nombre}")
+        print(f"DNI: {paciente.DNI}")
+        print(f"Órgano necesario: {paciente.organo_a_recibir}")
+        print(f"Estado: Órgano compatible encontrado, pendiente de cirugía")
+        print(
+            f"Centro de salud: {paciente.centro_de_salud.nombre if paciente.centro_de_salud else 'No asignado'}")
+
+    elif estado == RegistroDNI.EN_ESPERA:
+        print(f" RECEPTOR EN ESPERA")
+        print(f"Paciente: {paciente.nombre}")
+        print(f"DNI: {paciente.DNI}")
+        print(f"Órgano necesario: {paciente.organo_a_recibir}")
+        print(f"Estado: En lista de espera, sin órgano compatible disponible")
+        print(
+            f"Centro de salud: {paciente.centro_de_salud.nombre if paciente.centro_de_salud else 'No asignado'}")
 
-    if donante_encontrado:
+    else:
         print(f" DONANTE REGISTRADO")
-        print(f"Paciente: {donante_encontrado.nombre}")
-        print(f"DNI: {donante_encontrado.DNI}")
-        if hasattr(donante_encontrado, 'organos_a_donar') and donante_encontrado.organos_a_donar:
-            organos = [organo.tipo_de_organo for organo in donante_encontrado.organos_a_donar]
+        print(f"Paciente: {paciente.nombre}")
+        print(f"DNI: {paciente.DNI}")
+        if paciente.organos_a_donar:
+            organos = [organo.tipo_de_organo for organo in paciente.organos_a_donar]
             print(f"Órganos disponibles para donación: {', '.join(organos)}")
         else:
             print("Órganos ya donados o no disponibles")
         print(
-            f"Centro de salud: {donante_encontrado.centro_de_salud.nombre if donante_encontrado.centro_de_salud else 'No asignado'}")
-        return
+            f"Centro de salud: {paciente.centro_de_salud.nombre if paciente.centro_de_salud else 'No asignado'}")
 
-    print(" No se encontró ningún paciente (receptor o donante) con ese DNI.")
 
 
 def procesar_nuevos_trasplantes(incucai: INCUCAI):
     """
-    Consulta el estado actual de un paciente en el sistema de trasplantes mediante su DNI.
+    Procesa los pacientes que se agregaron desde el último procesamiento y busca sus trasplantes.
 
-    Esta función permite al usuario buscar e identificar el estado de trasplante de un paciente,
-    ya sea como receptor o donante, y muestra los detalles correspondientes al centro de salud,
-    estado del trasplante y órganos involucrados.
+    Solo se buscan compatibilidades para los pacientes nuevos (y los receptores en espera que un
+    donante nuevo destraba), asi el costo de cargar un paciente no crece con el tamaño del registro.
 
     params:
         - incucai: Objeto del sistema INCUCAI que contiene listas de centros de salud,
           donantes y receptores.
 
-    precon:
-        - El usuario debe ingresar un DNI válido (numérico).
-        - El paciente puede encontrarse en alguna de las siguientes categorías:
-            a) Trasplante exitoso
-            b) Trasplante fallido
-            c) Receptor en proceso
-            d) Receptor en espera
-            e) Donante registrado
-        - Si no se encuentra al paciente, se informará que no existe registro con ese DNI.
-
     returns:
-        No retorna ningún valor. Imprime en consola el estado actual del trasplante según el paciente:
-        - Nombre del paciente
-        - DNI
-        - Órgano involucrado
-        - Centro de salud correspondiente
-        - Estado actual del procedimiento (exitoso, fallido, en espera, etc.)
+        No retorna ningún valor. Imprime en consola cuántos trasplantes se procesaron.
     """
     print(" Procesando nuevos trasplantes...")
 
-    # Procesar todos los pacientes en los centros de salud
-    pacientes_procesados = 0
-
-    for centro in incucai.centros_salud:
-        for paciente in centro.lista_pacientes[:]:  # Crear copia para iterar seguro
-            if isinstance(paciente, Receptores):
-                # Verificar si ya está en la lista de receptores de INCUCAI
-                if paciente not in incucai.lista_receptores:
-                    incucai.lista_receptores.append(paciente)
-
-                # Buscar compatibilidad si no tiene órganos asignados
-                if not hasattr(paciente, 'organos_a_disposicion') or not paciente.organos_a_disposicion:
-                    if incucai.buscar_compatibilidad_receptor_a_donante(paciente):
-                        tiempo = centro.asignar_y_mandar_vehiculo(paciente)
-                        if tiempo is not None:
-                            centro.asignar_cirujano_y_operar(paciente, tiempo)
-                            pacientes_procesados += 1
-
-            elif isinstance(paciente, Donantes):
-                # Verificar si ya está en la lista de donantes de INCUCAI
-                if paciente not in incucai.lista_donantes:
-                    incucai.lista_donantes.append(paciente)
-
-                # Buscar receptor compatible
-                receptor_encontrado = incucai.buscar_compatibilidad_donante_a_receptor(paciente)
-                if receptor_encontrado is not None:
-                    tiempo = centro.asignar_y_mandar_vehiculo(receptor_encontrado)
-                    if tiempo is not None:
-                        centro.asignar_cirujano_y_operar(receptor_encontrado, tiempo)
-                        pacientes_procesados += 1
+    pacientes_procesados = incucai.procesar_nuevos_pacientes()
 
     if pacientes_procesados > 0:
         print(f" Se procesaron {pacientes_procesados} nuevos trasplantes.")
@@ -1,11 +1,19 @@
+from codigos.Codigos import TipoOrgano
+
 class Organos:
 
+    __slots__ = ('tipo_de_organo', 'codigo_organo', 'fecha_ablacion')
+
     def __init__(self, tipo_de_organo):
         """
     Representa un órgano que puede ser donado.
 
     params:
         - tipo_de_organo: Una cadena de texto que indica el tipo o nombre del órgano.
+
+    precon:
+        - tipo_de_organo debe ser uno de los órganos de TipoOrgano (sin importar mayúsculas).
         """
         self.tipo_de_organo = tipo_de_organo
+        self.codigo_organo = TipoOrgano.desde_texto(tipo_de_organo) #codigo entero del organo, se normaliza una sola vez
         self.fecha_ablacion = None # fecha en la que se realiza la ablacion del organo, no pongo nada, ya que no se sabe cuando se va a donar el organo
@@ -0,0 +1,100 @@
+from codigos.Codigos import GrupoSanguineo
+
+GRUPOS_VALIDOS = [grupo.texto for grupo in GrupoSanguineo]
+
+
+def _mascara(grupos: list[str]) -> int:
+    """
+    Arma una máscara de bits con un bit prendido por cada grupo sanguíneo de la lista (el bit es el código del grupo).
+    """
+    mascara = 0
+    for grupo in grupos:
+        mascara |= 1 << GrupoSanguineo.desde_texto(grupo)
+    return mascara
+
+
+#para cada grupo del receptor, grupos de donantes de los que puede recibir (ABO y Rh, O- es donante universal y AB+ receptor universal)
+DONANTES_COMPATIBLES = {
+    GrupoSanguineo.A_POSITIVO: _mascara(["A+", "A-", "O+", "O-"]),
+    GrupoSanguineo.A_NEGATIVO: _mascara(["A-", "O-"]),
+    GrupoSanguineo.B_POSITIVO: _mascara(["B+", "B-", "O+", "O-"]),
+    GrupoSanguineo.B_NEGATIVO: _mascara(["B-", "O-"]),
+    GrupoSanguineo.AB_POSITIVO: _mascara(GRUPOS_VALIDOS),
+    GrupoSanguineo.AB_NEGATIVO: _mascara(["A-", "B-", "AB-", "O-"]),
+    GrupoSanguineo.O_POSITIVO: _mascara(["O+", "O-"]),
+    GrupoSanguineo.O_NEGATIVO: _mascara(["O-"]),
+}
+
+#la misma tabla vista desde el donante: grupos de receptores a los que puede donar
+RECEPTORES_COMPATIBLES = {
+    donante: sum(1 << receptor for receptor in GrupoSanguineo if DONANTES_COMPATIBLES[receptor] >> donante & 1)
+    for donante in GrupoSanguineo
+}
+
+
+def _grupos_de(mascara: int, propio: GrupoSanguineo, universalidad: dict[GrupoSanguineo, int]) -> list[GrupoSanguineo]:
+    """
+    Lista los grupos de una máscara: primero el propio y después de menos a más universal,
+    asi los grupos que sirven para todos (como O-) se usan en último lugar.
+    """
+    grupos = [grupo for grupo in GrupoSanguineo if mascara >> grupo & 1 and grupo != propio]
+    grupos.sort(key=lambda grupo: bin(universalidad[grupo]).count("1"))
+    return [propio] + grupos
+
+
+#ordenes precalculados para recorrer los baldes del inventario y las listas de espera
+_ORDEN_DONANTES = {grupo: _grupos_de(DONANTES_COMPATIBLES[grupo], grupo, RECEPTORES_COMPATIBLES) for grupo in GrupoSanguineo}
+_ORDEN_RECEPTORES = {grupo: _grupos_de(RECEPTORES_COMPATIBLES[grupo], grupo, DONANTES_COMPATIBLES) for grupo in GrupoSanguineo}
+
+
+def es_compatible(Tsangre_donante, Tsangre_receptor, estricto: bool = False) -> bool:
+    """
+    Indica si un receptor puede recibir un órgano de un donante según su grupo sanguíneo.
+
+    params:
+        - Tsangre_donante: Grupo sanguíneo del donante (texto o GrupoSanguineo).
+        - Tsangre_receptor: Grupo sanguíneo del receptor (texto o GrupoSanguineo).
+        - estricto: Si es True, solo se aceptan grupos idénticos (el criterio original).
+
+    returns:
+        True si son compatibles. Con estricto=False se resuelve con un solo test de bits sobre la tabla ABO.
+    """
+    donante = GrupoSanguineo.desde_texto(Tsangre_donante)
+    receptor = GrupoSanguineo.desde_texto(Tsangre_receptor)
+    if estricto:
+        return donante == receptor
+    return bool(DONANTES_COMPATIBLES[receptor] >> donante & 1)
+
+
+def grupos_donantes_compatibles(Tsangre_receptor, estricto: bool = False) -> list[GrupoSanguineo]:
+    """
+    Devuelve los grupos sanguíneos de los que puede recibir un receptor.
+
+    params:
+        - Tsangre_receptor: Grupo sanguíneo del receptor (texto o GrupoSanguineo).
+        - estricto: Si es True, solo su propio grupo.
+
+    returns:
+        Una lista de grupos: primero el propio y luego de menos a más universal.
+    """
+    receptor = GrupoSanguineo.desde_texto(Tsangre_receptor)
+    if estricto:
+        return [receptor]
+    return _ORDEN_DONANTES[receptor]
+
+
+def grupos_receptores_compatibles(Tsangre_donante, estricto: bool = False) -> list[GrupoSanguineo]:
+    """
+    Devuelve los grupos sanguíneos a los que puede donar un donante.
+
+    params:
+        - Tsangre_donante: Grupo sanguíneo del donante (texto o GrupoSanguineo).
+        - estricto: Si es True, solo su propio grupo.
+
+    returns:
+        Una lista de grupos: primero el propio y luego de menos a más universal.
+    """
+    donante = GrupoSanguineo.desde_texto(Tsangre_donante)
+    if estricto:
+        return [donante]
+    return _ORDEN_RECEPTORES[donante]
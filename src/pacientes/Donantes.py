@@ -3,6 +3,8 @@ from organos.Organos import Organos
 
 class Donantes(Pacientes):
 
+    __slots__ = ('fhfallecimiento', 'organos_a_donar', 'partido', 'provincia', 'centro_de_salud')
+
     def __init__(self, nombre, DNI, sexo, nacimiento, Tsangre, telefono, fhfallecimiento, organos_a_donar=[]):
         super().__init__(nombre, DNI, sexo, nacimiento, Tsangre, telefono)
         """
@@ -1,5 +1,10 @@
+from codigos.Codigos import GrupoSanguineo
 
 class Pacientes:
+
+    #atributos fijos en lugar de un __dict__ por instancia, asi cada paciente ocupa mucha menos memoria
+    __slots__ = ('nombre', 'DNI', 'sexo', 'nacimiento', 'Tsangre', 'codigo_sangre', 'telefono')
+
     def __init__(self, nombre, DNI, sexo, nacimiento, Tsangre, telefono):
         """
         Inicializa un objeto Pacientes con los datos básicos de un paciente.
@@ -15,6 +20,7 @@ class Pacientes:
         precon (opcional):
             - DNI puede ser generado aleatoriamente si no se provee.
             - nacimiento puede ser una fecha real o generada.
+            - Tsangre debe ser uno de los grupos de GrupoSanguineo (por ejemplo "O+").
         
         returns:
             None. Inicializa una instancia de Pacientes con los atributos proporcionados.
@@ -24,6 +30,7 @@ class Pacientes:
         self.sexo = sexo
         self.nacimiento = nacimiento #este se obtiene con un random o daytime o ambas (o quizas ninguna ja)
         self.Tsangre = Tsangre
+        self.codigo_sangre = GrupoSanguineo.desde_texto(Tsangre) #codigo entero del grupo, para comparar e indexar sin normalizar textos
         self.telefono = telefono
 
 
@@ -1,8 +1,12 @@
 from pacientes.Pacientes import Pacientes
 from organos.Organos import Organos
+from codigos.Codigos import TipoOrgano
 
 class Receptores(Pacientes):
 
+    __slots__ = ('organo_a_recibir', 'codigo_organo', 'fecha_en_espera', 'estado', 'organos_a_disposicion',
+                 'patologia', 'partido', 'provincia', 'centro_de_salud')
+
     def __init__(self, nombre, DNI, sexo, nacimiento, Tsangre, telefono, organo_a_recibir, fecha_en_espera, patologia, estado = None):
         super().__init__(nombre, DNI, sexo, nacimiento, Tsangre, telefono)
         """
@@ -21,7 +25,7 @@ class Receptores(Pacientes):
             - estado: Estado actual del receptor, por defecto "Estable".
 
         precon (opcional):
-            - organo_a_recibir debe ser una cadena que se pueda convertir a minúsculas.
+            - organo_a_recibir debe ser uno de los órganos de TipoOrgano (sin importar mayúsculas).
             - estado suele ser "Estable" salvo que falle el trasplante.
 
         returns:
@@ -29,6 +33,7 @@ class Receptores(Pacientes):
         """
         organo_a_recibir = organo_a_recibir.lower()
         self.organo_a_recibir = organo_a_recibir
+        self.codigo_organo = TipoOrgano.desde_texto(organo_a_recibir)
         self.fecha_en_espera = fecha_en_espera
         self.estado = "Estable" #siempre va a estar estable, a menos que falle el trasplante 
         self.organos_a_disposicion: list [Organos] =[] # lista de organos que el receptor puede recibir, en caso de que haya compatibilidad con el donante
@@ -0,0 +1,131 @@
+import datetime
+from functools import lru_cache
+from codigos.Codigos import TipoOrgano
+from pacientes.Compatibilidad_Sanguinea import GRUPOS_VALIDOS
+from reloj.Reloj import RELOJ_REAL
+
+ORGANOS_VALIDOS = [organo.texto for organo in TipoOrgano]
+SEXOS_VALIDOS = ("M", "F")
+
+
+@lru_cache(maxsize=4096)
+def _convertir_fecha(fecha_str: str, formato: str) -> datetime.datetime:
+    """
+    Función auxiliar que convierte el texto con strptime. Se guardan las últimas conversiones porque en una
+    importación las mismas fechas se repiten mucho y strptime es lo más caro de validar un registro.
+    """
+    return datetime.datetime.strptime(fecha_str, formato)
+
+
+def leer_fecha(fecha_str: str, formato: str = "%Y-%m-%d", anios_max: int = 100, hoy: datetime.datetime = None) -> datetime.datetime:
+    """
+    Convierte una fecha en texto y verifica que esté dentro de un rango lógico. Es la regla de validar_fecha
+    del menú, pero en lugar de imprimir el problema lanza una excepción, asi se puede usar sin consola.
+
+    params:
+        - fecha_str: Fecha en formato string.
+        - formato: El formato esperado de la fecha (por defecto "%Y-%m-%d").
+        - anios_max: Cantidad máxima de años hacia atrás desde hoy que se consideran válidos (por defecto 100).
+        - hoy: Fecha actual (por defecto, la del reloj real; con un reloj virtual hay que pasar su hora).
+
+    returns:
+        Un objeto datetime correspondiente a la fecha.
+
+    raises:
+        ValueError con el mismo mensaje que muestra el menú si el formato es inválido o la fecha está fuera de rango.
+    """
+    try:
+        fecha = _convertir_fecha(fecha_str, formato)
+    except (TypeError, ValueError):
+        raise ValueError("Formato de fecha inválido, Ingrese correctamente: Año, Mes, Dia.") from None
+    hoy = hoy or RELOJ_REAL.ahora()
+    if not hoy - datetime.timedelta(days=anios_max*365) <= fecha <= hoy:
+        raise ValueError("Fecha fuera de rango lógico.")
+    return fecha
+
+
+def leer_dni(dni_str) -> int:
+    """
+    Verifica que un DNI tenga exactamente 8 dígitos, como pide el menú al cargar pacientes.
+
+    params:
+        - dni_str: DNI como texto o número.
+
+    returns:
+        El DNI como entero.
+
+    raises:
+        ValueError si tiene otros caracteres o no tiene 8 dígitos.
+    """
+    dni_str = str(dni_str).strip()
+    if not dni_str.isdigit():
+        raise ValueError("El DNI debe contener solo números.")
+    if len(dni_str) != 8:
+        raise ValueError("El DNI debe tener exactamente 8 dígitos.")
+    return int(dni_str)
+
+
+def leer_nombre(nombre: str) -> str:
+    """
+    Verifica que un nombre no esté vacío ni tenga números.
+
+    returns:
+        El nombre sin espacios en los extremos.
+
+    raises:
+        ValueError si el nombre no es válido.
+    """
+    nombre = (nombre or "").strip()
+    if not nombre:
+        raise ValueError("El nombre no puede estar vacío.")
+    if any(char.isdigit() for char in nombre):
+        raise ValueError("El nombre no puede contener números.")
+    return nombre
+
+
+def leer_sexo(sexo: str) -> str:
+    """
+    Verifica que el sexo sea M o F (sin importar mayúsculas).
+
+    returns:
+        "M" o "F".
+
+    raises:
+        ValueError si no es ninguno de los dos.
+    """
+    sexo = (sexo or "").strip().upper()
+    if sexo not in SEXOS_VALIDOS:
+        raise ValueError("Sexo inválido. Ingrese M o F.")
+    return sexo
+
+
+def leer_grupo_sanguineo(grupo: str) -> str:
+    """
+    Verifica que el grupo sanguíneo sea uno de GRUPOS_VALIDOS.
+
+    returns:
+        El grupo en mayúsculas (por ejemplo "AB+").
+
+    raises:
+        ValueError si no es un grupo válido.
+    """
+    grupo = (grupo or "").strip().upper()
+    if grupo not in GRUPOS_VALIDOS:
+        raise ValueError(f"Grupo sanguíneo inválido. Debe ser uno de: {', '.join(GRUPOS_VALIDOS)}")
+    return grupo
+
+
+def leer_organo(organo: str) -> str:
+    """
+    Verifica que el órgano sea uno de ORGANOS_VALIDOS.
+
+    returns:
+        El órgano en minúsculas.
+
+    raises:
+        ValueError si no es un órgano válido.
+    """
+    organo = (organo or "").strip().lower()
+    if organo not in ORGANOS_VALIDOS:
+        raise ValueError(f"Órgano inválido. Debe ser uno de: {', '.join(ORGANOS_VALIDOS)}")
+    return organo
@@ -0,0 +1,392 @@
+import sqlite3
+from datetime import datetime
+from pacientes.Receptores import Receptores
+from pacientes.Donantes import Donantes
+from organos.Organos import Organos
+from incucai.Registro_DNI import RegistroDNI
+
+
+class AlmacenSQLite:
+
+    VERSION_ESQUEMA = 1 #se guarda en PRAGMA user_version, para migrar si cambian las tablas
+    RECEPTOR = 1 #valores de la columna pacientes.tipo
+    DONANTE = 0
+
+    ESQUEMA = """
+        CREATE TABLE IF NOT EXISTS pacientes (
+            dni INTEGER NOT NULL UNIQUE, --sin INTEGER PRIMARY KEY, asi el rowid sigue el orden de alta
+            tipo INTEGER NOT NULL,
+            nombre TEXT NOT NULL,
+            sexo TEXT,
+            nacimiento TEXT,
+            sangre TEXT NOT NULL,
+            codigo_sangre INTEGER NOT NULL,
+            telefono INTEGER,
+            centro TEXT,
+            organo TEXT,
+            codigo_organo INTEGER,
+            fecha_en_espera TEXT,
+            patologia TEXT,
+            estado TEXT,
+            fallecimiento TEXT,
+            estado_trasplante TEXT NOT NULL,
+            centro_cirugia TEXT
+        );
+        CREATE INDEX IF NOT EXISTS pacientes_espera ON pacientes (codigo_organo, codigo_sangre, estado_trasplante);
+        CREATE INDEX IF NOT EXISTS pacientes_sangre ON pacientes (codigo_sangre);
+        CREATE INDEX IF NOT EXISTS pacientes_centro ON pacientes (centro);
+        CREATE INDEX IF NOT EXISTS pacientes_estado ON pacientes (estado_trasplante);
+        CREATE INDEX IF NOT EXISTS pacientes_prioridad ON pacientes
+            (centro, tipo, lower(estado), substr(nacimiento, 1, 10) DESC, fecha_en_espera); --el orden de prioridad_receptor
+
+        CREATE TABLE IF NOT EXISTS organos (
+            id INTEGER PRIMARY KEY,
+            dni_donante INTEGER NOT NULL,
+            posicion INTEGER NOT NULL,
+            tipo TEXT NOT NULL,
+            codigo_organo INTEGER NOT NULL,
+            dni_receptor INTEGER,
+            fecha_ablacion TEXT,
+            UNIQUE (dni_donante, posicion)
+        );
+        CREATE INDEX IF NOT EXISTS organos_disponibles ON organos (codigo_organo, dni_receptor);
+        CREATE INDEX IF NOT EXISTS organos_receptor ON organos (dni_receptor);
+
+        CREATE TABLE IF NOT EXISTS resultados (
+            id INTEGER PRIMARY KEY,
+            dni_receptor INTEGER NOT NULL,
+            codigo_organo INTEGER,
+            centro TEXT,
+            exitoso INTEGER NOT NULL,
+            fecha TEXT
+        );
+        CREATE INDEX IF NOT EXISTS resultados_receptor ON resultados (dni_receptor);
+        CREATE INDEX IF NOT EXISTS resultados_centro ON resultados (centro);
+    """
+
+    #sentencias de escritura, en el orden en que se aplican al confirmar un lote
+    GUARDAR_PACIENTE = ("INSERT OR REPLACE INTO pacientes VALUES "
+                        "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+    GUARDAR_ORGANO = ("INSERT OR IGNORE INTO organos (dni_donante, posicion, tipo, codigo_organo, dni_receptor, fecha_ablacion) "
+                      "VALUES (?, ?, ?, ?, NULL, NULL)")
+    ASIGNAR_ORGANO = ("UPDATE organos SET dni_receptor = ?, fecha_ablacion = ? WHERE id = "
+                      "(SELECT id FROM organos WHERE dni_donante = ? AND codigo_organo = ? AND dni_receptor IS NULL "
+                      "ORDER BY posicion LIMIT 1)")
+    ACTUALIZAR_ESTADO = "UPDATE pacientes SET estado_trasplante = ?, centro_cirugia = ?, estado = ? WHERE dni = ?"
+    GUARDAR_RESULTADO = ("INSERT INTO resultados (dni_receptor, codigo_organo, centro, exitoso, fecha) "
+                         "VALUES (?, ?, ?, ?, ?)")
+    ORDEN_ESCRITURA = (GUARDAR_PACIENTE, GUARDAR_ORGANO, ASIGNAR_ORGANO, ACTUALIZAR_ESTADO, GUARDAR_RESULTADO)
+
+    #receptores de un centro con un estado clinico, en el orden de prioridad_receptor (lo resuelve el indice pacientes_prioridad)
+    RECEPTORES_POR_PRIORIDAD = ("SELECT * FROM pacientes WHERE centro = ? AND tipo = ? AND lower(estado) = ? "
+                                "ORDER BY substr(nacimiento, 1, 10) DESC, fecha_en_espera, rowid")
+
+    def __init__(self, ruta: str, tamaño_lote: int = 10_000):
+        """
+    Almacenamiento de pacientes, órganos y resultados de cirugías en un archivo SQLite, para que lo que se
+    carga en el sistema sobreviva entre ejecuciones.
+
+    Las escrituras no van a la base de a una: se acumulan y se aplican juntas (executemany) dentro de una
+    sola transacción cada `tamaño_lote` operaciones, al consultar o al cerrar. Dentro de un lote se aplican
+    primero las altas de pacientes, después las de órganos y por último las asignaciones, cambios de estado
+    y resultados, cada grupo en el orden en que llegó; asi cada escritura encuentra las filas de las que depende.
+
+    Las consultas (buscar, receptores_en_espera, resultados_por_centro, pacientes) van directo a la base con
+    índices por DNI, órgano, grupo sanguíneo, centro y estado, y recorren las filas de a una sin traer todo a memoria.
+
+    params:
+        - ruta: Archivo de la base (se crea si no existe). ":memory:" crea una base temporal.
+        - tamaño_lote: Cantidad de escrituras pendientes que dispara una transacción.
+        """
+        if tamaño_lote < 1:
+            raise ValueError("El tamaño de lote debe ser al menos 1.")
+        self.ruta = ruta
+        self.tamaño_lote = tamaño_lote
+        self._pendientes: dict[str, list[tuple]] = {sentencia: [] for sentencia in self.ORDEN_ESCRITURA}
+        self._cantidad_pendientes = 0
+
+        self._conexion = sqlite3.connect(ruta)
+        self._conexion.execute("PRAGMA journal_mode = WAL") #los lectores no bloquean al que escribe
+        self._conexion.execute("PRAGMA synchronous = NORMAL") #con WAL sigue siendo consistente ante un corte
+        version = self._conexion.execute("PRAGMA user_version").fetchone()[0]
+        if version > self.VERSION_ESQUEMA:
+            raise ValueError(f"La base {ruta} es de una versión más nueva ({version}) que la soportada ({self.VERSION_ESQUEMA}).")
+        with self._conexion:
+            self._conexion.executescript(self.ESQUEMA)
+            self._conexion.execute(f"PRAGMA user_version = {self.VERSION_ESQUEMA}")
+
+    @staticmethod
+    def _fecha(fecha: datetime | None) -> str | None:
+        """
+        Método auxiliar que pasa una fecha a texto ISO (None queda None).
+        """
+        return fecha.isoformat() if fecha is not None else None
+
+    @staticmethod
+    def _leer_fecha(texto: str | None) -> datetime | None:
+        """
+        Método auxiliar que lee una fecha guardada con _fecha.
+        """
+        return datetime.fromisoformat(texto) if texto is not None else None
+
+    def _encolar(self, sentencia: str, parametros: tuple):
+        """
+        Método auxiliar que deja una escritura pendiente y confirma el lote si se llenó.
+        """
+        self._pendientes[sentencia].append(parametros)
+        self._cantidad_pendientes += 1
+        if self._cantidad_pendientes >= self.tamaño_lote:
+            self.confirmar()
+
+    def confirmar(self):
+        """
+    Aplica todas las escrituras pendientes en una sola transacción. Si alguna falla, no se aplica ninguna
+    del lote y el error se propaga.
+        """
+        if not self._cantidad_pendientes:
+            return
+        with self._conexion:
+            for sentencia in self.ORDEN_ESCRITURA:
+                if self._pendientes[sentencia]:
+                    self._conexion.executemany(sentencia, self._pendientes[sentencia])
+        for filas in self._pendientes.values():
+            filas.clear()
+        self._cantidad_pendientes = 0
+
+    def guardar_paciente(self, paciente: Receptores | Donantes, estado: str, centro_cirugia=None):
+        """
+    Guarda (o reemplaza) un paciente con el estado de su trasplante; de un donante se guardan también sus
+    órganos a donar.
+
+    params:
+        - paciente: Receptor o donante.
+        - estado: Estado del trasplante (ver RegistroDNI).
+        - centro_cirugia: CentroSalud donde se operó al receptor, si ya se operó.
+        """
+        es_receptor = isinstance(paciente, Receptores)
+        centro = paciente.centro_de_salud.nombre if paciente.centro_de_salud is not None else None
+        self._encolar(self.GUARDAR_PACIENTE, (
+            paciente.DNI, self.RECEPTOR if es_receptor else self.DONANTE, paciente.nombre, paciente.sexo,
+            self._fecha(paciente.nacimiento), paciente.Tsangre, int(paciente.codigo_sangre), paciente.telefono, centro,
+            paciente.organo_a_recibir if es_receptor else None,
+            int(paciente.codigo_organo) if es_receptor else None,
+            self._fecha(paciente.fecha_en_espera) if es_receptor else None,
+            paciente.patologia if es_receptor else None,
+            paciente.estado if es_receptor else None,
+            None if es_receptor else self._fecha(paciente.fhfallecimiento),
+            estado,
+            centro_cirugia.nombre if centro_cirugia is not None else None,
+        ))
+        if not es_receptor:
+            for posicion, organo in enumerate(paciente.organos_a_donar):
+                self._encolar(self.GUARDAR_ORGANO, (paciente.DNI, posicion, organo.tipo_de_organo, int(organo.codigo_organo)))
+
+    def asignar_organo(self, donante: Donantes, organo: Organos, receptor: Receptores):
+        """
+    Registra que un órgano del donante pasó al receptor, con su fecha de ablación.
+
+    params:
+        - donante: Donante dueño del órgano.
+        - organo: Órgano asignado.
+        - receptor: Receptor que lo recibe.
+        """
+        self._encolar(self.ASIGNAR_ORGANO, (receptor.DNI, self._fecha(organo.fecha_ablacion), donante.DNI, int(organo.codigo_organo)))
+
+    def actualizar_estado(self, paciente: Receptores | Donantes, estado: str, centro_cirugia=None):
+        """
+    Cambia el estado del trasplante de un paciente ya guardado (y su estado clínico, si es un receptor).
+
+    params:
+        - paciente: Paciente guardado.
+        - estado: Estado del trasplante (ver RegistroDNI).
+        - centro_cirugia: CentroSalud donde se operó al receptor (solo para exitoso y fallido).
+        """
+        self._encolar(self.ACTUALIZAR_ESTADO, (estado, centro_cirugia.nombre if centro_cirugia is not None else None,
+                                               getattr(paciente, 'estado', None), paciente.DNI))
+
+    def guardar_resultado(self, receptor: Receptores, exitoso: bool, centro_cirugia, fecha: datetime):
+        """
+    Agrega el resultado de una cirugía al historial.
+
+    params:
+        - receptor: Receptor operado.
+        - exitoso: True si la cirugía fue exitosa.
+        - centro_cirugia: CentroSalud donde se operó.
+        - fecha: Fecha y hora de la cirugía.
+        """
+        self._encolar(self.GUARDAR_RESULTADO, (receptor.DNI, int(receptor.codigo_organo), centro_cirugia.nombre,
+                                               int(bool(exitoso)), self._fecha(fecha)))
+
+    def _armar_paciente(self, fila: tuple, centros: dict, recibidos: bool = True) -> Receptores | Donantes:
+        """
+        Método auxiliar que arma un Receptores o Donantes a partir de una fila de la tabla pacientes, con sus
+        órganos (sin los recibidos por un receptor si `recibidos` es False), y lo vincula a su centro si está en
+        `centros` (nombre -> CentroSalud).
+        """
+        (dni, tipo, nombre, sexo, nacimiento, sangre, _, telefono, centro, organo, _, fecha_en_espera,
+         patologia, estado, fallecimiento, _, _) = fila
+        if tipo == self.RECEPTOR:
+            paciente = Receptores(nombre, dni, sexo, self._leer_fecha(nacimiento), sangre, telefono, organo,
+                                  self._leer_fecha(fecha_en_espera), patologia)
+            paciente.estado = estado or paciente.estado
+            filas_recibidos = self._conexion.execute(
+                "SELECT tipo, fecha_ablacion FROM organos WHERE dni_receptor = ? ORDER BY id", (dni,)) if recibidos else ()
+            for tipo_organo, ablacion in filas_recibidos:
+                recibido = Organos(tipo_organo)
+                recibido.fecha_ablacion = self._leer_fecha(ablacion)
+                paciente.organos_a_disposicion.append(recibido)
+        else:
+            organos = [Organos(tipo_organo) for (tipo_organo,) in self._conexion.execute(
+                "SELECT tipo FROM organos WHERE dni_donante = ? AND dni_receptor IS NULL ORDER BY posicion", (dni,))]
+            paciente = Donantes(nombre, dni, sexo, self._leer_fecha(nacimiento), sangre, telefono,
+                                self._leer_fecha(fallecimiento), organos)
+
+        centro_salud = centros.get(centro)
+        if centro_salud is not None:
+            paciente.centro_de_salud = centro_salud
+            paciente.partido = centro_salud.partido
+            paciente.provincia = centro_salud.provincia
+        return paciente
+
+    def pacientes(self, centros: dict = None, estados: tuple[str, ...] = None):
+        """
+    Recorre los pacientes guardados, en el orden en que se guardaron por primera vez, sin cargarlos
+    todos a la vez.
+
+    params:
+        - centros: Diccionario nombre -> CentroSalud para vincular cada paciente con su centro (opcional).
+        - estados: Estados del trasplante de los pacientes a recorrer (por defecto, todos).
+
+    returns:
+        Un generador de tuplas (paciente, estado del trasplante, nombre del centro donde se operó o None).
+        """
+        self.confirmar()
+        centros = centros or {}
+        consulta, parametros = "SELECT * FROM pacientes ORDER BY rowid", ()
+        if estados:
+            consulta = f"SELECT * FROM pacientes WHERE estado_trasplante IN ({', '.join('?' * len(estados))}) ORDER BY rowid"
+            parametros = tuple(estados)
+        for fila in self._conexion.execute(consulta, parametros):
+            yield self._armar_paciente(fila, centros), fila[15], fila[16]
+
+    def buscar(self, dni: int, centros: dict = None) -> tuple | None:
+        """
+    Busca un paciente por DNI directamente en la base.
+
+    params:
+        - dni: Número de documento.
+        - centros: Diccionario nombre -> CentroSalud para vincularlo con su centro (opcional).
+
+    returns:
+        Una tupla (paciente, estado del trasplante, nombre del centro donde se operó o None), o None si no existe.
+        """
+        self.confirmar()
+        fila = self._conexion.execute("SELECT * FROM pacientes WHERE dni = ?", (dni,)).fetchone()
+        return (self._armar_paciente(fila, centros or {}), fila[15], fila[16]) if fila is not None else None
+
+    def tipo_paciente(self, dni: int) -> int | None:
+        """
+        Método auxiliar que devuelve el tipo del paciente guardado con ese DNI (RECEPTOR o DONANTE), o None si no existe.
+        """
+        self.confirmar()
+        fila = self._conexion.execute("SELECT tipo FROM pacientes WHERE dni = ?", (dni,)).fetchone()
+        return fila[0] if fila is not None else None
+
+    def receptores(self, codigo_organo=None, codigo_sangre=None, centro: str = None, centros: dict = None,
+                   estado_trasplante: str = None):
+        """
+    Recorre los receptores guardados, con filtros opcionales que usan los índices de la tabla.
+
+    params:
+        - codigo_organo: TipoOrgano que necesitan (opcional).
+        - codigo_sangre: GrupoSanguineo del receptor (opcional).
+        - centro: Nombre del centro de salud (opcional).
+        - centros: Diccionario nombre -> CentroSalud para vincularlos con su centro (opcional).
+        - estado_trasplante: Estado del trasplante (opcional, por ejemplo RegistroDNI.EN_ESPERA).
+
+    returns:
+        Un generador de Receptores.
+        """
+        self.confirmar()
+        condiciones, parametros = ["tipo = ?"], [self.RECEPTOR]
+        for columna, valor in (("codigo_organo", codigo_organo), ("codigo_sangre", codigo_sangre), ("centro", centro),
+                               ("estado_trasplante", estado_trasplante)):
+            if valor is not None:
+                condiciones.append(f"{columna} = ?")
+                parametros.append(int(valor) if columna.startswith("codigo") else valor)
+        consulta = f"SELECT * FROM pacientes WHERE {' AND '.join(condiciones)} ORDER BY rowid"
+        for fila in self._conexion.execute(consulta, parametros):
+            yield self._armar_paciente(fila, centros or {})
+
+    def receptores_por_prioridad(self, centro: str, estado: str, centros: dict = None, omitir=frozenset()):
+        """
+    Recorre los receptores guardados de un centro con un estado clínico, ordenados por prioridad (la misma regla
+    que prioridad_receptor: el más joven primero y después el que lleva más tiempo en espera; los empates en el
+    orden en que se guardaron). El orden sale del índice pacientes_prioridad, sin ordenar en memoria.
+
+    Es para listarlos: los receptores se arman sin los órganos que ya recibieron.
+
+    params:
+        - centro: Nombre del centro de salud.
+        - estado: Estado clínico ("inestable" o "estable", sin importar mayúsculas).
+        - centros: Diccionario nombre -> CentroSalud para vincularlos con su centro (opcional).
+        - omitir: DNIs que no se devuelven (por ejemplo, los de receptores ya cargados).
+
+    returns:
+        Un generador de Receptores.
+        """
+        self.confirmar()
+        for fila in self._conexion.execute(self.RECEPTORES_POR_PRIORIDAD, (centro, self.RECEPTOR, estado.lower())):
+            if fila[0] not in omitir:
+                yield self._armar_paciente(fila, centros or {}, recibidos=False)
+
+    def receptores_en_espera(self, codigo_organo=None, codigo_sangre=None, centro: str = None, centros: dict = None):
+        """
+    Recorre los receptores en espera guardados (ver receptores).
+
+    returns:
+        Un generador de Receptores.
+        """
+        return self.receptores(codigo_organo, codigo_sangre, centro, centros, RegistroDNI.EN_ESPERA)
+
+    def resultados_por_centro(self) -> dict[str, tuple[int, int]]:
+        """
+    Cuenta las cirugías guardadas de cada centro.
+
+    returns:
+        Un diccionario nombre del centro -> (exitosas, fallidas).
+        """
+        self.confirmar()
+        return {centro: (exitosas, total - exitosas) for centro, exitosas, total in self._conexion.execute(
+            "SELECT centro, SUM(exitoso), COUNT(*) FROM resultados GROUP BY centro")}
+
+    def cantidad_pacientes(self) -> int:
+        """
+        Método auxiliar que devuelve cuántos pacientes hay guardados.
+        """
+        self.confirmar()
+        return self._conexion.execute("SELECT COUNT(*) FROM pacientes").fetchone()[0]
+
+    def cerrar(self):
+        """
+        Método auxiliar que confirma lo pendiente y cierra la conexión.
+        """
+        self.confirmar()
+        self._conexion.close()
+
+    def __enter__(self):
+        """
+        Método mágico para usar el almacén con `with`: al salir se confirma lo pendiente y se cierra.
+        """
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        """
+        Método mágico que cierra el almacén al salir del `with` (si hubo un error, descarta lo pendiente).
+        """
+        if tipo is not None:
+            for filas in self._pendientes.values():
+                filas.clear()
+            self._cantidad_pendientes = 0
+        self.cerrar()
+        return False
@@ -0,0 +1,289 @@
+import os
+import json
+import time
+from datetime import datetime
+from pacientes.Receptores import Receptores
+from pacientes.Donantes import Donantes
+from organos.Organos import Organos
+
+
+class DiarioEventos:
+
+    #tipos de evento, cada uno con quien lo emite
+    RECEPTOR = "receptor" #INCUCAI registro un receptor (con todos sus datos)
+    DONANTE = "donante" #INCUCAI registro un donante (con sus organos a donar)
+    ORGANO_ASIGNADO = "organo_asignado" #INCUCAI paso un organo de un donante a un receptor
+    DONANTE_QUITADO = "donante_quitado" #INCUCAI dio de baja a un donante sin organos
+    ESTADO = "estado" #INCUCAI cambio el estado del trasplante de un paciente
+    TRASLADO = "traslado" #un CentroSalud despacho un vehiculo
+    CIRUJANO_OPERO = "cirujano_opero" #un Cirujanos empezo una cirugia y paso a recuperacion
+    CIRUGIA = "cirugia" #un CentroSalud registro el resultado de una cirugia
+    CARGA = "carga" #INCUCAI cargo un paciente del almacen, con el estado de su trasplante
+
+    TAMAÑO_COLA = 1 << 16 #bytes que se leen de una vez al buscar el final del archivo
+
+    def __init__(self, ruta: str | None, eventos_por_fsync: int = 256, segundos_por_fsync: float = 0.5):
+        """
+    Diario de eventos de solo agregado: cada cambio de estado de INCUCAI, de los centros de salud y de los
+    cirujanos se escribe como una línea JSON con un número de secuencia. Si el sistema se corta, el estado
+    se reconstruye reproduciendo los eventos (INCUCAI.reproducir_diario) desde el último punto guardado.
+
+    Los eventos no van al disco de a uno: se juntan en memoria y se escriben y sincronizan (fsync) juntos cuando
+    hay `eventos_por_fsync` pendientes o pasaron `segundos_por_fsync` desde la última sincronización. Ante un
+    corte se pierden, como mucho, los eventos de ese último lote; una línea a medio escribir se descarta al abrir.
+
+    Los objetos (centros, cirujanos, vehículos) se escriben por su clave, que se asigna con nombrar().
+
+    params:
+        - ruta: Archivo del diario (se crea si no existe; si existe, se sigue agregando al final). Con None los
+          eventos quedan en memoria (ver lineas()), por ejemplo para juntar los de un proceso trabajador.
+        - eventos_por_fsync: Cantidad de eventos pendientes que dispara una escritura con fsync.
+        - segundos_por_fsync: Tiempo máximo que un evento puede quedar pendiente (se revisa al registrar otro).
+        """
+        if eventos_por_fsync < 1:
+            raise ValueError("La cantidad de eventos por fsync debe ser al menos 1.")
+        if segundos_por_fsync < 0:
+            raise ValueError("El tiempo entre fsync no puede ser negativo.")
+        self.ruta = ruta
+        self.eventos_por_fsync = eventos_por_fsync
+        self.segundos_por_fsync = segundos_por_fsync
+        self._claves: dict[int, str] = {} #id del objeto -> clave
+        self._objetos: dict[str, object] = {} #clave -> objeto, para reproducir
+        self._pendientes: list[str] = []
+        self._memoria: list[str] = [] #eventos ya escritos, si el diario no tiene archivo
+        self._codificador = json.JSONEncoder(default=self._convertir, ensure_ascii=False, separators=(",", ":")) #uno solo, armarlo en cada evento costaba mas que codificar
+        self.ultima_secuencia = self._reparar_final()
+        self._archivo = open(ruta, "ab") if ruta is not None else None
+        self._ultimo_fsync = time.monotonic()
+        self.sincronizaciones = 0
+
+    def _reparar_final(self) -> int:
+        """
+        Método auxiliar que corta una última línea incompleta (de un corte a mitad de escritura) y devuelve
+        el número de secuencia del último evento completo, leyendo solo el final del archivo.
+        """
+        if self.ruta is None or not os.path.exists(self.ruta):
+            return 0
+        with open(self.ruta, "r+b") as archivo:
+            fin = archivo.seek(0, os.SEEK_END)
+            cola, posicion = b"", fin
+            while posicion > 0 and cola.count(b"\n") < 2:
+                leer = min(self.TAMAÑO_COLA, posicion)
+                posicion -= leer
+                archivo.seek(posicion)
+                cola = archivo.read(leer) + cola
+            if cola and not cola.endswith(b"\n"):
+                corte = cola.rfind(b"\n") + 1
+                archivo.truncate(posicion + corte)
+                cola = cola[:corte]
+            lineas = cola.splitlines()
+            return json.loads(lineas[-1])["n"] if lineas else 0
+
+    def nombrar(self, objeto, clave: str):
+        """
+    Asigna la clave con la que un objeto aparece en los eventos. Si el objeto ya tenía clave, se conserva
+    (asi un cirujano o un vehículo compartido entre centros queda con la primera).
+
+    params:
+        - objeto: CentroSalud, Cirujanos o vehículo.
+        - clave: Texto que lo identifica entre ejecuciones (por ejemplo, nombre del centro y posición).
+        """
+        if id(objeto) not in self._claves:
+            self._claves[id(objeto)] = clave
+            self._objetos[clave] = objeto
+
+    def clave(self, objeto) -> str:
+        """
+        Método auxiliar que devuelve la clave de un objeto nombrado.
+        """
+        return self._claves[id(objeto)]
+
+    def objeto(self, clave: str):
+        """
+        Método auxiliar que devuelve el objeto de una clave (None si no hay ninguno con esa clave).
+        """
+        return self._objetos.get(clave)
+
+    def _convertir(self, valor):
+        """
+        Método auxiliar para json.dumps: las fechas van en ISO y los objetos nombrados por su clave.
+        """
+        if isinstance(valor, datetime):
+            return valor.isoformat()
+        clave = self._claves.get(id(valor))
+        if clave is None:
+            raise ValueError(f"El objeto {valor} no tiene clave en el diario.")
+        return clave
+
+    def registrar(self, tipo: str, **datos):
+        """
+    Agrega un evento al diario.
+
+    params:
+        - tipo: Tipo de evento (una de las constantes de la clase).
+        - datos: Datos del evento. Las fechas se guardan en ISO y los objetos nombrados por su clave.
+
+    returns:
+        El número de secuencia del evento.
+        """
+        self.ultima_secuencia += 1
+        datos["n"] = self.ultima_secuencia
+        datos["t"] = tipo
+        self._pendientes.append(self._codificador.encode(datos))
+        if len(self._pendientes) >= self.eventos_por_fsync or time.monotonic() - self._ultimo_fsync >= self.segundos_por_fsync:
+            self.sincronizar()
+        return self.ultima_secuencia
+
+    def agregar_lineas(self, lineas: list[str]):
+        """
+    Agrega eventos ya codificados por otro diario (por ejemplo, el de un proceso trabajador) sin volver a leerlos
+    ni codificarlos: solo se les cambia el número de secuencia por el que les toca en este diario. Se escriben
+    juntos, como un solo lote.
+
+    params:
+        - lineas: Líneas JSON escritas por registrar() de otro diario, en orden.
+
+    precon:
+        - Los objetos de los eventos tienen que tener la misma clave en los dos diarios.
+        """
+        for linea in lineas:
+            cuerpo, _, cola = linea.rpartition(',"n":') #registrar() deja "n" y "t" al final, fuera de cualquier texto
+            self.ultima_secuencia += 1
+            self._pendientes.append(f'{cuerpo},"n":{self.ultima_secuencia}{cola[cola.index(","):]}')
+        if len(self._pendientes) >= self.eventos_por_fsync or time.monotonic() - self._ultimo_fsync >= self.segundos_por_fsync:
+            self.sincronizar()
+
+    def sincronizar(self):
+        """
+    Escribe los eventos pendientes en una sola escritura y espera a que lleguen al disco (fsync).
+        """
+        if self._pendientes and self._archivo is None:
+            self._memoria.extend(self._pendientes)
+            self._pendientes.clear()
+        elif self._pendientes:
+            self._pendientes.append("")
+            self._archivo.write("\n".join(self._pendientes).encode("utf-8"))
+            self._pendientes.clear()
+            self._archivo.flush()
+            os.fsync(self._archivo.fileno())
+            self.sincronizaciones += 1
+        self._ultimo_fsync = time.monotonic()
+
+    def leer(self, desde: int = 0):
+        """
+    Recorre los eventos del diario en orden, sin cargarlos todos a la vez.
+
+    params:
+        - desde: Número de secuencia del último evento que ya está aplicado (por ejemplo, el de una foto
+          del estado); se devuelven solo los posteriores.
+
+    returns:
+        Un generador de diccionarios con "n" (secuencia), "t" (tipo) y los datos del evento.
+        """
+        self.sincronizar()
+        if self._archivo is None:
+            for linea in self._memoria:
+                evento = json.loads(linea)
+                if evento["n"] > desde:
+                    yield evento
+            return
+        with open(self.ruta, "rb") as archivo:
+            for linea in archivo:
+                if not linea.endswith(b"\n"): #linea cortada, no llego a escribirse entera
+                    return
+                evento = json.loads(linea)
+                if evento["n"] > desde:
+                    yield evento
+
+    def lineas(self) -> list[str]:
+        """
+        Método auxiliar que devuelve los eventos de un diario en memoria como líneas JSON, en orden.
+        """
+        self.sincronizar()
+        return self._memoria
+
+    @staticmethod
+    def _fecha(texto: str | None) -> datetime | None:
+        """
+        Método auxiliar que lee una fecha guardada en ISO (None queda None).
+        """
+        return datetime.fromisoformat(texto) if texto is not None else None
+
+    @staticmethod
+    def datos_paciente(paciente: Receptores | Donantes) -> dict:
+        """
+    Arma los datos del evento de alta de un paciente, con todo lo necesario para volver a crearlo.
+
+    params:
+        - paciente: Receptor o donante.
+
+    returns:
+        Un diccionario con los datos del paciente y el nombre de su centro.
+        """
+        datos = {
+            "dni": paciente.DNI, "nombre": paciente.nombre, "sexo": paciente.sexo, "nacimiento": paciente.nacimiento,
+            "sangre": paciente.Tsangre, "telefono": paciente.telefono,
+            "centro": paciente.centro_de_salud.nombre if paciente.centro_de_salud is not None else None,
+        }
+        if isinstance(paciente, Receptores):
+            datos.update(organo=paciente.organo_a_recibir, fecha_en_espera=paciente.fecha_en_espera,
+                         patologia=paciente.patologia, estado=paciente.estado,
+                         recibidos=[(organo.tipo_de_organo, organo.fecha_ablacion) for organo in paciente.organos_a_disposicion])
+        else:
+            datos.update(fallecimiento=paciente.fhfallecimiento,
+                         organos=[organo.tipo_de_organo for organo in paciente.organos_a_donar])
+        return datos
+
+    @classmethod
+    def armar_paciente(cls, evento: dict, centros: dict) -> Receptores | Donantes:
+        """
+    Vuelve a crear un paciente a partir de su evento de alta y lo vincula a su centro.
+
+    params:
+        - evento: Evento RECEPTOR o DONANTE.
+        - centros: Diccionario nombre -> CentroSalud.
+
+    returns:
+        El Receptores o Donantes.
+        """
+        if evento["t"] == cls.RECEPTOR:
+            paciente = Receptores(evento["nombre"], evento["dni"], evento["sexo"], cls._fecha(evento["nacimiento"]),
+                                  evento["sangre"], evento["telefono"], evento["organo"],
+                                  cls._fecha(evento["fecha_en_espera"]), evento["patologia"])
+            paciente.estado = evento["estado"]
+            for tipo_organo, ablacion in evento["recibidos"]:
+                recibido = Organos(tipo_organo)
+                recibido.fecha_ablacion = cls._fecha(ablacion)
+                paciente.organos_a_disposicion.append(recibido)
+        else:
+            paciente = Donantes(evento["nombre"], evento["dni"], evento["sexo"], cls._fecha(evento["nacimiento"]),
+                                evento["sangre"], evento["telefono"], cls._fecha(evento["fallecimiento"]),
+                                [Organos(tipo_organo) for tipo_organo in evento["organos"]])
+
+        centro = centros.get(evento["centro"])
+        if centro is not None:
+            paciente.centro_de_salud = centro
+            paciente.partido = centro.partido
+            paciente.provincia = centro.provincia
+        return paciente
+
+    def cerrar(self):
+        """
+        Método auxiliar que sincroniza lo pendiente y cierra el archivo.
+        """
+        self.sincronizar()
+        if self._archivo is not None:
+            self._archivo.close()
+
+    def __enter__(self):
+        """
+        Método mágico para usar el diario con `with`: al salir se sincroniza y se cierra.
+        """
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        """
+        Método mágico que cierra el diario al salir del `with`.
+        """
+        self.cerrar()
+        return False
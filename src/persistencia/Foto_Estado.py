@@ -0,0 +1,158 @@
+import gc
+import os
+import contextlib
+import mmap
+import pickle
+import struct
+from incucai.INCUCAI import INCUCAI
+from persistencia.Almacen_SQLite import AlmacenSQLite
+from persistencia.Diario_Eventos import DiarioEventos
+
+
+@contextlib.contextmanager
+def _sin_recolector():
+    """
+    Suspende el recolector de basura mientras se guarda o se carga una foto: se crean millones de objetos de una
+    vez y ninguno es basura, asi que el recolector solo demoraría (con él activo, cargar tarda el triple).
+    """
+    activo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if activo:
+            gc.enable()
+
+
+class FotoEstado:
+
+    MAGIA = b"INCUCAIF" #primeros bytes del archivo, para reconocerlo
+    VERSION = 1 #se cambia si cambia el formato; una foto de otra version no se carga
+    ENCABEZADO = struct.Struct("<8sHxxIQQ") #magia, version, cantidad de buffers, secuencia del diario, bytes del grafo
+    BUFFER = struct.Struct("<QQ") #posicion y largo de cada buffer
+    ALINEACION = 64 #los buffers empiezan en multiplos de 64 bytes, asi los arrays de NumPy quedan alineados
+
+    def __init__(self, ruta: str):
+        """
+    Foto binaria de todo el estado de INCUCAI (centros, pacientes, órganos, cirujanos con su última cirugía,
+    vehículos con su registro de viajes, índices, listas de espera y matriz de distancias), para arrancar
+    sin volver a cargar y procesar todo desde cero.
+
+    El grafo de objetos se guarda con pickle (protocolo 5), que respeta la identidad: un cirujano o un vehículo
+    compartido entre centros vuelve a ser un solo objeto. Los arrays de NumPy (tabla de receptores, viajes,
+    distancias) van aparte, como bytes crudos alineados; al cargar, el archivo se mapea en memoria (mmap) en
+    modo copia al escribir, asi esos arrays no se copian ni se leen hasta que se usan, y modificarlos no
+    cambia el archivo.
+
+    El almacén y el diario no forman parte de la foto: se indican al cargarla. La foto guarda el número de
+    secuencia del diario al momento de sacarla, para reproducir después solo los eventos posteriores.
+
+    params:
+        - ruta: Archivo de la foto.
+        """
+        self.ruta = ruta
+        self.secuencia = 0 #ultimo evento del diario incluido en la foto
+
+    def existe(self) -> bool:
+        """
+        Método auxiliar que indica si ya hay una foto guardada en la ruta.
+        """
+        return os.path.exists(self.ruta)
+
+    def _alinear(self, posicion: int) -> int:
+        """
+        Método auxiliar que redondea una posición hacia arriba al múltiplo de ALINEACION.
+        """
+        return -(-posicion // self.ALINEACION) * self.ALINEACION
+
+    def guardar(self, incucai: INCUCAI) -> int:
+        """
+    Saca una foto del estado de INCUCAI. Se escribe en un archivo aparte y recién al terminar reemplaza a la
+    foto anterior, asi un corte a mitad de camino no deja una foto rota.
+
+    params:
+        - incucai: Sistema a guardar.
+
+    returns:
+        La cantidad de bytes de la foto.
+        """
+        diario, almacen = incucai.diario, incucai.almacen
+        if diario is not None:
+            diario.sincronizar()
+            self.secuencia = diario.ultima_secuencia
+        if almacen is not None:
+            almacen.confirmar()
+
+        buffers = []
+        incucai._conectar_diario(None) #el almacen y el diario son archivos abiertos, no van en la foto
+        incucai.almacen = None
+        try:
+            with _sin_recolector():
+                grafo = pickle.dumps(incucai, protocol=5, buffer_callback=buffers.append)
+        finally:
+            incucai._conectar_diario(diario)
+            incucai.almacen = almacen
+        crudos = [buffer.raw() for buffer in buffers]
+
+        posicion = self._alinear(self.ENCABEZADO.size + self.BUFFER.size * len(crudos) + len(grafo))
+        tabla = []
+        for crudo in crudos:
+            tabla.append((posicion, crudo.nbytes))
+            posicion = self._alinear(posicion + crudo.nbytes)
+
+        temporal = self.ruta + ".tmp"
+        with open(temporal, "wb") as archivo:
+            archivo.write(self.ENCABEZADO.pack(self.MAGIA, self.VERSION, len(crudos), self.secuencia, len(grafo)))
+            for entrada in tabla:
+                archivo.write(self.BUFFER.pack(*entrada))
+            archivo.write(grafo)
+            for (inicio, _), crudo in zip(tabla, crudos):
+                archivo.write(b"\0" * (inicio - archivo.tell()))
+                archivo.write(crudo)
+            tamaño = archivo.tell()
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        os.replace(temporal, self.ruta)
+        return tamaño
+
+    def cargar(self, almacen: AlmacenSQLite = None, diario: DiarioEventos = None) -> INCUCAI:
+        """
+    Restaura el estado de INCUCAI desde la foto.
+
+    params:
+        - almacen: AlmacenSQLite que usa el sistema restaurado (opcional).
+        - diario: DiarioEventos que usa el sistema restaurado (opcional). Para seguir desde donde quedó,
+          después hay que reproducir los eventos posteriores: incucai.reproducir_diario(foto.secuencia).
+
+    precon:
+        - Si se indica un diario, no debe tener objetos nombrados de otro INCUCAI.
+
+    returns:
+        El INCUCAI restaurado.
+        """
+        with open(self.ruta, "rb") as archivo:
+            mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_COPY) #los arrays quedan sobre el archivo, sin copiarlos
+        vista = memoryview(mapa)
+        if len(vista) < self.ENCABEZADO.size:
+            raise ValueError(f"{self.ruta} no es una foto de INCUCAI.")
+        magia, version, cantidad, secuencia, largo = self.ENCABEZADO.unpack_from(vista)
+        if magia != self.MAGIA:
+            raise ValueError(f"{self.ruta} no es una foto de INCUCAI.")
+        if version != self.VERSION:
+            raise ValueError(f"La foto {self.ruta} es de la versión {version} y se soporta la {self.VERSION}.")
+
+        inicio = self.ENCABEZADO.size + self.BUFFER.size * cantidad
+        tabla = [self.BUFFER.unpack_from(vista, self.ENCABEZADO.size + self.BUFFER.size * i) for i in range(cantidad)]
+        if inicio + largo > len(vista) or any(posicion + tamaño > len(vista) for posicion, tamaño in tabla):
+            raise ValueError(f"La foto {self.ruta} está incompleta.")
+        buffers = [vista[posicion:posicion + tamaño] for posicion, tamaño in tabla]
+
+        mapa.seek(inicio) #el grafo se lee directo del mapa, sin copiarlo a otro buffer
+        with _sin_recolector():
+            incucai = pickle.Unpickler(mapa, buffers=buffers).load()
+
+        self.secuencia = secuencia
+        incucai.almacen = almacen
+        if diario is not None:
+            incucai._conectar_diario(diario) #las claves del diario son por objeto, hay que darselas a los restaurados
+        return incucai
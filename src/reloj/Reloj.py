@@ -0,0 +1,83 @@
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+
+
+class Reloj(ABC):
+    """
+    Fuente de la hora actual para todo el sistema (recuperación de cirujanos, ablación de órganos, etc.).
+    En lugar de llamar a datetime.now() directamente, cada módulo le pide la hora a su reloj, asi una
+    simulación puede usar un reloj virtual que avanza al instante.
+    """
+
+    @abstractmethod
+    def ahora(self) -> datetime:
+        """
+        Devuelve la fecha y hora actual según este reloj.
+        """
+        pass
+
+    def horas_desde(self, fecha: datetime) -> float:
+        """
+        Método auxiliar que devuelve cuántas horas pasaron desde una fecha hasta ahora.
+        """
+        return (self.ahora() - fecha).total_seconds() / 3600
+
+
+class RelojReal(Reloj):
+    """
+    Reloj de pared: la hora del sistema operativo.
+    """
+
+    def ahora(self) -> datetime:
+        return datetime.now()
+
+    def __reduce__(self):
+        """
+        Método mágico para pickle: todos los relojes reales son iguales, asi que al restaurar una foto del estado se usa RELOJ_REAL.
+        """
+        return "RELOJ_REAL"
+
+
+class RelojVirtual(Reloj):
+
+    def __init__(self, inicio: datetime = None):
+        """
+    Reloj simulado que solo avanza cuando se lo pide, asi se pueden simular meses de operaciones en segundos.
+
+    params:
+        - inicio: Fecha y hora inicial (por defecto, la hora real al crearlo).
+        """
+        self._actual = inicio or datetime.now()
+
+    def ahora(self) -> datetime:
+        return self._actual
+
+    def avanzar(self, horas: float = 0, **intervalo):
+        """
+    Adelanta el reloj.
+
+    params:
+        - horas: Horas a adelantar.
+        - intervalo: Otros argumentos de timedelta (days, minutes, ...), opcionales.
+
+    precon:
+        - El intervalo no puede ser negativo: el tiempo no vuelve atrás.
+        """
+        paso = timedelta(hours=horas, **intervalo)
+        if paso < timedelta(0):
+            raise ValueError("El reloj virtual no puede retroceder.")
+        self._actual += paso
+
+    def establecer(self, fecha: datetime):
+        """
+    Lleva el reloj a una fecha dada, que no puede ser anterior a la actual.
+
+    params:
+        - fecha: Nueva fecha y hora del reloj.
+        """
+        if fecha < self._actual:
+            raise ValueError("El reloj virtual no puede retroceder.")
+        self._actual = fecha
+
+
+RELOJ_REAL = RelojReal() #reloj por defecto de todos los modulos
@@ -4,6 +4,8 @@ import random as rnd
 
 class Auto(Vehiculos):
 
+    __slots__ = () #no agrega atributos, asi tampoco tiene __dict__
+
     def __init__(self, velocidad_viajes, identificador):
         super().__init__(velocidad_viajes, identificador)
         """
@@ -39,11 +41,7 @@ class Auto(Vehiculos):
             if self.velocidad_viajes == 0:
                 raise ValueError("La velocidad del vehículo no puede ser cero.")
             tiempo = (distancia / self.velocidad_viajes) +nivel_trafico
-            self.registro_viajes.append({
-                'distancia': distancia,
-                'nivel_trafico': nivel_trafico,
-                'tiempo': tiempo
-            })
+            self.registro_viajes.agregar(distancia, nivel_trafico, tiempo)
             # FIX: Usar = en lugar de ==
-            self.disponibilidad = "Disponible"
+            self.disponibilidad = EstadoVehiculo.DISPONIBLE
             return tiempo
@@ -3,6 +3,8 @@ from typing import override
 
 
 class Avion(Vehiculos):
+
+    __slots__ = () #no agrega atributos, asi tampoco tiene __dict__
     
     
     def __init__(self, velocidad_viajes, identificador):
@@ -34,6 +36,6 @@ class Avion(Vehiculos):
         returns:
             Tiempo estimado del viaje calculado por el método protegido _despacho_default().
         """
-        self.disponibilidad = "Disponible"
+        self.disponibilidad = EstadoVehiculo.DISPONIBLE
         return self._despacho_default(distancia, nivel_trafico) 
     
\ No newline at end of file
@@ -0,0 +1,91 @@
+import heapq
+from codigos.Codigos import EstadoVehiculo
+from vehiculos.Vehiculos import Vehiculos
+
+
+class FlotaVehiculos:
+
+    def __init__(self, vehiculos: list[Vehiculos] = None):
+        """
+    Índice de la flota de un centro de salud: para cada clase de vehículo (Auto, Helicoptero, Avion) guarda
+    una cola de prioridad (heap) con los vehículos libres, del más rápido al más lento. A igual velocidad
+    sale primero el que se agregó antes a la flota.
+
+    Tomar y liberar un vehículo es O(log n). Si un vehículo se marca como ocupado por fuera del índice,
+    su entrada se descarta cuando llega al tope (borrado perezoso).
+
+    params:
+        - vehiculos: Vehículos iniciales de la flota (opcional).
+        """
+        self._libres: dict[type, list[tuple]] = {} #clase -> heap de (-velocidad, posicion, vehiculo)
+        self._posiciones: dict[Vehiculos, int] = {} #vehiculo -> orden en que se agrego, desempata a igual velocidad
+        self._en_heap: set[Vehiculos] = set() #vehiculos con una entrada en su heap, para no duplicarlas
+        for vehiculo in vehiculos or []:
+            self.agregar(vehiculo)
+
+    def agregar(self, vehiculo: Vehiculos):
+        """
+    Incorpora un vehículo a la flota. Si está disponible, queda listo para despachar.
+
+    params:
+        - vehiculo: Auto, Helicoptero o Avion.
+        """
+        if vehiculo in self._posiciones:
+            return
+        self._posiciones[vehiculo] = len(self._posiciones)
+        if vehiculo.disponibilidad is EstadoVehiculo.DISPONIBLE:
+            self.liberar(vehiculo)
+
+    def liberar(self, vehiculo: Vehiculos):
+        """
+    Marca un vehículo como disponible y lo vuelve a poner en la cola de su clase. O(log n).
+
+    params:
+        - vehiculo: Vehículo de la flota que terminó su viaje.
+        """
+        vehiculo.disponibilidad = EstadoVehiculo.DISPONIBLE
+        if vehiculo not in self._en_heap:
+            self._en_heap.add(vehiculo)
+            heap = self._libres.setdefault(type(vehiculo), [])
+            heapq.heappush(heap, (-vehiculo.velocidad_viajes, self._posiciones[vehiculo], vehiculo))
+
+    def tomar(self, clase: type) -> Vehiculos | None:
+        """
+    Saca de la cola el vehículo libre más rápido de una clase y lo marca como ocupado. O(log n) amortizado.
+
+    params:
+        - clase: Clase de vehículo pedida (Auto, Helicoptero o Avion).
+
+    returns:
+        El vehículo, o None si no hay ninguno libre de esa clase.
+        """
+        heap = self._libres.get(clase)
+        while heap:
+            _, _, vehiculo = heapq.heappop(heap)
+            self._en_heap.discard(vehiculo)
+            if vehiculo.disponibilidad is EstadoVehiculo.DISPONIBLE:
+                vehiculo.disponibilidad = EstadoVehiculo.OCUPADO
+                return vehiculo
+        return None
+
+    def hay_libre(self, clase: type) -> bool:
+        """
+    Indica si la flota tiene algún vehículo libre de una clase, sin sacarlo de la cola.
+
+    params:
+        - clase: Clase de vehículo (Auto, Helicoptero o Avion).
+
+    returns:
+        True si hay al menos uno disponible, False si no.
+        """
+        heap = self._libres.get(clase)
+        while heap and heap[0][2].disponibilidad is not EstadoVehiculo.DISPONIBLE: #descartar los que se ocuparon por fuera
+            _, _, vehiculo = heapq.heappop(heap)
+            self._en_heap.discard(vehiculo)
+        return bool(heap)
+
+    def __len__(self):
+        """
+        Método mágico que devuelve la cantidad de vehículos de la flota.
+        """
+        return len(self._posiciones)
@@ -0,0 +1,241 @@
+import numpy as np
+
+
+class _CuantilP2:
+
+    __slots__ = ('p', '_primeros', '_alturas', '_posiciones', '_deseadas', '_incrementos')
+
+    def __init__(self, p: float):
+        """
+    Estimador de un cuantil sobre un flujo de datos con el algoritmo P² (Jain y Chlamtac): guarda solo cinco
+    marcadores, asi agregar un dato y leer el cuantil son O(1) sin guardar los datos.
+
+    params:
+        - p: Cuantil buscado, entre 0 y 1 (por ejemplo 0.95).
+        """
+        self.p = p
+        self._primeros: list[float] = [] #hasta juntar 5 datos se guarda todo y el cuantil es exacto
+        self._alturas = None
+        self._posiciones = None
+        self._deseadas = None
+        self._incrementos = None
+
+    def agregar(self, valor: float):
+        """
+        Método auxiliar que incorpora un dato y ajusta los marcadores.
+        """
+        if self._alturas is None:
+            self._primeros.append(valor)
+            if len(self._primeros) == 5:
+                self._alturas = sorted(self._primeros)
+                self._posiciones = [0, 1, 2, 3, 4]
+                self._deseadas = [0.0, 2 * self.p, 4 * self.p, 2 + 2 * self.p, 4.0]
+                self._incrementos = (0.0, self.p / 2, self.p, (1 + self.p) / 2, 1.0)
+            return
+
+        q, n = self._alturas, self._posiciones
+        if valor < q[0]:
+            q[0] = valor
+            k = 0
+        elif valor >= q[4]:
+            q[4] = valor
+            k = 3
+        else:
+            k = next(i for i in range(1, 5) if valor < q[i]) - 1
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._deseadas[i] += self._incrementos[i]
+
+        for i in range(1, 4): #mover los marcadores del medio hacia su posicion deseada
+            d = self._deseadas[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                parabolica = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                if q[i - 1] < parabolica < q[i + 1]:
+                    q[i] = parabolica
+                else:
+                    q[i] = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                n[i] += d
+
+    def valor(self) -> float | None:
+        """
+        Método auxiliar que devuelve el cuantil estimado (None si todavía no hay datos).
+        """
+        if self._alturas is not None:
+            return self._alturas[2]
+        if not self._primeros:
+            return None
+        ordenados = sorted(self._primeros)
+        return ordenados[min(len(ordenados) - 1, int(self.p * len(ordenados)))]
+
+
+class RegistroViajes:
+
+    TIPO = np.dtype([('distancia', 'f8'), ('nivel_trafico', 'i1'), ('tiempo', 'f8')]) #17 bytes por viaje
+    SIN_TRAFICO = -1 #nivel_trafico de los viajes sin trafico (helicopteros y aviones)
+    CAPACIDAD_INICIAL = 8 #el buffer arranca chico y se duplica hasta la capacidad; sin viajes no se reserva nada
+
+    __slots__ = ('capacidad', 'ruta_volcado', '_viajes', '_inicio', '_en_memoria',
+                 'cantidad', 'distancia_total', 'tiempo_total', 'volcados', '_p95', '_trafico')
+
+    def __init__(self, capacidad: int = 256, ruta_volcado: str = None):
+        """
+    Registro de los viajes de un vehículo en un buffer circular de NumPy (una fila de 17 bytes por viaje)
+    con estadísticas que se actualizan en cada viaje: cantidad, distancia total, tiempo promedio, percentil 95
+    del tiempo y distribución del tráfico. Todas se leen en O(1), sin recorrer los viajes.
+
+    Cuando el buffer se llena, si hay una ruta de volcado los viajes se agregan a ese archivo y el buffer se
+    vacía; si no, cada viaje nuevo pisa al más viejo. Las estadísticas siempre cuentan todos los viajes.
+
+    params:
+        - capacidad: Cantidad máxima de viajes en memoria.
+        - ruta_volcado: Archivo binario donde se agregan los viajes que salen del buffer (opcional).
+        """
+        if capacidad < 1:
+            raise ValueError("La capacidad del registro de viajes debe ser al menos 1.")
+        self.capacidad = capacidad
+        self.ruta_volcado = ruta_volcado
+        self._viajes = None #se crea con el primer viaje
+        self._inicio = 0 #posicion del viaje mas viejo en el buffer
+        self._en_memoria = 0
+        self.cantidad = 0
+        self.distancia_total = 0.0
+        self.tiempo_total = 0.0
+        self.volcados = 0 #viajes escritos en ruta_volcado
+        self._p95 = None #_CuantilP2, se crea con el primer viaje
+        self._trafico: dict[int | None, int] = None #nivel de trafico -> cantidad de viajes, se crea con el primer viaje
+
+    def agregar(self, distancia: float, nivel_trafico: int | None, tiempo: float):
+        """
+    Registra un viaje y actualiza las estadísticas. O(1) amortizado.
+
+    params:
+        - distancia: Distancia recorrida (km).
+        - nivel_trafico: Nivel de tráfico del viaje, o None si no aplica.
+        - tiempo: Horas que tardó el viaje.
+        """
+        if self._viajes is None: #primer viaje
+            self._viajes = np.empty(min(self.CAPACIDAD_INICIAL, self.capacidad), dtype=self.TIPO)
+            self._p95 = _CuantilP2(0.95)
+            self._trafico = {}
+        elif self._en_memoria == len(self._viajes) < self.capacidad: #todavia no dio la vuelta, asi que esta en orden
+            viajes = np.empty(min(2 * len(self._viajes), self.capacidad), dtype=self.TIPO)
+            viajes[:self._en_memoria] = self._viajes
+            self._viajes = viajes
+
+        self.cantidad += 1
+        self.distancia_total += distancia
+        self.tiempo_total += tiempo
+        self._p95.agregar(tiempo)
+        self._trafico[nivel_trafico] = self._trafico.get(nivel_trafico, 0) + 1
+
+        fila = (distancia, self.SIN_TRAFICO if nivel_trafico is None else nivel_trafico, tiempo)
+        if self._en_memoria == self.capacidad:
+            if self.ruta_volcado:
+                self.volcar()
+            else: #pisar el viaje mas viejo
+                self._viajes[self._inicio] = fila
+                self._inicio = (self._inicio + 1) % self.capacidad
+                return
+        self._viajes[(self._inicio + self._en_memoria) % len(self._viajes)] = fila
+        self._en_memoria += 1
+
+    def viajes(self) -> np.ndarray:
+        """
+    Devuelve los viajes que están en memoria, del más viejo al más nuevo.
+
+    returns:
+        Un array estructurado con los campos distancia, nivel_trafico (-1 si no aplica) y tiempo.
+        """
+        if self._viajes is None:
+            return np.empty(0, dtype=self.TIPO)
+        orden = (self._inicio + np.arange(self._en_memoria)) % len(self._viajes)
+        return self._viajes[orden]
+
+    def ultimo(self) -> tuple[float, int | None, float] | None:
+        """
+        Método auxiliar que devuelve el último viaje registrado como (distancia, nivel_trafico, tiempo), o None si no hay viajes en memoria.
+        """
+        if not self._en_memoria:
+            return None
+        distancia, nivel_trafico, tiempo = self._viajes[(self._inicio + self._en_memoria - 1) % len(self._viajes)].tolist()
+        return distancia, None if nivel_trafico == self.SIN_TRAFICO else nivel_trafico, tiempo
+
+    def volcar(self):
+        """
+    Agrega los viajes en memoria al archivo de volcado y vacía el buffer.
+
+    precon:
+        - ruta_volcado no debe ser None.
+        """
+        if not self.ruta_volcado:
+            raise ValueError("El registro de viajes no tiene archivo de volcado.")
+        with open(self.ruta_volcado, 'ab') as archivo:
+            self.viajes().tofile(archivo)
+        self.volcados += self._en_memoria
+        self._inicio = 0
+        self._en_memoria = 0
+
+    def leer_volcado(self) -> np.ndarray:
+        """
+    Lee los viajes que se escribieron en el archivo de volcado.
+
+    returns:
+        Un array estructurado con el mismo formato que viajes() (vacío si no hay archivo).
+        """
+        if not self.ruta_volcado:
+            return np.empty(0, dtype=self.TIPO)
+        try:
+            return np.fromfile(self.ruta_volcado, dtype=self.TIPO)
+        except FileNotFoundError:
+            return np.empty(0, dtype=self.TIPO)
+
+    def tiempo_promedio(self) -> float | None:
+        """
+        Método auxiliar que devuelve el tiempo promedio por viaje (None si no hubo viajes). O(1).
+        """
+        return self.tiempo_total / self.cantidad if self.cantidad else None
+
+    def percentil_95(self) -> float | None:
+        """
+        Método auxiliar que devuelve el percentil 95 estimado del tiempo de viaje (None si no hubo viajes). O(1).
+        """
+        return self._p95.valor() if self._p95 is not None else None
+
+    def distribucion_trafico(self) -> dict[int | None, int]:
+        """
+        Método auxiliar que devuelve cuántos viajes hubo con cada nivel de tráfico (None = sin tráfico).
+        """
+        return dict(self._trafico or {})
+
+    def resumen(self) -> dict:
+        """
+    Junta todas las estadísticas del registro.
+
+    returns:
+        Un diccionario con cantidad, distancia_total, tiempo_promedio, percentil_95 y distribucion_trafico.
+        """
+        return {
+            'cantidad': self.cantidad,
+            'distancia_total': self.distancia_total,
+            'tiempo_promedio': self.tiempo_promedio(),
+            'percentil_95': self.percentil_95(),
+            'distribucion_trafico': self.distribucion_trafico(),
+        }
+
+    def __iter__(self):
+        """
+        Método mágico que recorre los viajes en memoria como diccionarios {'distancia', 'nivel_trafico', 'tiempo'},
+        igual que la lista que se usaba antes.
+        """
+        for distancia, nivel_trafico, tiempo in self.viajes().tolist():
+            yield {'distancia': distancia, 'nivel_trafico': None if nivel_trafico == self.SIN_TRAFICO else nivel_trafico, 'tiempo': tiempo}
+
+    def __len__(self):
+        """
+        Método mágico que devuelve la cantidad de viajes en memoria (el total histórico está en `cantidad`).
+        """
+        return self._en_memoria
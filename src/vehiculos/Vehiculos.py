@@ -1,6 +1,11 @@
 from abc import ABC, abstractmethod #uso clase abstracta
+from codigos.Codigos import EstadoVehiculo
+from vehiculos.Registro_Viajes import RegistroViajes
 
 class Vehiculos(ABC):
+
+    __slots__ = ('velocidad_viajes', 'identificador', 'registro_viajes', 'disponibilidad')
+
     def __init__(self, velocidad_viajes, identificador):
         """
         Inicializa un vehículo con su velocidad de viaje y un identificador único.
@@ -18,8 +23,8 @@ class Vehiculos(ABC):
         """
         self.velocidad_viajes = velocidad_viajes
         self.identificador = identificador #El número de patente de una ambulancia. Un nombre de helicóptero ("HELI01", "HELI02") ,Código de un avión de transporte.
-        self.registro_viajes = [] #lista donde guardo los datos de cada viaje que hace el vehiculo
-        self.disponibilidad = "Disponible"
+        self.registro_viajes = RegistroViajes() #buffer circular con los ultimos viajes y sus estadisticas (cantidad, promedio, p95, trafico)
+        self.disponibilidad = EstadoVehiculo.DISPONIBLE
         
     @abstractmethod    
     def despachar(self, distancia, nivel_trafico=3): #abstract method que se implementa o se sobreescribe por las subclases
@@ -55,11 +60,7 @@ class Vehiculos(ABC):
         Tiempo estimado de viaje calculado como distancia dividida por la velocidad del vehículo.
         """
         tiempo = distancia / self.velocidad_viajes
-        self.registro_viajes.append({
-        'distancia': distancia,
-        'nivel_trafico': nivel_trafico,
-        'tiempo': tiempo
-    })
+        self.registro_viajes.agregar(distancia, nivel_trafico, tiempo)
         return tiempo
     
     def __str__(self): #metodo magico que ayuda al orden del codigo si quiero imprimirlo: print(vehiculo1) tengo que crear un vehiculo
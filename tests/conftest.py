@@ -0,0 +1,63 @@
+"""
+Configuración común de las pruebas (pytest).
+
+Uso (desde la raíz del repositorio):
+    python -m pytest tests
+"""
+import contextlib
+import io
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from generador.Generador_Datos import GeneradorDatos
+
+
+def _resumir_estado(incucai) -> dict:
+    """
+    Resume el estado de un INCUCAI en estructuras comparables: registro, centros, vehículos, cirujanos, donantes,
+    receptores, listas de espera e inventario. Dos sistemas con el mismo resumen atienden igual a los pacientes.
+    """
+    return {
+        "registro": sorted((dni, estado, centro.nombre if centro is not None else None)
+                           for dni, (_, estado, centro) in incucai.registro_dni._por_dni.items()),
+        "centros": [(centro.nombre, [p.DNI for p in centro.lista_pacientes], [p.DNI for p in centro.pacientes_exitosos],
+                     [p.DNI for p in centro.pacientes_fallidos]) for centro in incucai.centros_salud],
+        "vehiculos": [(v.registro_viajes.cantidad, round(v.registro_viajes.distancia_total, 6))
+                      for centro in incucai.centros_salud for v in centro.lista_vehiculos],
+        "cirujanos": [(c.ultima_cirugia, c.disponibilidad) for centro in incucai.centros_salud for c in centro.lista_cirujanos],
+        "donantes": [(p.DNI, [o.tipo_de_organo for o in p.organos_a_donar]) for p in incucai.lista_donantes],
+        "receptores": sorted((p.DNI, [(o.tipo_de_organo, o.fecha_ablacion) for o in p.organos_a_disposicion])
+                             for p in incucai.lista_receptores),
+        "espera": sorted(p.DNI for p in incucai.listas_espera.receptores_en_espera()),
+        "inventario": len(incucai.inventario_organos),
+    }
+
+
+@pytest.fixture
+def estado_incucai():
+    """
+    Devuelve la función que resume el estado de un INCUCAI (ver _resumir_estado).
+    """
+    return _resumir_estado
+
+
+@pytest.fixture
+def sin_mensajes():
+    """
+    Descarta lo que el sistema imprime (traslados y cirugías) mientras dura la prueba.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+@pytest.fixture
+def escenario():
+    """
+    Devuelve una función que genera un escenario sintético reproducible: (centros, pacientes).
+    """
+    def generar(pacientes: int = 600, centros: int = 6, semilla: int = 3):
+        return GeneradorDatos(semilla).generar_escenario(pacientes, centros)
+    return generar
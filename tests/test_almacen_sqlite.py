@@ -0,0 +1,102 @@
+import random
+import pytest
+from generador.Generador_Datos import GeneradorDatos
+from incucai.INCUCAI import INCUCAI
+from incucai.Registro_DNI import RegistroDNI
+from pacientes.Donantes import Donantes
+from persistencia.Almacen_SQLite import AlmacenSQLite
+
+PACIENTES, CENTROS, SEMILLA = 1000, 5, 9
+
+
+@pytest.fixture
+def almacen_procesado(tmp_path, sin_mensajes):
+    """
+    Procesa un escenario guardando todo en un almacén y devuelve (ruta del almacén, INCUCAI procesado).
+    """
+    ruta = str(tmp_path / "almacen.db")
+    centros, _ = GeneradorDatos(SEMILLA).generar_escenario(PACIENTES, CENTROS)
+    with AlmacenSQLite(ruta, tamaño_lote=64) as almacen:
+        incucai = INCUCAI(centros, almacen=almacen)
+        random.seed(4)
+        incucai.clasificar_centros_salud()
+    incucai.almacen = None
+    return ruta, incucai
+
+
+def cargar(ruta: str, solo_activos: bool = False) -> INCUCAI:
+    """
+    Arma un INCUCAI con los centros del escenario (sin pacientes) y le carga el almacén, que queda abierto.
+    """
+    incucai = INCUCAI(GeneradorDatos(SEMILLA).generar_centros(CENTROS), almacen=AlmacenSQLite(ruta))
+    incucai.cargar_almacen(solo_activos)
+    return incucai
+
+
+def test_almacen_guarda_y_carga_el_estado(almacen_procesado, estado_incucai):
+    ruta, incucai = almacen_procesado
+
+    cargado = cargar(ruta)
+
+    esperado, obtenido = estado_incucai(incucai), estado_incucai(cargado)
+    for clave in ("registro", "receptores", "espera", "inventario"):
+        assert obtenido[clave] == esperado[clave], clave
+    #un donante sin organos solo queda en el registro (en la corrida original puede seguir en lista_donantes)
+    assert obtenido["donantes"] == [donante for donante in esperado["donantes"] if donante[1]]
+    #los resultados de cada centro vuelven en el orden en que se guardaron los pacientes, no en el de las cirugias
+    assert [(nombre, pacientes, sorted(exitosos), sorted(fallidos)) for nombre, pacientes, exitosos, fallidos in obtenido["centros"]] == \
+           [(nombre, pacientes, sorted(exitosos), sorted(fallidos)) for nombre, pacientes, exitosos, fallidos in esperado["centros"]]
+    assert cargado.almacen.cantidad_pacientes() == PACIENTES
+    assert cargado.almacen.resultados_por_centro() == {
+        centro.nombre: (len(centro.pacientes_exitosos), len(centro.pacientes_fallidos))
+        for centro in incucai.centros_salud if centro.pacientes_exitosos or centro.pacientes_fallidos}
+    cargado.almacen.cerrar()
+
+
+def test_carga_solo_activos_y_busca_el_resto_en_el_almacen(almacen_procesado):
+    ruta, incucai = almacen_procesado
+
+    cargado = cargar(ruta, solo_activos=True)
+
+    activos = {dni for dni, (paciente, estado, _) in incucai.registro_dni._por_dni.items()
+               if estado == RegistroDNI.EN_ESPERA or (estado == RegistroDNI.DONANTE and paciente.organos_a_donar)}
+    assert set(cargado.registro_dni._por_dni) == activos
+    for dni, (paciente, estado, centro) in incucai.registro_dni._por_dni.items():
+        encontrado, estado_guardado, centro_guardado = cargado.buscar_paciente(dni)
+        assert (encontrado.nombre, estado_guardado) == (paciente.nombre, estado)
+        assert (centro_guardado.nombre if centro_guardado else None) == (centro.nombre if centro else None)
+        assert cargado.es_donante(dni) == isinstance(paciente, Donantes) != cargado.es_receptor(dni)
+    assert cargado.buscar_paciente(1) is None and not cargado.es_donante(1) and not cargado.es_receptor(1)
+    cargado.almacen.cerrar()
+
+
+@pytest.mark.parametrize("solo_activos", [True, None]) #None: no se carga nada, todos salen del almacen
+def test_receptores_por_centro_desde_el_almacen(almacen_procesado, solo_activos):
+    ruta, incucai = almacen_procesado
+
+    if solo_activos is None:
+        cargado = INCUCAI(GeneradorDatos(SEMILLA).generar_centros(CENTROS), almacen=AlmacenSQLite(ruta))
+    else:
+        cargado = cargar(ruta, solo_activos=solo_activos)
+
+    for centro in incucai.centros_salud:
+        esperado = incucai.tabla_receptores.receptores_por_centro(centro.nombre)
+        obtenido = cargado.receptores_por_centro(centro.nombre)
+        assert [[r.DNI for r in lista] for lista in obtenido] == [[r.DNI for r in lista] for lista in esperado]
+    cargado.almacen.cerrar()
+
+
+def test_receptores_por_prioridad_usa_el_indice(almacen_procesado):
+    ruta, _ = almacen_procesado
+
+    with AlmacenSQLite(ruta) as almacen:
+        plan = almacen._conexion.execute("EXPLAIN QUERY PLAN " + AlmacenSQLite.RECEPTORES_POR_PRIORIDAD,
+                                         ("centro", AlmacenSQLite.RECEPTOR, "estable")).fetchall()
+
+    detalle = " ".join(fila[-1] for fila in plan)
+    assert "pacientes_prioridad" in detalle and "TEMP B-TREE" not in detalle #sin ordenar en memoria
+
+
+def test_cargar_almacen_sin_almacen():
+    with pytest.raises(ValueError):
+        INCUCAI(GeneradorDatos(SEMILLA).generar_centros(CENTROS)).cargar_almacen()
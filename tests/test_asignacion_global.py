@@ -0,0 +1,94 @@
+import pytest
+from datetime import datetime
+from generador.Generador_Datos import GeneradorDatos
+from incucai.Asignacion_Global import AsignacionGlobal
+from incucai.INCUCAI import INCUCAI
+
+FECHA = datetime(2025, 6, 1) #fecha de referencia del generador
+
+
+def armar_caso(semilla: int, receptores: int = 7, donantes: int = 3, organos: int = 6):
+    """
+    Arma un caso chico: receptores y donantes repartidos en tres centros, con a lo sumo `organos` órganos en total.
+    Cada receptor espera alguno de los órganos donados, asi varios receptores compiten por el mismo órgano.
+    """
+    generador = GeneradorDatos(semilla)
+    centros = generador.generar_centros(3)
+    lista_donantes = [generador.generar_donante() for _ in range(donantes)]
+    disponibles = [(donante, organo) for donante in lista_donantes for organo in donante.organos_a_donar][:organos]
+    lista_receptores = []
+    for _ in range(receptores):
+        receptor = generador.generar_receptor()
+        organo = generador.rnd.choice(disponibles)[1]
+        receptor.organo_a_recibir, receptor.codigo_organo = organo.tipo_de_organo, organo.codigo_organo
+        lista_receptores.append(receptor)
+    generador.repartir_pacientes(centros, lista_receptores + lista_donantes)
+    return lista_receptores, lista_donantes, disponibles
+
+
+def mejor_puntaje(motor: AsignacionGlobal, receptores: list, organos: list) -> float:
+    """
+    Busca por fuerza bruta el mayor puntaje total: cada órgano queda sin asignar o va a un receptor libre que lo necesita.
+    """
+    def buscar(i: int, usados: frozenset) -> float:
+        if i == len(organos):
+            return 0.0
+        donante, organo = organos[i]
+        mejor = buscar(i + 1, usados)
+        for j, receptor in enumerate(receptores):
+            if j in usados or receptor.codigo_organo != organo.codigo_organo:
+                continue
+            puntaje = motor.puntaje_par(receptor, donante)
+            if puntaje is not None:
+                mejor = max(mejor, puntaje + buscar(i + 1, usados | {j}))
+        return mejor
+    return buscar(0, frozenset())
+
+
+@pytest.mark.parametrize("semilla", range(12))
+@pytest.mark.parametrize("estricto", [False, True])
+def test_resolver_alcanza_el_optimo_de_fuerza_bruta(semilla, estricto):
+    receptores, _, organos = armar_caso(semilla)
+    motor = AsignacionGlobal(FECHA, estricto=estricto)
+
+    asignaciones = motor.resolver(receptores, organos)
+
+    assert motor.puntaje_total(asignaciones) == pytest.approx(mejor_puntaje(motor, receptores, organos))
+
+
+@pytest.mark.parametrize("semilla", range(12))
+def test_resolver_devuelve_asignaciones_validas(semilla):
+    receptores, _, organos = armar_caso(semilla, receptores=12, donantes=4, organos=12)
+    motor = AsignacionGlobal(FECHA)
+
+    asignaciones = motor.resolver(receptores, organos)
+
+    assert len({id(receptor) for receptor, _, _ in asignaciones}) == len(asignaciones)
+    assert len({id(organo) for _, _, organo in asignaciones}) == len(asignaciones)
+    disponibles = {id(organo): donante for donante, organo in organos}
+    for receptor, donante, organo in asignaciones:
+        assert disponibles[id(organo)] is donante
+        assert receptor.codigo_organo == organo.codigo_organo
+        assert motor.puntaje_par(receptor, donante) is not None
+
+
+@pytest.mark.parametrize("semilla", range(12))
+def test_resolver_no_pierde_contra_el_orden_de_las_listas(semilla):
+    receptores, donantes, _ = armar_caso(semilla, receptores=20, donantes=6, organos=100)
+    motor = AsignacionGlobal(FECHA)
+    organos = [(donante, organo) for donante in donantes for organo in donante.organos_a_donar]
+
+    greedy = motor.emparejar_en_orden([(True, receptor) for receptor in receptores] + [(False, donante) for donante in donantes])
+
+    assert motor.puntaje_total(motor.resolver(receptores, organos)) >= motor.puntaje_total(greedy) - 1e-9
+
+
+def test_clasificar_global_informa_ambos_puntajes(escenario, sin_mensajes):
+    centros, _ = escenario(400, 4)
+    incucai = INCUCAI(centros)
+
+    resultado = incucai.clasificar_centros_salud_global()
+
+    assert resultado["puntaje_global"] >= resultado["puntaje_greedy"] - 1e-9
+    assert resultado["asignaciones"] > 0
+    assert incucai.pacientes_pendientes() == 0
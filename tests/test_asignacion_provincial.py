@@ -0,0 +1,63 @@
+import random
+import pytest
+from datetime import datetime
+from generador.Generador_Datos import GeneradorDatos
+from incucai.Asignacion_Provincial import AsignacionProvincial
+from incucai.INCUCAI import INCUCAI
+from pacientes.Receptores import Receptores
+from persistencia.Diario_Eventos import DiarioEventos
+from reloj.Reloj import RelojVirtual
+
+
+def procesar_por_provincia(procesos: int) -> INCUCAI:
+    """
+    Procesa el mismo escenario con el modo provincia y la cantidad de procesos indicada, con un reloj virtual
+    para que las fechas de ablación y de cirugía no dependan de cuánto tarda cada corrida.
+    """
+    centros, _ = GeneradorDatos(8).generar_escenario(1500, 8)
+    incucai = INCUCAI(centros, reloj=RelojVirtual(datetime(2025, 6, 1)))
+    random.seed(3)
+    incucai.clasificar_centros_salud_por_provincia(procesos)
+    return incucai
+
+
+def test_resultado_no_depende_de_la_cantidad_de_procesos(estado_incucai, sin_mensajes):
+    uno = procesar_por_provincia(1)
+
+    assert estado_incucai(procesar_por_provincia(2)) == estado_incucai(uno)
+    assert uno.pacientes_pendientes() == 0
+    assert len(uno.registro_dni) == 1500 #cada paciente se registra una sola vez
+
+
+def test_pendiente_ya_registrado_no_se_da_de_alta_otra_vez(sin_mensajes):
+    centros, _ = GeneradorDatos(8).generar_escenario(600, 4)
+    diario = DiarioEventos(None)
+    incucai = INCUCAI(centros, reloj=RelojVirtual(datetime(2025, 6, 1)), diario=diario)
+    receptor = next(paciente for paciente in centros[1].lista_pacientes if isinstance(paciente, Receptores))
+    incucai.registrar_receptor(receptor) #queda registrado antes de que su centro lo procese
+
+    random.seed(3)
+    incucai.clasificar_centros_salud_por_provincia(2)
+
+    altas = [evento["dni"] for evento in diario.leer() if evento["t"] == DiarioEventos.RECEPTOR]
+    assert len(incucai.registro_dni) == 600 and altas.count(receptor.DNI) == 1
+    assert [evento["n"] for evento in diario.leer()] == list(range(1, diario.ultima_secuencia + 1))
+
+
+def test_particionar_une_regiones_que_comparten_recursos():
+    centros = GeneradorDatos(8).generar_centros(8)
+    reparto = AsignacionProvincial(particion="provincia")
+    otro = next(centro for centro in centros if centro.provincia != centros[0].provincia)
+    otro.agregar_cirujano(centros[0].lista_cirujanos[0])
+
+    regiones = reparto.particionar(centros)
+
+    assert sum(len(lista) for lista in regiones.values()) == len(centros)
+    assert any(centros[0] in lista and otro in lista for lista in regiones.values())
+
+
+def test_parametros_invalidos():
+    with pytest.raises(ValueError):
+        AsignacionProvincial(particion="pais")
+    with pytest.raises(ValueError):
+        AsignacionProvincial(procesos=0)
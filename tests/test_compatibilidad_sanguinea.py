@@ -0,0 +1,87 @@
+import pytest
+from datetime import datetime
+from codigos.Codigos import GrupoSanguineo
+from incucai.Inventario_Organos import InventarioOrganos
+from incucai.Listas_Espera import ListasEspera
+from organos.Organos import Organos
+from pacientes.Compatibilidad_Sanguinea import (GRUPOS_VALIDOS, es_compatible, grupos_donantes_compatibles,
+                                               grupos_receptores_compatibles)
+from pacientes.Donantes import Donantes
+from pacientes.Receptores import Receptores
+
+
+def compatible_por_regla(donante: str, receptor: str) -> bool:
+    """
+    Regla ABO/Rh escrita a mano: el receptor tiene todos los antígenos del donante, y un Rh- solo recibe de Rh-.
+    """
+    antigenos = lambda grupo: set(grupo[:-1].replace("O", ""))
+    return antigenos(donante) <= antigenos(receptor) and (receptor[-1] == "+" or donante[-1] == "-")
+
+
+@pytest.mark.parametrize("donante", GRUPOS_VALIDOS)
+@pytest.mark.parametrize("receptor", GRUPOS_VALIDOS)
+def test_tabla_abo(donante, receptor):
+    assert es_compatible(donante, receptor) == compatible_por_regla(donante, receptor)
+    assert es_compatible(GrupoSanguineo.desde_texto(donante), GrupoSanguineo.desde_texto(receptor)) == compatible_por_regla(donante, receptor)
+    assert es_compatible(donante, receptor, estricto=True) == (donante == receptor)
+
+
+@pytest.mark.parametrize("grupo", GRUPOS_VALIDOS)
+def test_grupos_compatibles_empiezan_por_el_propio(grupo):
+    donantes = grupos_donantes_compatibles(grupo)
+    receptores = grupos_receptores_compatibles(grupo)
+
+    assert donantes[0] == receptores[0] == GrupoSanguineo.desde_texto(grupo)
+    assert {g.texto for g in donantes} == {d for d in GRUPOS_VALIDOS if compatible_por_regla(d, grupo)}
+    assert {g.texto for g in receptores} == {r for r in GRUPOS_VALIDOS if compatible_por_regla(grupo, r)}
+    assert grupos_donantes_compatibles(grupo, estricto=True) == [GrupoSanguineo.desde_texto(grupo)]
+
+
+def test_donantes_universales_al_final():
+    assert grupos_donantes_compatibles("AB+")[-1] == GrupoSanguineo.O_NEGATIVO
+    assert grupos_receptores_compatibles("O-")[-1] == GrupoSanguineo.AB_POSITIVO
+
+
+def donante_de(dni: int, grupo: str, *organos: str) -> Donantes:
+    """
+    Arma un donante con el grupo sanguíneo y los órganos indicados.
+    """
+    return Donantes(f"Donante {dni}", dni, "M", datetime(1970, 1, 1), grupo, 1100000000, datetime(2025, 5, 31),
+                    [Organos(organo) for organo in organos])
+
+
+def receptor_de(dni: int, grupo: str, organo: str, estado: str = "Estable") -> Receptores:
+    """
+    Arma un receptor con el grupo sanguíneo, el órgano y el estado indicados.
+    """
+    receptor = Receptores(f"Receptor {dni}", dni, "F", datetime(1980, 1, 1), grupo, 1100000000, organo,
+                          datetime(2024, 1, 1), "")
+    receptor.estado = estado
+    return receptor
+
+
+def test_inventario_prefiere_el_mismo_grupo_y_guarda_los_universales():
+    inventario = InventarioOrganos()
+    universal, propio, o_positivo = donante_de(1, "O-", "riñon"), donante_de(2, "A+", "riñon"), donante_de(3, "O+", "riñon")
+    for donante in (universal, propio, o_positivo):
+        inventario.agregar_donante(donante)
+
+    assert inventario.buscar_compatible("riñon", "A+")[0] is propio
+    assert inventario.buscar_compatible("riñon", "AB+")[0] is not universal #el O- queda para quien solo puede recibir O-
+    assert inventario.buscar_compatible("riñon", "O-")[0] is universal
+    assert inventario.buscar_compatible("riñon", "B-", estricto=True) is None
+    assert inventario.buscar_compatible("higado", "AB+") is None
+
+
+def test_listas_de_espera_comparan_entre_grupos_compatibles():
+    listas = ListasEspera()
+    a_positivo, o_positivo, ab_positivo = (receptor_de(1, "A+", "riñon"), receptor_de(2, "O+", "riñon"),
+                                           receptor_de(3, "AB+", "riñon", "Inestable"))
+    for receptor in (a_positivo, o_positivo, ab_positivo):
+        listas.agregar(receptor)
+
+    assert listas.ver_primero_compatible("riñon", "O+")[1] is ab_positivo #un donante O+ puede darle a AB+
+    assert listas.ver_primero_compatible("riñon", "O+", estricto=True)[1] is o_positivo
+    assert listas.ver_primero_compatible("riñon", "B-")[1] is ab_positivo
+    assert listas.ver_primero_compatible("riñon", "A-")[1] is ab_positivo
+    assert listas.ver_primero_compatible("higado", "O+") is None
@@ -0,0 +1,111 @@
+import random
+import pytest
+from generador.Generador_Datos import GeneradorDatos
+from incucai.INCUCAI import INCUCAI
+from persistencia.Almacen_SQLite import AlmacenSQLite
+from persistencia.Diario_Eventos import DiarioEventos
+
+PACIENTES, CENTROS, SEMILLA = 1200, 6, 5
+
+
+def centros_vacios() -> list:
+    """
+    Vuelve a generar los centros del escenario (mismos nombres, cirujanos y vehículos), sin pacientes.
+    """
+    return GeneradorDatos(SEMILLA).generar_centros(CENTROS)
+
+
+def reproducir(ruta: str) -> INCUCAI:
+    """
+    Arma un INCUCAI nuevo con los centros del escenario y le reproduce el diario entero.
+    """
+    diario = DiarioEventos(ruta)
+    incucai = INCUCAI(centros_vacios(), diario=diario)
+    incucai.reproducir_diario()
+    diario.cerrar()
+    return incucai
+
+
+def test_reproducir_diario_reconstruye_el_estado(tmp_path, estado_incucai, sin_mensajes):
+    ruta = str(tmp_path / "diario.jsonl")
+    generador = GeneradorDatos(SEMILLA)
+    centros, _ = generador.generar_escenario(PACIENTES, CENTROS)
+    diario = DiarioEventos(ruta)
+    incucai = INCUCAI(centros, diario=diario)
+    random.seed(1)
+    incucai.clasificar_centros_salud()
+    generador.repartir_pacientes(centros, generador.generar_pacientes(PACIENTES // 10))
+    incucai.procesar_nuevos_pacientes()
+    diario.cerrar()
+
+    reproducido = reproducir(ruta)
+
+    assert estado_incucai(reproducido) == estado_incucai(incucai)
+    assert reproducido.pacientes_pendientes() == 0
+
+
+def test_reproducir_diario_del_modo_provincia(tmp_path, estado_incucai, sin_mensajes):
+    ruta = str(tmp_path / "diario.jsonl")
+    centros, _ = GeneradorDatos(SEMILLA).generar_escenario(PACIENTES, CENTROS)
+    diario = DiarioEventos(ruta)
+    incucai = INCUCAI(centros, diario=diario)
+    random.seed(1)
+    incucai.clasificar_centros_salud_por_provincia(procesos=2)
+    diario.cerrar()
+
+    assert estado_incucai(reproducir(ruta)) == estado_incucai(incucai)
+
+
+def test_agregar_lineas_de_otro_diario(tmp_path):
+    ruta = str(tmp_path / "diario.jsonl")
+    trabajador, centro = DiarioEventos(None), centros_vacios()[0]
+    trabajador.nombrar(centro, "centro/0")
+    trabajador.registrar(DiarioEventos.DONANTE_QUITADO, dni=1)
+    trabajador.registrar(DiarioEventos.TRASLADO, centro=centro, vehiculo=centro, distancia=12.5, nivel_trafico=2, tiempo=0.5)
+
+    with DiarioEventos(ruta) as diario:
+        diario.registrar(DiarioEventos.DONANTE_QUITADO, dni=7)
+        diario.agregar_lineas(trabajador.lineas())
+        eventos = list(diario.leer())
+
+    assert [(evento["n"], evento["t"]) for evento in eventos] == \
+           [(1, DiarioEventos.DONANTE_QUITADO), (2, DiarioEventos.DONANTE_QUITADO), (3, DiarioEventos.TRASLADO)]
+    assert eventos[1]["dni"] == 1 and eventos[2]["vehiculo"] == "centro/0" and eventos[2]["distancia"] == 12.5
+
+
+def test_carga_del_almacen_se_anota_y_se_reproduce(tmp_path, estado_incucai, sin_mensajes):
+    ruta_almacen, ruta_diario = str(tmp_path / "almacen.db"), str(tmp_path / "diario.jsonl")
+    centros, _ = GeneradorDatos(SEMILLA).generar_escenario(PACIENTES, CENTROS)
+    with AlmacenSQLite(ruta_almacen) as almacen:
+        random.seed(1)
+        INCUCAI(centros, almacen=almacen).clasificar_centros_salud()
+
+    with AlmacenSQLite(ruta_almacen) as almacen:
+        diario = DiarioEventos(ruta_diario)
+        cargado = INCUCAI(centros_vacios(), almacen=almacen, diario=diario)
+        cantidad = cargado.cargar_almacen()
+        diario.cerrar()
+
+    assert diario.ultima_secuencia == cantidad == PACIENTES #un evento CARGA por paciente, sin altas ni asignaciones
+    assert estado_incucai(reproducir(ruta_diario)) == estado_incucai(cargado)
+
+
+def test_diario_en_memoria(estado_incucai, sin_mensajes):
+    diario = DiarioEventos(None)
+    centros, _ = GeneradorDatos(SEMILLA).generar_escenario(300, CENTROS)
+    incucai = INCUCAI(centros, diario=diario)
+    random.seed(1)
+    incucai.clasificar_centros_salud()
+
+    assert len(diario.lineas()) == diario.ultima_secuencia > 0
+
+
+def test_diario_rechaza_eventos_desconocidos(tmp_path):
+    ruta = tmp_path / "diario.jsonl"
+    ruta.write_text('{"n": 1, "t": "desconocido"}\n', encoding="utf-8")
+    diario = DiarioEventos(str(ruta))
+    incucai = INCUCAI(centros_vacios(), diario=diario)
+
+    with pytest.raises(ValueError, match="Evento desconocido"):
+        incucai.reproducir_diario()
+    diario.cerrar()
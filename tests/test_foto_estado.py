@@ -0,0 +1,59 @@
+import random
+import pytest
+from generador.Generador_Datos import GeneradorDatos
+from incucai.INCUCAI import INCUCAI
+from persistencia.Foto_Estado import FotoEstado
+
+
+@pytest.fixture
+def incucai_compartido(sin_mensajes):
+    """
+    INCUCAI procesado en el que el centro 1 comparte un cirujano y un vehículo con el centro 0.
+    """
+    centros, _ = GeneradorDatos(11).generar_escenario(800, 4)
+    centros[1].agregar_cirujano(centros[0].lista_cirujanos[0])
+    centros[1].agregar_vehiculo(centros[0].lista_vehiculos[0])
+    incucai = INCUCAI(centros)
+    random.seed(2)
+    incucai.clasificar_centros_salud()
+    return incucai
+
+
+def test_foto_reconstruye_el_estado(tmp_path, incucai_compartido, estado_incucai):
+    foto = FotoEstado(str(tmp_path / "estado.foto"))
+    foto.guardar(incucai_compartido)
+
+    cargado = FotoEstado(foto.ruta).cargar()
+
+    assert estado_incucai(cargado) == estado_incucai(incucai_compartido)
+    assert cargado.pacientes_pendientes() == 0
+
+
+def test_foto_conserva_cirujanos_y_vehiculos_compartidos(tmp_path, incucai_compartido):
+    foto = FotoEstado(str(tmp_path / "estado.foto"))
+    foto.guardar(incucai_compartido)
+
+    centros = FotoEstado(foto.ruta).cargar().centros_salud
+
+    assert centros[1].lista_cirujanos[-1] is centros[0].lista_cirujanos[0]
+    assert centros[1].lista_vehiculos[-1] is centros[0].lista_vehiculos[0]
+
+
+def test_foto_conserva_los_viajes(tmp_path, incucai_compartido):
+    foto = FotoEstado(str(tmp_path / "estado.foto"))
+    foto.guardar(incucai_compartido)
+
+    cargado = FotoEstado(foto.ruta).cargar()
+
+    for original, restaurado in zip(incucai_compartido.centros_salud, cargado.centros_salud):
+        for vehiculo, copia in zip(original.lista_vehiculos, restaurado.lista_vehiculos):
+            assert list(copia.registro_viajes) == list(vehiculo.registro_viajes)
+            assert copia.registro_viajes.resumen() == vehiculo.registro_viajes.resumen()
+
+
+def test_foto_rechaza_otros_archivos(tmp_path):
+    ruta = tmp_path / "otro.bin"
+    ruta.write_bytes(b"no es una foto" * 10)
+
+    with pytest.raises(ValueError):
+        FotoEstado(str(ruta)).cargar()
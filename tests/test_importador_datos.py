@@ -0,0 +1,140 @@
+import json
+import pytest
+from generador.Generador_Datos import GeneradorDatos
+from importacion.Importador_Datos import ImportadorDatos
+from incucai.INCUCAI import INCUCAI
+
+
+@pytest.fixture
+def incucai():
+    """
+    INCUCAI con dos centros y sin pacientes.
+    """
+    return INCUCAI(GeneradorDatos(1).generar_centros(2))
+
+
+def receptor(centro: str, dni: str = "30000001", **cambios) -> dict:
+    """
+    Arma un registro de receptor válido, con los cambios indicados.
+    """
+    return {"tipo": "receptor", "nombre": "Ana Perez", "dni": dni, "sexo": "F", "nacimiento": "1990-05-04",
+            "sangre": "A+", "telefono": "1144445555", "centro": centro, "organo": "riñon",
+            "fecha_en_espera": "2024-01-10 08:30", "estado": "estable"} | cambios
+
+
+def donante(centro: str, dni: str = "30000002", **cambios) -> dict:
+    """
+    Arma un registro de donante válido, con los cambios indicados.
+    """
+    return {"tipo": "donante", "nombre": "Luis Gomez", "dni": dni, "sexo": "M", "nacimiento": "1970-02-03",
+            "sangre": "O+", "telefono": "1155556666", "centro": centro, "fallecimiento": "2025-05-30 22:00",
+            "organos": ["higado", "corneas"]} | cambios
+
+
+def escribir_jsonl(ruta, lineas: list) -> str:
+    """
+    Escribe un archivo JSONL: los diccionarios se guardan como JSON y los textos tal cual.
+    """
+    ruta.write_text("".join((linea if isinstance(linea, str) else json.dumps(linea, ensure_ascii=False)) + "\n"
+                            for linea in lineas), encoding="utf-8")
+    return str(ruta)
+
+
+def test_importa_registros_validos(tmp_path, incucai):
+    centro = incucai.centros_salud[0].nombre
+    ruta = escribir_jsonl(tmp_path / "pacientes.jsonl", [receptor(centro), donante(centro.upper())])
+
+    resumen = ImportadorDatos(incucai).importar(ruta)
+
+    assert resumen == {"leidos": 2, "importados": {"centro": 0, "vehiculo": 0, "cirujano": 0, "receptor": 1, "donante": 1},
+                       "rechazados": 0}
+    assert incucai.es_receptor(30000001) and incucai.es_donante(30000002)
+    assert [organo.tipo_de_organo for organo in incucai.buscar_paciente(30000002)[0].organos_a_donar] == ["higado", "corneas"]
+
+
+def rechazar(tmp_path, incucai, registro) -> str:
+    """
+    Importa un solo registro que debe rechazarse y devuelve el motivo anotado en el archivo de rechazos.
+    """
+    rechazos = tmp_path / "rechazos.jsonl"
+    ruta = escribir_jsonl(tmp_path / "pacientes.jsonl", [registro])
+
+    resumen = ImportadorDatos(incucai, str(rechazos)).importar(ruta)
+
+    assert resumen["rechazados"] == 1 and sum(resumen["importados"].values()) == 0
+    assert len(incucai.registro_dni) == 0
+    rechazo = json.loads(rechazos.read_text(encoding="utf-8"))
+    assert rechazo["linea"] == 1
+    return rechazo["motivo"]
+
+
+@pytest.mark.parametrize("linea, motivo", [
+    ("{no es json", "Expecting"),
+    ("[1, 2]", "objeto JSON"),
+    ({"tipo": "medico"}, "Tipo inválido"),
+    ({"tipo": "receptor"}, "Falta el campo"),
+])
+def test_rechaza_registros_mal_formados(tmp_path, incucai, linea, motivo):
+    assert motivo in rechazar(tmp_path, incucai, linea)
+
+
+@pytest.mark.parametrize("armar, cambios, motivo", [
+    (receptor, {"dni": "1234"}, "8 dígitos"),
+    (receptor, {"dni": "3000000x"}, "solo números"),
+    (receptor, {"sangre": "C+"}, "Grupo sanguíneo inválido"),
+    (receptor, {"organo": "bazo"}, "Órgano inválido"),
+    (receptor, {"nacimiento": "1800-01-01"}, "fuera de rango"),
+    (receptor, {"estado": "grave"}, "Estado inválido"),
+    (receptor, {"centro": "Centro inexistente"}, "Centro no encontrado"),
+    (receptor, {"nombre": ["Ana"]}, "texto o un número"),
+    (receptor, {"dni": {"numero": 30000001}}, "texto o un número"),
+    (donante, {"organos": {"higado": 1}}, "lista o un texto"),
+    (donante, {"organos": ";"}, "al menos un órgano"),
+    (donante, {"fallecimiento": "ayer"}, "fecha"),
+])
+def test_rechaza_campos_invalidos(tmp_path, incucai, armar, cambios, motivo):
+    registro = armar(incucai.centros_salud[0].nombre) | cambios
+
+    assert motivo.lower() in rechazar(tmp_path, incucai, registro).lower()
+
+
+def test_rechaza_dni_repetidos(tmp_path, incucai):
+    centro = incucai.centros_salud[0].nombre
+    ruta = escribir_jsonl(tmp_path / "pacientes.jsonl", [
+        receptor(centro), receptor(centro), donante(centro, dni="30000001"), donante(centro)])
+    rechazos = tmp_path / "rechazos.jsonl"
+
+    resumen = ImportadorDatos(incucai, str(rechazos)).importar(ruta)
+
+    assert (resumen["importados"]["receptor"], resumen["importados"]["donante"], resumen["rechazados"]) == (1, 1, 2)
+    assert [json.loads(linea)["linea"] for linea in rechazos.read_text(encoding="utf-8").splitlines()] == [2, 3]
+
+
+def test_rechaza_dni_repetidos_sin_registrar(tmp_path, incucai):
+    centro = incucai.centros_salud[0].nombre
+    ruta = escribir_jsonl(tmp_path / "pacientes.jsonl", [receptor(centro), donante(centro, dni="30000001")])
+
+    resumen = ImportadorDatos(incucai, registrar=False).importar(ruta)
+
+    assert resumen["rechazados"] == 1 and len(incucai.registro_dni) == 0
+    assert incucai.pacientes_pendientes() == 1
+
+
+def test_importa_csv(tmp_path, incucai):
+    centro = incucai.centros_salud[1].nombre
+    ruta = tmp_path / "donantes.csv"
+    ruta.write_text("nombre,dni,sexo,nacimiento,sangre,telefono,centro,fallecimiento,organos\n"
+                    f"Luis Gomez,30000002,M,1970-02-03,O+,1155556666,{centro},2025-05-30,riñon;piel\n"
+                    f"Sin Organos,30000003,M,1970-02-03,O+,1155556666,{centro},2025-05-30,\n", encoding="utf-8")
+
+    resumen = ImportadorDatos(incucai).importar(str(ruta), tipo="donante")
+
+    assert (resumen["importados"]["donante"], resumen["rechazados"]) == (1, 1)
+    assert [organo.tipo_de_organo for organo in incucai.buscar_paciente(30000002)[0].organos_a_donar] == ["riñon", "piel"]
+
+
+def test_formato_y_tipo_desconocidos(tmp_path, incucai):
+    with pytest.raises(ValueError):
+        ImportadorDatos(incucai).importar(str(tmp_path / "datos.xml"))
+    with pytest.raises(ValueError):
+        ImportadorDatos(incucai).importar(str(tmp_path / "datos.csv"), tipo="medico")
@@ -0,0 +1,51 @@
+import random
+import pytest
+from generador.Generador_Datos import GeneradorDatos
+from incucai.Inventario_Organos import InventarioOrganos
+
+
+def buscar_lineal(disponibles: list, codigo_organo, codigo_sangre):
+    """
+    Busca como se hacía antes del inventario: el primer par (donante, organo) disponible, en orden de registro.
+    """
+    for donante, organo in disponibles:
+        if organo.codigo_organo == codigo_organo and donante.codigo_sangre == codigo_sangre:
+            return donante, organo
+    return None
+
+
+@pytest.mark.parametrize("semilla", range(5))
+def test_inventario_coincide_con_la_busqueda_lineal(semilla):
+    generador = GeneradorDatos(semilla)
+    rnd = random.Random(semilla)
+    inventario, disponibles = InventarioOrganos(), []
+
+    for _ in range(400):
+        if rnd.random() < 0.4 or not disponibles:
+            donante = generador.generar_donante()
+            inventario.agregar_donante(donante)
+            disponibles.extend((donante, organo) for organo in donante.organos_a_donar)
+        else:
+            receptor = generador.generar_receptor()
+            esperado = buscar_lineal(disponibles, receptor.codigo_organo, receptor.codigo_sangre)
+            obtenido = inventario.buscar(receptor.organo_a_recibir, receptor.Tsangre)
+            assert (obtenido[1] if obtenido else None) is (esperado[1] if esperado else None)
+            if obtenido is not None:
+                inventario.quitar_organo(*obtenido)
+                disponibles.remove(obtenido)
+        assert len(inventario) == len(disponibles)
+
+    assert inventario.organos_disponibles() == disponibles
+
+
+def test_quitar_donante_y_volver_a_agregar():
+    donante = GeneradorDatos(1).generar_donante()
+    inventario = InventarioOrganos()
+    inventario.agregar_donante(donante)
+
+    inventario.quitar_donante(donante)
+    assert len(inventario) == 0
+    assert inventario.buscar(donante.organos_a_donar[0].tipo_de_organo, donante.Tsangre) is None
+
+    inventario.agregar_organo(donante, donante.organos_a_donar[0])
+    assert inventario.buscar(donante.organos_a_donar[0].tipo_de_organo, donante.Tsangre) == (donante, donante.organos_a_donar[0])
@@ -0,0 +1,59 @@
+import random
+import pytest
+from generador.Generador_Datos import GeneradorDatos
+from incucai.Listas_Espera import ListasEspera, prioridad_receptor
+
+
+def primero_ordenando(en_espera: dict, codigo_organo, codigo_sangre):
+    """
+    Busca como se hacía antes de las colas de prioridad: ordena a los que esperan ese órgano y grupo y toma el primero.
+    A igual prioridad gana el que entró antes a la lista.
+    """
+    candidatos = [(prioridad_receptor(receptor), orden, receptor) for receptor, orden in en_espera.items()
+                  if receptor.codigo_organo == codigo_organo and receptor.codigo_sangre == codigo_sangre]
+    return min(candidatos, key=lambda candidato: candidato[:2])[2] if candidatos else None
+
+
+@pytest.mark.parametrize("semilla", range(5))
+def test_listas_coinciden_con_ordenar(semilla):
+    generador = GeneradorDatos(semilla)
+    rnd = random.Random(semilla)
+    listas, en_espera = ListasEspera(), {}
+
+    for paso in range(600):
+        accion = rnd.random()
+        if accion < 0.5 or not en_espera:
+            receptor = generador.generar_receptor()
+            listas.agregar(receptor)
+            en_espera[receptor] = paso
+        elif accion < 0.6: #cambia de estado clinico y se actualiza su prioridad
+            receptor = rnd.choice(list(en_espera))
+            receptor.estado = "Inestable" if receptor.estado.lower() == "estable" else "Estable"
+            listas.actualizar(receptor)
+            en_espera[receptor] = paso
+        elif accion < 0.7:
+            receptor = rnd.choice(list(en_espera))
+            listas.quitar(receptor)
+            del en_espera[receptor]
+        else:
+            donante = generador.generar_donante()
+            organo = rnd.choice(donante.organos_a_donar)
+            esperado = primero_ordenando(en_espera, organo.codigo_organo, donante.codigo_sangre)
+            assert listas.sacar_primero(organo.tipo_de_organo, donante.Tsangre) is esperado
+            en_espera.pop(esperado, None)
+        assert len(listas) == len(en_espera)
+
+    assert set(listas.receptores_en_espera()) == set(en_espera)
+
+
+def test_prioridad_inestables_jovenes_y_antiguedad():
+    generador = GeneradorDatos(4)
+    receptores = [generador.generar_receptor() for _ in range(200)]
+
+    ordenados = sorted(receptores, key=prioridad_receptor)
+
+    inestables = [r for r in ordenados if r.estado.lower() == "inestable"]
+    assert ordenados[:len(inestables)] == inestables
+    for anterior, siguiente in zip(ordenados, ordenados[1:]):
+        if anterior.estado == siguiente.estado:
+            assert anterior.nacimiento >= siguiente.nacimiento
@@ -0,0 +1,100 @@
+import json
+import pytest
+import lote
+from incucai.Registro_DNI import RegistroDNI
+
+
+def correr(tmp_path, *argumentos) -> dict:
+    """
+    Corre el modo por lotes con los argumentos indicados y devuelve el JSON que escribe.
+    """
+    salida = tmp_path / "resultado.json"
+    assert lote.main([*argumentos, "--salida", str(salida)]) == 0
+    return json.loads(salida.read_text(encoding="utf-8"))
+
+
+def sin_tiempos(resultado: dict) -> dict:
+    """
+    Quita del resultado lo único que cambia entre dos corridas iguales: los segundos.
+    """
+    return {clave: valor for clave, valor in resultado.items() if clave != "segundos"}
+
+
+def test_salida_de_una_ronda_completa(tmp_path):
+    resultado = correr(tmp_path, "--generar", "600", "--centros", "5", "--semilla", "2", "--detalle")
+
+    assert set(resultado) == {"modo", "semilla", "presupuesto_segundos", "completo", "procesados", "segundos",
+                              "pacientes", "cirugias", "centros", "receptores"}
+    assert (resultado["modo"], resultado["semilla"], resultado["presupuesto_segundos"]) == ("clasificar", 2, None)
+    assert resultado["completo"] and resultado["procesados"] == 600
+    assert set(resultado["segundos"]) == {"carga", "procesamiento", "total"}
+
+    pacientes, por_estado = resultado["pacientes"], resultado["pacientes"]["por_estado"]
+    assert (pacientes["registrados"], pacientes["pendientes"]) == (600, 0) and sum(por_estado.values()) == 600
+    assert len(resultado["centros"]) == 5 and sum(centro["pacientes"] for centro in resultado["centros"]) == 600
+    assert resultado["cirugias"] == {"exitosas": sum(centro["exitosas"] for centro in resultado["centros"]),
+                                     "fallidas": sum(centro["fallidas"] for centro in resultado["centros"])}
+    assert (por_estado.get(RegistroDNI.EXITOSO, 0), por_estado.get(RegistroDNI.FALLIDO, 0)) == \
+           (resultado["cirugias"]["exitosas"], resultado["cirugias"]["fallidas"])
+
+    receptores = resultado["receptores"]
+    assert len(receptores) == 600 - por_estado.get(RegistroDNI.DONANTE, 0)
+    assert {estado: [r["estado"] for r in receptores].count(estado) for estado in {r["estado"] for r in receptores}} == \
+           {estado: cantidad for estado, cantidad in por_estado.items() if estado != RegistroDNI.DONANTE}
+    assert all((r["centro_cirugia"] is not None) == (r["estado"] in (RegistroDNI.EXITOSO, RegistroDNI.FALLIDO)) for r in receptores)
+
+
+@pytest.mark.parametrize("modo", ["clasificar", "incremental", "provincia"])
+def test_misma_semilla_mismo_resultado(tmp_path, modo):
+    argumentos = ("--generar", "400", "--centros", "4", "--semilla", "5", "--modo", modo)
+
+    primero = correr(tmp_path, *argumentos)
+
+    assert primero["modo"] == modo and primero["completo"]
+    assert sin_tiempos(correr(tmp_path, *argumentos)) == sin_tiempos(primero)
+    assert ("provincias" in primero) == (modo == "provincia")
+
+
+def test_presupuesto_y_foto_retoman_los_pendientes(tmp_path):
+    foto = str(tmp_path / "estado.foto")
+
+    parcial = correr(tmp_path, "--generar", "3000", "--semilla", "1", "--presupuesto", "1e-9", "--guardar-foto", foto)
+    final = correr(tmp_path, "--foto", foto, "--semilla", "1")
+
+    assert not parcial["completo"] and parcial["pacientes"]["pendientes"] == 3000 - parcial["procesados"]
+    assert final["completo"] and final["procesados"] == parcial["pacientes"]["pendientes"]
+    assert final["pacientes"]["registrados"] == 3000
+
+
+def test_importacion_en_la_salida(tmp_path):
+    datos = tmp_path / "pacientes.jsonl"
+    datos.write_text(json.dumps({"tipo": "medico"}) + "\n", encoding="utf-8")
+
+    resultado = correr(tmp_path, "--generar", "100", "--centros", "2", "--datos", str(datos))
+
+    assert resultado["importacion"] == [{"archivo": str(datos), "leidos": 1, "rechazados": 1,
+                                         "importados": {"centro": 0, "vehiculo": 0, "cirujano": 0, "receptor": 0, "donante": 0}}]
+
+
+def test_distancias_se_reutilizan_entre_corridas(tmp_path):
+    distancias = tmp_path / "distancias.npz"
+    argumentos = ("--generar", "200", "--centros", "3", "--semilla", "4", "--distancias", str(distancias))
+
+    primero = correr(tmp_path, *argumentos)
+    guardada = distancias.read_bytes()
+
+    assert sin_tiempos(correr(tmp_path, *argumentos)) == sin_tiempos(primero)
+    assert distancias.read_bytes() == guardada #los mismos centros: no se recalcula ni se vuelve a guardar
+
+
+@pytest.mark.parametrize("argumentos", [
+    [],
+    ["--generar", "0"],
+    ["--generar", "10", "--presupuesto", "0"],
+    ["--generar", "10", "--modo", "provincia", "--presupuesto", "5"],
+    ["--generar", "10", "--procesos", "2"],
+    ["--foto", "estado.foto", "--distancias", "distancias.npz"],
+])
+def test_argumentos_invalidos(argumentos, capsys):
+    with pytest.raises(SystemExit):
+        lote.leer_argumentos(argumentos)
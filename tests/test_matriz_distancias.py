@@ -0,0 +1,78 @@
+import pytest
+from centro_salud.Centro_Salud import CentroSalud
+from centro_salud.Matriz_Distancias import MatrizDistancias
+
+
+def centro(numero: int, latitud: float = None, longitud: float = None) -> CentroSalud:
+    """
+    Arma un centro sin cirujanos ni vehículos, con coordenadas que dependen del número si no se indican.
+    """
+    return CentroSalud(f"Hospital {numero}", "Calle 1", "0111111111", "Partido", "Provincia", [], [],
+                       latitud=-25 - numero * 0.5 if latitud is None else latitud,
+                       longitud=-58 - numero * 0.25 if longitud is None else longitud)
+
+
+@pytest.fixture
+def calculos(monkeypatch) -> list:
+    """
+    Cuenta los pares que se resuelven con geographiclib.
+    """
+    pares = []
+    original = MatrizDistancias.distancia_geodesica
+    monkeypatch.setattr(MatrizDistancias, "distancia_geodesica",
+                        staticmethod(lambda *coordenadas: pares.append(coordenadas) or original(*coordenadas)))
+    return pares
+
+
+def test_solo_se_calculan_las_filas_nuevas(calculos):
+    centros = [centro(i) for i in range(30)]
+    matriz = MatrizDistancias()
+    matriz.actualizar(centros)
+    assert len(calculos) == 30 * 29 // 2
+
+    calculos.clear()
+    centros[4] = centro(4, -40.0, -65.0) #cambia de coordenadas
+    centros += [centro(30), centro(31)]
+    assert matriz.actualizar(centros)
+
+    assert len(calculos) == 3 * 31 - 3 #cada fila nueva contra las demas, los pares entre nuevas una sola vez
+    completa = MatrizDistancias()
+    completa.actualizar(centros)
+    assert all(matriz.distancia(a, b) == completa.distancia(a, b) for a in centros for b in centros)
+
+
+def test_sin_coordenadas_no_hay_distancia(calculos):
+    centros = [centro(0), centro(1), CentroSalud("Hospital sin mapa", "Calle 1", "0111111111", "Partido", "Provincia", [], [])]
+    matriz = MatrizDistancias()
+    matriz.actualizar(centros)
+
+    assert len(calculos) == 1
+    assert matriz.distancia(centros[0], centros[2]) is None and matriz.distancia(centros[2], centros[2]) is None
+    assert matriz.distancia(centros[1], centros[1]) == 0.0
+
+
+def test_la_matriz_guardada_no_se_recalcula(tmp_path, calculos):
+    ruta = str(tmp_path / "distancias.npz")
+    centros = [centro(i) for i in range(10)]
+    MatrizDistancias(ruta).actualizar(centros)
+
+    calculos.clear()
+    matriz = MatrizDistancias(ruta)
+    assert not matriz.actualizar(centros)
+    assert calculos == [] and len(matriz) == 10
+
+    assert matriz.actualizar(centros + [centro(10)]) and len(calculos) == 10
+    assert len(MatrizDistancias(ruta)) == 11
+
+
+def test_submatriz_copia_las_distancias(calculos):
+    centros = [centro(i) for i in range(12)]
+    matriz = MatrizDistancias()
+    matriz.actualizar(centros)
+
+    calculos.clear()
+    region = centros[3:8:2] + [centro(20)]
+    parte = matriz.submatriz(region)
+
+    assert len(parte) == 4 and len(calculos) == 3 #solo el centro que no estaba, contra los otros tres
+    assert all(parte.distancia(a, b) == matriz.distancia(a, b) for a in region[:3] for b in region[:3])
@@ -0,0 +1,78 @@
+import pytest
+from datetime import datetime
+from centro_salud.Centro_Salud import CentroSalud
+from centro_salud.Despachador_Nacional import DespachadorNacional
+from centro_salud.Matriz_Distancias import MatrizDistancias
+from centro_salud.Planificador_Rutas import PlanificadorRutas
+from cirujanos.Cirujanos import Cirujanos
+from incucai.INCUCAI import INCUCAI
+from incucai.Registro_DNI import RegistroDNI
+from organos.Organos import Organos
+from pacientes.Donantes import Donantes
+from pacientes.Receptores import Receptores
+from vehiculos.Auto import Auto
+from vehiculos.Avion import Avion
+
+
+def centro(nombre: str, partido: str, provincia: str, latitud: float, longitud: float, *vehiculos) -> CentroSalud:
+    """
+    Arma un centro con un cirujano cardiovascular y los vehículos indicados.
+    """
+    return CentroSalud(nombre, "Calle 1", "0111111111", partido, provincia, [Cirujanos("cardiovascular")], list(vehiculos),
+                       latitud=latitud, longitud=longitud)
+
+
+def planificador(centros: list, prestamos: bool = True) -> PlanificadorRutas:
+    """
+    Arma un planificador sobre los centros, con o sin despachador para pedir vehículos prestados.
+    """
+    matriz = MatrizDistancias()
+    matriz.actualizar(centros)
+    return PlanificadorRutas(centros, matriz, DespachadorNacional(centros, matriz) if prestamos else None)
+
+
+def test_sin_ruta_dentro_de_la_ventana_no_hay_plan():
+    ushuaia = centro("Hospital Ushuaia", "Ushuaia", "Tierra del Fuego", -54.80, -68.30, Auto(80, "U1"))
+    jujuy = centro("Hospital Jujuy", "San Salvador", "Jujuy", -24.18, -65.30, Auto(80, "J1"))
+
+    assert planificador([ushuaia, jujuy]).planificar(ushuaia, jujuy) is None #unos 3500 km en auto, mas de 20 horas
+
+
+def test_tramo_corto_en_auto_y_margen_de_isquemia():
+    caba = centro("Hospital CABA", "CABA", "CABA", -34.60, -58.38, Auto(100, "C1"))
+    la_plata = centro("Hospital La Plata", "La Plata", "Buenos Aires", -34.92, -57.95, Auto(100, "L1"))
+    rutas = planificador([caba, la_plata])
+
+    horas, tramos = rutas.planificar(caba, la_plata)
+
+    assert [tramo[0] for tramo in tramos] == [Auto] and 0 < horas < 5
+    assert rutas.planificar(caba, la_plata, horas_transcurridas=PlanificadorRutas.LIMITE_ISQUEMIA - horas / 2) is None
+    assert rutas.planificar(caba, la_plata, horas_transcurridas=PlanificadorRutas.LIMITE_ISQUEMIA - 2 * horas) is not None
+
+
+def test_vuelo_entre_aerodromos_cuando_el_auto_no_llega():
+    ushuaia = centro("Hospital Ushuaia", "Ushuaia", "Tierra del Fuego", -54.80, -68.30, Auto(80, "U1"), Avion(700, "UA"))
+    jujuy = centro("Hospital Jujuy", "San Salvador", "Jujuy", -24.18, -65.30, Auto(80, "J1"), Avion(700, "JA"))
+
+    horas, tramos = planificador([ushuaia, jujuy]).planificar(ushuaia, jujuy)
+
+    assert [tramo[0] for tramo in tramos] == [Avion] and horas < PlanificadorRutas.LIMITE_ISQUEMIA
+
+
+def test_organo_sin_ruta_queda_en_el_inventario(sin_mensajes):
+    ushuaia = centro("Hospital Ushuaia", "Ushuaia", "Tierra del Fuego", -54.80, -68.30, Auto(80, "U1"))
+    jujuy = centro("Hospital Jujuy", "San Salvador", "Jujuy", -24.18, -65.30, Auto(80, "J1"))
+    incucai = INCUCAI([ushuaia, jujuy])
+    lejano = Receptores("Receptor Jujuy", 11111111, "M", datetime(1990, 1, 1), "O+", 1, "corazon", datetime(2024, 1, 1), "")
+    jujuy.asignar_pacientes([lejano])
+    incucai.procesar_nuevos_pacientes()
+
+    ushuaia.asignar_pacientes([Donantes("Donante Ushuaia", 22222222, "M", datetime(1980, 1, 1), "O+", 1,
+                                        datetime(2025, 1, 1), [Organos("corazon")])])
+    incucai.procesar_nuevos_pacientes()
+    assert not lejano.organos_a_disposicion and len(incucai.inventario_organos) == 1 #no se asigna un organo que no llega
+
+    cercano = Receptores("Receptor Ushuaia", 33333333, "F", datetime(1970, 1, 1), "O+", 1, "corazon", datetime(2024, 1, 1), "")
+    ushuaia.asignar_pacientes([cercano])
+    incucai.procesar_nuevos_pacientes()
+    assert incucai.registro_dni.buscar(33333333)[1] != RegistroDNI.EN_ESPERA and len(incucai.inventario_organos) == 0
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+from vehiculos.Registro_Viajes import RegistroViajes
+
+
+def viajes_de_prueba(cantidad: int) -> list[tuple]:
+    """
+    Devuelve viajes (distancia, nivel de tráfico, tiempo) distintos entre sí; uno de cada cinco sin tráfico.
+    """
+    return [(10.0 + i, None if i % 5 == 0 else i % 3, 0.5 + i / 100) for i in range(cantidad)]
+
+
+def como_tuplas(viajes: np.ndarray) -> list[tuple]:
+    """
+    Pasa un array del registro a tuplas comparables con viajes_de_prueba.
+    """
+    return [(distancia, None if nivel == RegistroViajes.SIN_TRAFICO else nivel, tiempo) for distancia, nivel, tiempo in viajes.tolist()]
+
+
+def test_buffer_lleno_se_vuelca_al_archivo(tmp_path):
+    ruta = str(tmp_path / "viajes.bin")
+    registro = RegistroViajes(capacidad=16, ruta_volcado=ruta)
+    viajes = viajes_de_prueba(50)
+
+    for viaje in viajes:
+        registro.agregar(*viaje)
+
+    assert registro.volcados == 48 and len(registro) == 2 #se vuelca cada vez que se llenan 16
+    assert como_tuplas(registro.leer_volcado()) + como_tuplas(registro.viajes()) == viajes
+    assert registro.ultimo() == viajes[-1]
+
+
+def test_volcar_vacia_el_buffer(tmp_path):
+    ruta = str(tmp_path / "viajes.bin")
+    registro = RegistroViajes(capacidad=16, ruta_volcado=ruta)
+    viajes = viajes_de_prueba(20)
+    for viaje in viajes:
+        registro.agregar(*viaje)
+
+    registro.volcar()
+
+    assert len(registro) == 0 and registro.ultimo() is None
+    assert como_tuplas(registro.leer_volcado()) == viajes
+    assert registro.cantidad == 20
+
+
+def test_sin_archivo_pisa_los_mas_viejos():
+    registro = RegistroViajes(capacidad=8)
+    viajes = viajes_de_prueba(21)
+
+    for viaje in viajes:
+        registro.agregar(*viaje)
+
+    assert como_tuplas(registro.viajes()) == viajes[-8:]
+    assert [viaje["distancia"] for viaje in registro] == [distancia for distancia, _, _ in viajes[-8:]]
+    assert len(registro.leer_volcado()) == 0
+    with pytest.raises(ValueError):
+        registro.volcar()
+
+
+def test_estadisticas_cuentan_todos_los_viajes(tmp_path):
+    viajes = viajes_de_prueba(500)
+    con_archivo = RegistroViajes(capacidad=32, ruta_volcado=str(tmp_path / "viajes.bin"))
+    sin_archivo = RegistroViajes(capacidad=32)
+    for viaje in viajes:
+        con_archivo.agregar(*viaje)
+        sin_archivo.agregar(*viaje)
+
+    tiempos = np.array([tiempo for _, _, tiempo in viajes])
+    for registro in (con_archivo, sin_archivo):
+        assert registro.cantidad == 500
+        assert registro.distancia_total == pytest.approx(sum(distancia for distancia, _, _ in viajes))
+        assert registro.tiempo_promedio() == pytest.approx(tiempos.mean())
+        assert registro.percentil_95() == pytest.approx(np.percentile(tiempos, 95), rel=0.02)
+        assert registro.distribucion_trafico() == {nivel: [n for _, n, _ in viajes].count(nivel) for nivel in (None, 0, 1, 2)}
+    assert con_archivo.resumen() == sin_archivo.resumen()
+
+
+def test_registro_vacio():
+    registro = RegistroViajes()
+
+    assert len(registro) == 0 and registro.cantidad == 0
+    assert registro.tiempo_promedio() is None and registro.percentil_95() is None
+    assert registro.distribucion_trafico() == {} and registro.ultimo() is None
+    with pytest.raises(ValueError):
+        RegistroViajes(capacidad=0)
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from datetime import datetime
+from incucai.Asignacion_Global import AsignacionGlobal
+from incucai.INCUCAI import INCUCAI
+from incucai.Simulacion_Montecarlo import SimulacionMontecarlo
+from reloj.Reloj import RelojVirtual
+
+SIMULACIONES = 20_000
+
+
+def probabilidad_exito(umbral: int, horas: float, autos: int) -> float:
+    """
+    Calcula la probabilidad exacta de éxito de una cirugía: la tirada rnd.randint(1, 10) debe llegar al umbral y
+    las horas, sumando el tráfico de cada tramo en auto (0 a 3 horas, equiprobables), no deben pasar el límite.
+    """
+    trafico = np.array([1.0])
+    for _ in range(autos):
+        trafico = np.convolve(trafico, np.full(SimulacionMontecarlo.TRAFICO_MAXIMO_AUTO + 1, 1 / (SimulacionMontecarlo.TRAFICO_MAXIMO_AUTO + 1)))
+    a_tiempo = sum(p for extra, p in enumerate(trafico) if horas + extra <= AsignacionGlobal.LIMITE_ISQUEMIA)
+    return (11 - umbral) / 10 * a_tiempo
+
+
+def test_tasas_coinciden_con_las_probabilidades_exactas(escenario):
+    centros, _ = escenario(pacientes=800, centros=6, semilla=5)
+    incucai = INCUCAI(centros, reloj=RelojVirtual(datetime(2025, 6, 1)))
+    motor = AsignacionGlobal(incucai.reloj.ahora(), matriz_distancias=incucai.matriz_distancias)
+    asignaciones = motor.simular_greedy(incucai.centros_salud)
+    simulacion = SimulacionMontecarlo(motor, SIMULACIONES, 7, incucai.planificador, incucai.reloj)
+    ronda = simulacion.armar_ronda(asignaciones)
+
+    resultado = incucai.estimar_resultados(SIMULACIONES, semilla=7, asignaciones=asignaciones)
+
+    probabilidades = np.array([probabilidad_exito(*fila) for fila in zip(ronda['umbral'], ronda['horas'], ronda['autos'])])
+    assert resultado['cirugias'] == len(probabilidades) > 0
+    desvio = np.sqrt((probabilidades * (1 - probabilidades)).sum() / SIMULACIONES) #del promedio de exitos
+    assert resultado['total']['exitos_promedio'] == pytest.approx(probabilidades.sum(), abs=4 * desvio + 1e-9)
+    for centro, resumen in resultado['por_centro'].items():
+        propias = probabilidades[np.asarray(ronda['centro']) == centro]
+        desvio = np.sqrt((propias * (1 - propias)).sum() / SIMULACIONES)
+        assert resumen['cirugias'] == len(propias)
+        assert resumen['exitos_promedio'] == pytest.approx(propias.sum(), abs=4 * desvio + 1e-9), centro
+        assert sum(resumen['distribucion']) == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("umbral, horas, autos", [
+    (3, 10.0, 0), #especialista sin traslado en auto: 80%
+    (5, 10.0, 0), #general o no especialista: 60%
+    (3, 21.0, 0), #pasa el limite de isquemia: nunca
+    (3, 17.0, 1), #solo llega si el trafico no pasa de 3 horas: 80%
+    (5, 17.5, 2), #dos tramos, el trafico sumado no puede pasar de 2 horas
+])
+def test_sorteo_de_una_cirugia(umbral, horas, autos):
+    ronda = {'centro': ['A'], 'especialidad': ['x'], 'umbral': [umbral], 'horas': [horas], 'autos': [autos]}
+    simulacion = SimulacionMontecarlo(AsignacionGlobal(), SIMULACIONES)
+
+    exitos = simulacion._sortear_exitos(ronda, np.random.default_rng(1), SIMULACIONES)
+
+    esperado = probabilidad_exito(umbral, horas, autos)
+    assert exitos.mean() == pytest.approx(esperado, abs=4 * np.sqrt(esperado * (1 - esperado) / SIMULACIONES) + 1e-9)
+
+
+def test_misma_semilla_mismo_resultado(escenario):
+    centros, _ = escenario(pacientes=300, centros=4)
+    incucai = INCUCAI(centros, reloj=RelojVirtual(datetime(2025, 6, 1)))
+
+    assert incucai.estimar_resultados(500, semilla=3) == incucai.estimar_resultados(500, semilla=3)
+    with pytest.raises(ValueError):
+        SimulacionMontecarlo(AsignacionGlobal(), 0)
@@ -0,0 +1,72 @@
+import random
+import pytest
+from datetime import datetime
+from generador.Generador_Datos import GeneradorDatos
+from incucai.Listas_Espera import prioridad_receptor
+from incucai.Tabla_Receptores import TablaReceptores
+
+HOY = datetime(2025, 6, 1)
+
+
+def clave_anterior(receptor) -> tuple[int, int]:
+    """
+    Clave con la que ordenaba el menú antes de la tabla: inestables primero y después la edad en años.
+    """
+    nacimiento = receptor.nacimiento
+    edad = HOY.year - nacimiento.year - ((HOY.month, HOY.day) < (nacimiento.month, nacimiento.day))
+    return (0 if receptor.estado.lower() == 'inestable' else 1, edad)
+
+
+@pytest.fixture
+def tabla_y_receptores():
+    """
+    Tabla con 3000 receptores repartidos en cinco centros, y la lista de esos receptores en orden de registro.
+    """
+    generador = GeneradorDatos(6)
+    centros = generador.generar_centros(5)
+    receptores = [generador.generar_receptor() for _ in range(3000)]
+    generador.repartir_pacientes(centros, receptores)
+    tabla = TablaReceptores()
+    for receptor in receptores:
+        tabla.agregar(receptor)
+    return tabla, receptores, centros
+
+
+def test_ranking_coincide_con_prioridad_receptor(tabla_y_receptores):
+    tabla, receptores, centros = tabla_y_receptores
+
+    for centro in centros:
+        del_centro = [r for r in receptores if r.centro_de_salud is centro]
+        esperado = sorted(del_centro, key=prioridad_receptor) #sorted es estable: los empates quedan en orden de registro
+        inestables, estables = tabla.receptores_por_centro(centro.nombre.upper())
+        assert inestables + estables == esperado
+
+
+def test_ranking_respeta_el_orden_anterior(tabla_y_receptores):
+    tabla, receptores, centros = tabla_y_receptores
+
+    for centro in centros:
+        inestables, estables = tabla.receptores_por_centro(centro.nombre)
+        ranking = inestables + estables
+        assert {r.DNI for r in ranking} == {r.DNI for r in receptores if r.centro_de_salud is centro}
+        #el orden nuevo solo desempata lo que el anterior dejaba igual (mismo estado y misma edad en años)
+        claves = [clave_anterior(r) for r in ranking]
+        assert claves == sorted(claves)
+
+
+def test_actualizar_cambia_el_grupo_del_receptor(tabla_y_receptores):
+    tabla, receptores, centros = tabla_y_receptores
+    rnd = random.Random(1)
+    cambiados = rnd.sample([r for r in receptores if r.centro_de_salud is centros[0]], 20)
+
+    for receptor in cambiados:
+        receptor.estado = "Inestable" if receptor.estado.lower() == "estable" else "Estable"
+        tabla.actualizar(receptor)
+
+    inestables, estables = tabla.receptores_por_centro(centros[0].nombre)
+    assert inestables + estables == sorted([r for r in receptores if r.centro_de_salud is centros[0]], key=prioridad_receptor)
+    assert all(r.estado == "Inestable" for r in inestables) and all(r.estado == "Estable" for r in estables)
+
+
+def test_centro_sin_receptores():
+    assert TablaReceptores().receptores_por_centro("Centro inexistente") == ([], [])